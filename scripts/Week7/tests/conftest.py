@@ -1,5 +1,8 @@
 """Shared pytest fixtures"""
+import json
 import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
 import pytest
 from web3 import Web3
@@ -9,6 +12,12 @@ from unittest.mock import Mock, MagicMock
 root_dir = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(root_dir))
 
+# Scripts import their sibling modules directly (e.g. `from hd_derivation import ...`)
+sys.path.insert(0, str(root_dir / 'scripts'))
+
+# Shared test helpers (e.g. `from erc20_fakes import FakeChain`)
+sys.path.insert(0, str(Path(__file__).parent))
+
 @pytest.fixture
 def mock_web3():
     """Mock Web3 instance for testing without real RPC calls"""
@@ -36,3 +45,37 @@ def sample_addresses():
         'zero': '0x0000000000000000000000000000000000000000',
         'dead': '0x000000000000000000000000000000000000dEaD'
     }
+
+@pytest.fixture
+def rpc_stub_server():
+    """
+    Local JSON-RPC stub server.
+    Set server.handle = fn(payload) -> response body; every parsed request
+    payload is appended to server.requests.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length))
+            self.server.requests.append(payload)
+            body = json.dumps(self.server.handle(payload)).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(('127.0.0.1', 0), Handler)
+    server.requests = []
+    server.handle = lambda payload: {'jsonrpc': '2.0', 'id': None, 'result': None}
+    server.url = f'http://127.0.0.1:{server.server_port}'
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,62 @@
+"""In-memory ERC-20 chain shared by the balance checker and token metadata tests"""
+from eth_abi import decode, encode
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.exceptions import ContractLogicError
+
+from erc20_balance_checker import AGGREGATE3_SELECTOR, MULTICALL3_ADDRESS, POPULAR_TOKENS
+
+USDC = POPULAR_TOKENS['USDC']
+DAI = POPULAR_TOKENS['DAI']
+NOT_A_TOKEN = '0x1111111111111111111111111111111111111111'
+HOLDERS = ['0xd8dA6BF26964aF9D7eEd9e03E53415D37aA96045',
+           '0xde0B295669a9FD93d5F28D9Ec85E40f4cb697BAe']
+
+class FakeChain:
+    """eth_call/get_code over in-memory ERC-20 tokens and a Multicall3 contract"""
+    def __init__(self, multicall=True):
+        self.multicall = multicall
+        self.tokens = {
+            USDC: {'name': 'USD Coin', 'symbol': 'USDC', 'decimals': 6, 'supply': 25 * 10**15,
+                   'balances': {HOLDERS[0]: 1000 * 10**6}},
+            DAI: {'name': 'Dai Stablecoin', 'symbol': 'DAI', 'decimals': 18, 'supply': 5 * 10**27,
+                  'balances': {HOLDERS[1]: 3 * 10**18 // 2}},
+        }
+        self.calls = []
+
+    def get_code(self, address):
+        return HexBytes(b'\x60\x80' if self.multicall and address == MULTICALL3_ADDRESS else b'')
+
+    def _run(self, target, data):
+        token = self.tokens.get(Web3.to_checksum_address(target))
+        if token is None:
+            return b''  # an EOA: the call "succeeds" with no return data
+        selector = data[:4].hex()
+        if selector == '06fdde03':
+            return encode(['string'], [token['name']])
+        if selector == '95d89b41':
+            return encode(['string'], [token['symbol']])
+        if selector == '313ce567':
+            return encode(['uint8'], [token['decimals']])
+        if selector == '18160ddd':
+            return encode(['uint256'], [token['supply']])
+        if selector == '70a08231':
+            holder = '0x' + data[16:36].hex()
+            balances = {h.lower(): b for h, b in token['balances'].items()}
+            return encode(['uint256'], [balances.get(holder, 0)])
+        raise ContractLogicError("execution reverted")
+
+    def call(self, tx, block):
+        self.calls.append(tx)
+        data = bytes(HexBytes(tx['data']))
+        if tx['to'] == MULTICALL3_ADDRESS:
+            assert data[:4] == AGGREGATE3_SELECTOR
+            sub_calls = decode(['(address,bool,bytes)[]'], data[4:])[0]
+            results = []
+            for target, _, calldata in sub_calls:
+                try:
+                    results.append((True, self._run(target, calldata)))
+                except ContractLogicError:
+                    results.append((False, b''))
+            return HexBytes(encode(['(bool,bytes)[]'], [results]))
+        return HexBytes(self._run(tx['to'], data))
@@ -0,0 +1,61 @@
+"""Tests for exact fixed-point amount formatting"""
+import pytest
+from decimal import Decimal
+from web3 import Web3
+
+from amounts import format_ether, format_units, format_units_batch, parse_units
+
+@pytest.mark.parametrize("amount,decimals,expected", [
+    (1500000, 6, '1.5'),
+    (10**18, 18, '1'),
+    (0, 18, '0'),
+    (1, 18, '0.000000000000000001'),
+    (-25, 1, '-2.5'),
+    (7, 0, '7'),
+    (2**256 - 1, 18, '115792089237316195423570985008687907853269984665640564039457.584007913129639935'),
+])
+def test_format_units_exact(amount, decimals, expected):
+    """Formatting is exact at any magnitude"""
+    assert format_units(amount, decimals) == expected
+
+@pytest.mark.parametrize("amount,decimals,precision,expected", [
+    (10**18 // 3, 18, 6, '0.333333'),
+    (2 * 10**18 // 3, 18, 6, '0.666667'),
+    (5, 0, 2, '5.00'),
+    (-1, 18, 2, '0.00'),
+    (15, 1, 0, '2'),
+])
+def test_format_units_precision(amount, decimals, precision, expected):
+    """Fixed precision rounds half up and pads"""
+    assert format_units(amount, decimals, precision) == expected
+
+def test_matches_from_wei():
+    """Same digits as Web3.from_wei, without Decimal"""
+    for wei in (1, 10**15, 123456789012345678901, 10**18 + 1):
+        expected = format(Web3.from_wei(wei, 'ether'), 'f').rstrip('0').rstrip('.')
+        assert format_ether(wei) == expected
+
+def test_batch_formatter():
+    """Batch output equals per-item output; None passes through"""
+    amounts = [0, 1, 10**6, 1234567, None, -5]
+    assert format_units_batch(amounts, 6) == ['0', '0.000001', '1', '1.234567', None, '-0.000005']
+    assert format_units_batch(amounts, 6, precision=2) == ['0.00', '0.00', '1.00', '1.23', None, '0.00']
+
+@pytest.mark.parametrize("value,decimals,expected", [
+    ('0.001', 18, 10**15),
+    (0.1, 9, 10**8),
+    (1e-05, 18, 10**13),
+    (Decimal('1.5'), 6, 1500000),
+    (2, 9, 2 * 10**9),
+    ('1.23456789123', 9, 1234567891),   # extra digits truncated, like to_wei
+    ('-0.5', 1, -5),
+])
+def test_parse_units(value, decimals, expected):
+    """Human amounts convert to exact raw integers"""
+    assert parse_units(value, decimals) == expected
+
+def test_parse_units_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_units('1.2.3', 18)
+    with pytest.raises(ValueError):
+        parse_units('', 18)
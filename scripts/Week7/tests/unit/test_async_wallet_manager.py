@@ -0,0 +1,56 @@
+"""Tests for the asyncio wallet manager"""
+import asyncio
+import pytest
+
+from async_wallet_manager import AsyncWalletManager
+
+ADDRESSES = [f"0x{i:040x}" for i in range(1, 11)]
+
+def balance_handler(payload):
+    """Single-call stub: balance (in ETH) = address as int, probe returns a version"""
+    if payload['method'] == 'eth_getBalance':
+        result = hex(int(payload['params'][0], 16) * 10 ** 18)
+    elif payload['method'] == 'eth_getTransactionCount':
+        result = '0x7'
+    else:
+        result = 'stub/v1'
+    return {'jsonrpc': '2.0', 'id': payload['id'], 'result': result}
+
+def test_get_balance_and_nonce(rpc_stub_server):
+    """Async RPC methods mirror WalletManager's"""
+    rpc_stub_server.handle = balance_handler
+
+    async def run():
+        manager = AsyncWalletManager(rpc_stub_server.url)
+        try:
+            return await manager.get_balance(ADDRESSES[2]), await manager.get_nonce(ADDRESSES[0])
+        finally:
+            await manager.close()
+
+    balance, nonce = asyncio.run(run())
+    assert balance == '3'
+    assert nonce == 7
+
+def test_gather_balances_streams_all_results(rpc_stub_server):
+    """Every address comes back once, bad ones with an error instead of aborting"""
+    rpc_stub_server.handle = balance_handler
+
+    async def run():
+        manager = AsyncWalletManager(rpc_stub_server.url)
+        try:
+            return [r async for r in manager.gather_balances(ADDRESSES + ["bad"], concurrency=4)]
+        finally:
+            await manager.close()
+
+    results = asyncio.run(run())
+    by_address = {r['address']: r for r in results}
+    assert len(results) == 11
+    assert by_address[ADDRESSES[9]]['balance'] == '10'
+    assert by_address["bad"]['balance'] is None
+    assert "Invalid Ethereum address" in by_address["bad"]['error']
+
+def test_invalid_address_shared_validation():
+    """Async and sync managers reject the same inputs"""
+    manager = AsyncWalletManager('http://127.0.0.1:1')
+    with pytest.raises(ValueError, match="Invalid Ethereum address"):
+        asyncio.run(manager.get_balance("not_an_address"))
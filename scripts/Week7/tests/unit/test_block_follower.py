@@ -0,0 +1,140 @@
+"""Tests for the newHeads block follower"""
+import asyncio
+import json
+
+from websockets.asyncio.server import serve
+
+from block_follower import BlockFollower
+from rpc_cache import BlockCache
+
+def block_hash(number, branch='a'):
+    return '0x' + (branch * 2 + f'{number:062x}')[:64]
+
+def raw_header(number, branch='a', parent_branch=None):
+    return {
+        'number': hex(number),
+        'hash': block_hash(number, branch),
+        'parentHash': block_hash(number - 1, parent_branch or branch),
+        'timestamp': hex(1700000000 + 12 * number),
+        'baseFeePerGas': hex(10**9)
+    }
+
+class MockNode:
+    """newHeads pushes from a script, eth_getBlockByHash/Number from known headers"""
+    def __init__(self, pushes, known=()):
+        self.pushes = pushes
+        self.blocks = {h['hash']: h for h in list(pushes) + list(known)}
+        self.head = None
+        self.methods = []
+
+    def answer(self, request):
+        self.methods.append(request['method'])
+        method, params = request['method'], request['params']
+        if method == 'eth_subscribe':
+            result = '0xsub'
+        elif method == 'eth_getBlockByHash':
+            result = self.blocks.get(params[0])
+        elif method == 'eth_blockNumber':
+            result = self.head['number']
+        elif method == 'eth_getBlockByNumber':
+            result = self.head
+        else:
+            return {'jsonrpc': '2.0', 'id': request['id'], 'error': {'code': -32601, 'message': 'no'}}
+        return {'jsonrpc': '2.0', 'id': request['id'], 'result': result}
+
+    async def handler(self, ws):
+        request = json.loads(await ws.recv())
+        await ws.send(json.dumps(self.answer(request)))
+        for header in self.pushes:
+            await ws.send(json.dumps({'jsonrpc': '2.0', 'method': 'eth_subscription',
+                                      'params': {'subscription': '0xsub', 'result': header}}))
+            # Serve any backfill requests before the next push
+            while True:
+                try:
+                    message = await asyncio.wait_for(ws.recv(), 0.05)
+                except asyncio.TimeoutError:
+                    break
+                await ws.send(json.dumps(self.answer(json.loads(message))))
+        await asyncio.sleep(5)
+
+async def collect(node, count, **kwargs):
+    async with serve(node.handler, '127.0.0.1', 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        follower = BlockFollower(rpc_url='http://127.0.0.1:9', ws_url=f'ws://127.0.0.1:{port}', **kwargs)
+        headers = []
+        async for header in follower:
+            headers.append(header)
+            if len(headers) == count:
+                break
+        return follower, headers
+
+def test_streams_new_heads():
+    """Headers arrive in order over the subscription"""
+    node = MockNode([raw_header(n) for n in (10, 11, 12)])
+    follower, headers = asyncio.run(collect(node, 3))
+    assert [h['number'] for h in headers] == [10, 11, 12]
+    assert headers[0]['base_fee'] == 10**9
+    assert follower.mode == 'ws'
+    assert node.methods == ['eth_subscribe']
+
+def test_gap_is_backfilled_by_parent_hash():
+    """A skipped height is fetched so consumers see every block"""
+    node = MockNode([raw_header(10), raw_header(13)], known=[raw_header(11), raw_header(12)])
+    follower, headers = asyncio.run(collect(node, 4))
+    assert [h['number'] for h in headers] == [10, 11, 12, 13]
+    assert follower.gaps_filled == 2
+    assert node.methods.count('eth_getBlockByHash') == 2
+
+def test_reorg_reported_and_fed_to_cache():
+    """A replaced block is detected via parent hashes and invalidates the block cache"""
+    pushes = [raw_header(10), raw_header(11), raw_header(12),
+              raw_header(13, 'b', parent_branch='b')]
+    known = [raw_header(12, 'b', parent_branch='a')]  # 12b builds on 11a
+    node = MockNode(pushes, known=known)
+    cache = BlockCache()
+
+    async def run():
+        async with serve(node.handler, '127.0.0.1', 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            follower = BlockFollower(rpc_url='http://127.0.0.1:9', ws_url=f'ws://127.0.0.1:{port}')
+            follower.add_listener(lambda h: cache.on_block(h['number'], h['hash'], h['parent_hash']))
+            headers = []
+            async for header in follower:
+                headers.append(header)
+                if len(headers) == 5:
+                    break
+            return follower, headers
+
+    follower, headers = asyncio.run(run())
+    assert [(h['number'], h['hash'][2:4]) for h in headers] == [
+        (10, 'aa'), (11, 'aa'), (12, 'aa'), (12, 'bb'), (13, 'bb')]
+    assert headers[3]['reorg_depth'] == 1
+    assert follower.reorgs == 1
+    assert cache.stats()['reorgs'] == 1
+
+def test_falls_back_to_polling(rpc_stub_server):
+    """Without a reachable WebSocket, eth_blockNumber polling takes over"""
+    node = MockNode([], known=[raw_header(20), raw_header(21)])
+    heads = iter([raw_header(20), raw_header(20), raw_header(21)])
+    node.head = next(heads)
+
+    def handle(payload):
+        if payload['method'] == 'eth_blockNumber' and len(node.methods) > 1:
+            node.head = next(heads, node.head)
+        return node.answer(payload)
+    rpc_stub_server.handle = handle
+
+    async def run():
+        follower = BlockFollower(rpc_url=rpc_stub_server.url, ws_url='ws://127.0.0.1:9',
+                                 poll_interval=0.01)
+        headers = []
+        async for header in follower:
+            headers.append(header)
+            if len(headers) == 2:
+                break
+        return follower, headers
+
+    follower, headers = asyncio.run(run())
+    assert [h['number'] for h in headers] == [20, 21]
+    assert follower.mode == 'poll'
+    assert follower.errors == 1   # the refused WebSocket connect
@@ -0,0 +1,55 @@
+"""Tests for offline bulk transaction signing"""
+import io
+import json
+from eth_account import Account
+
+from sign_transaction import sign_transactions_bulk, write_signed_jsonl
+
+TEST_PK = "0x4c0883a69102937d6231471b5dbb6204fe512961708279f8c1c9f2e1f9c0e8a7"
+RECIPIENT = "0xd8dA6BF26964aF9D7eEd9e03E53415D37aA96045"
+GAS_PRICE = 20 * 10 ** 9
+
+SPECS = [(RECIPIENT, 10 ** 15 * (i + 1), 21000, None) for i in range(7)]
+
+def expected_raw(nonce, value):
+    signed = Account.from_key(TEST_PK).sign_transaction({
+        'nonce': nonce, 'to': RECIPIENT, 'value': value, 'gas': 21000,
+        'gasPrice': GAS_PRICE, 'chainId': 1, 'data': '0x'
+    })
+    return '0x' + signed.raw_transaction.hex().replace('0x', '')
+
+def test_bulk_signing_is_deterministic_offline():
+    """Fixed key, chain id, gas price and nonce: no network, known output"""
+    records = list(sign_transactions_bulk(None, TEST_PK, SPECS, chunk_size=3,
+                                          chain_id=1, gas_price=GAS_PRICE, start_nonce=10))
+
+    assert [r['nonce'] for r in records] == list(range(10, 17))
+    assert records[0]['raw_transaction'] == expected_raw(10, 10 ** 15)
+    assert records[6]['raw_transaction'] == expected_raw(16, 7 * 10 ** 15)
+
+def test_process_pool_matches_serial():
+    """Parallel signing returns identical records in nonce order"""
+    kwargs = dict(chunk_size=2, chain_id=1, gas_price=GAS_PRICE, start_nonce=0)
+    serial = list(sign_transactions_bulk(None, TEST_PK, SPECS, **kwargs))
+    parallel = list(sign_transactions_bulk(None, TEST_PK, SPECS, workers=2, **kwargs))
+    assert parallel == serial
+
+def test_prefetches_chain_values_once(mock_web3):
+    """chain_id, gas price and the starting nonce cost one read each"""
+    mock_web3.eth.chain_id = 1
+    mock_web3.eth.gas_price = GAS_PRICE
+    mock_web3.eth.get_transaction_count.return_value = 3
+
+    records = list(sign_transactions_bulk(mock_web3, TEST_PK, SPECS))
+
+    assert records[0]['nonce'] == 3
+    mock_web3.eth.get_transaction_count.assert_called_once_with(
+        Account.from_key(TEST_PK).address, 'pending')
+
+def test_write_signed_jsonl():
+    out = io.StringIO()
+    records = sign_transactions_bulk(None, TEST_PK, SPECS[:2], chain_id=1,
+                                     gas_price=GAS_PRICE, start_nonce=0)
+    assert write_signed_jsonl(records, out) == 2
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [line['nonce'] for line in lines] == [0, 1]
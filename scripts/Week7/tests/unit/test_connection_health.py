@@ -0,0 +1,79 @@
+"""Tests for connection-health caching"""
+import pytest
+from unittest.mock import Mock
+import requests
+
+from connection_health import ConnectionHealth, NotConnectedError
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+def test_probe_skipped_while_healthy(mock_web3, clock):
+    """Only the first call probes; later calls within the TTL don't"""
+    mock_web3.is_connected.return_value = True
+    health = ConnectionHealth(mock_web3, ttl=30, clock=clock)
+
+    for _ in range(5):
+        assert health.call(lambda: 42) == 42
+
+    assert mock_web3.is_connected.call_count == 1
+    assert health.stats()['probes'] == 1
+    assert health.stats()['probes_saved'] == 4
+
+def test_probe_after_ttl_expires(mock_web3, clock):
+    """Health goes stale after the TTL and is probed again"""
+    mock_web3.is_connected.return_value = True
+    health = ConnectionHealth(mock_web3, ttl=30, clock=clock)
+
+    health.call(lambda: None)
+    clock.now += 31
+    health.call(lambda: None)
+
+    assert mock_web3.is_connected.call_count == 2
+
+def test_probe_after_failure(mock_web3, clock):
+    """A connection error marks the provider failed and forces a probe"""
+    mock_web3.is_connected.return_value = True
+    health = ConnectionHealth(mock_web3, clock=clock)
+    health.call(lambda: None)
+
+    def broken():
+        raise requests.exceptions.ConnectionError("connection refused")
+
+    with pytest.raises(NotConnectedError):
+        health.call(broken)
+    assert not health.is_healthy
+
+    health.call(lambda: None)
+    assert mock_web3.is_connected.call_count == 2
+    assert health.stats()['failures'] == 1
+
+def test_not_connected_raises_typed_error(mock_web3, clock):
+    """Callers get NotConnectedError (a ConnectionError), not None"""
+    mock_web3.is_connected.return_value = False
+    health = ConnectionHealth(mock_web3, clock=clock)
+    fn = Mock()
+
+    with pytest.raises(ConnectionError):
+        health.call(fn)
+    fn.assert_not_called()
+
+def test_other_errors_propagate(mock_web3, clock):
+    """Non-connection errors pass through without marking failure"""
+    mock_web3.is_connected.return_value = True
+    health = ConnectionHealth(mock_web3, clock=clock)
+
+    def bad_input():
+        raise ValueError("Invalid address")
+
+    with pytest.raises(ValueError):
+        health.call(bad_input)
+    assert health.stats()['failures'] == 0
@@ -0,0 +1,87 @@
+"""Tests for the Multicall-aggregated ERC-20 balance checker"""
+import pytest
+
+from erc20_balance_checker import ERC20BalanceChecker, decode_text
+from erc20_fakes import DAI, HOLDERS, NOT_A_TOKEN, USDC, FakeChain
+
+def make_checker(mock_web3, chain, **kwargs):
+    mock_web3.eth.call.side_effect = chain.call
+    mock_web3.eth.get_code.side_effect = chain.get_code
+    return ERC20BalanceChecker(w3=mock_web3, **kwargs)
+
+def test_validate_address():
+    """Empty or invalid input returns None; valid input is checksummed"""
+    checker = ERC20BalanceChecker()
+    assert checker.validate_address("") is None
+    assert checker.validate_address(None) is None
+    assert checker.validate_address("0x1234") is None
+    assert checker.validate_address(USDC.lower()) == USDC
+
+def test_check_balances_single_eth_call(mock_web3):
+    """2 tokens x 2 holders plus metadata come back in one aggregate call"""
+    chain = FakeChain()
+    checker = make_checker(mock_web3, chain)
+    report = checker.check_balances(['usdc', DAI], HOLDERS)
+
+    assert len(chain.calls) == 1
+    usdc, dai = report
+    assert usdc['token']['symbol'] == 'USDC'
+    assert usdc['token']['decimals'] == 6
+    assert [b['balance'] for b in usdc['balances']] == [1000 * 10**6, 0]
+    assert usdc['balances'][0]['formatted'] == '1000'
+    assert dai['token']['total_supply'] == 5 * 10**27
+    assert [b['balance'] for b in dai['balances']] == [0, 3 * 10**18 // 2]
+
+def test_calls_are_chunked(mock_web3):
+    """batch_size bounds the sub-calls per eth_call; results stay in order"""
+    chain = FakeChain()
+    checker = make_checker(mock_web3, chain, batch_size=3)
+    balances = checker.get_balances([USDC, DAI], HOLDERS * 3)
+
+    assert len(chain.calls) == 4  # 12 balanceOf calls in chunks of 3
+    assert list(balances[USDC].values())[0] == 1000 * 10**6
+    assert balances[DAI][HOLDERS[1]] == 3 * 10**18 // 2
+
+def test_non_contract_token_is_handled(mock_web3):
+    """A token address without code yields None metadata and balances"""
+    checker = make_checker(mock_web3, FakeChain())
+    report = checker.check_balances([NOT_A_TOKEN], HOLDERS[:1])
+    assert report[0]['token']['symbol'] is None
+    assert report[0]['balances'][0]['balance'] is None
+    assert report[0]['balances'][0]['formatted'] is None
+
+def test_fallback_without_multicall(mock_web3):
+    """Without Multicall3 deployed (dev chain) each read is its own eth_call"""
+    chain = FakeChain(multicall=False)
+    checker = make_checker(mock_web3, chain)
+    metadata = checker.get_token_metadata(USDC)
+
+    assert metadata['name'] == 'USD Coin'
+    assert len(chain.calls) == 4
+    assert all(call['to'] == USDC for call in chain.calls)
+
+def test_fallback_reverts_are_none_but_outages_raise(mock_web3):
+    """A revert is a missing value; a transport error is not swallowed"""
+    import requests
+    chain = FakeChain(multicall=False)
+    checker = make_checker(mock_web3, chain)
+    assert checker.get_balances([USDC], [HOLDERS[0]])[USDC][HOLDERS[0]] == 1000 * 10**6
+    assert checker.aggregate([(USDC, bytes.fromhex('deadbeef'))]) == [None]
+
+    mock_web3.eth.call.side_effect = requests.ConnectionError("connection refused")
+    with pytest.raises(requests.ConnectionError):
+        checker.get_token_metadata(DAI)
+    assert checker.eth_calls > 2
+
+def test_invalid_inputs_raise():
+    """Unknown tokens and bad holder addresses are rejected before any call"""
+    checker = ERC20BalanceChecker()
+    with pytest.raises(ValueError):
+        checker.resolve_token('NOTATOKEN')
+    with pytest.raises(ValueError):
+        checker.get_balances([USDC], ['0x1234'])
+
+def test_decode_bytes32_symbol():
+    """Older tokens (e.g. MKR) return bytes32 instead of a string"""
+    assert decode_text(b'MKR'.ljust(32, b'\x00')) == 'MKR'
+    assert decode_text(None) is None
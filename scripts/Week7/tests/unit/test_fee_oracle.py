@@ -0,0 +1,122 @@
+"""Tests for the eth_feeHistory-based EIP-1559 fee oracle"""
+import pytest
+from eth_account import Account
+
+from estimate_gas import FeeOracle, get_gas_prices
+from sign_transaction import sign_transaction
+
+GWEI = 10**9
+
+class FakeFeeChain:
+    """fee_history over synthetic blocks: block n has base fee n gwei and rewards [p * n] wei"""
+    def __init__(self, head):
+        self.head = head
+        self.requests = []
+
+    @property
+    def block_number(self):
+        return self.head
+
+    def fee_history(self, count, newest, percentiles):
+        self.requests.append((count, newest))
+        oldest = newest - count + 1
+        return {
+            'oldestBlock': oldest,
+            'baseFeePerGas': [n * GWEI for n in range(oldest, newest + 2)],
+            'gasUsedRatio': [0.5] * count,
+            'reward': [[p * n for p in percentiles] for n in range(oldest, newest + 1)]
+        }
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def chain(mock_web3):
+    fake = FakeFeeChain(head=100)
+    mock_web3.eth.fee_history.side_effect = fake.fee_history
+    type(mock_web3.eth).block_number = property(lambda self: fake.head)
+    return fake
+
+def test_initial_window(mock_web3, chain):
+    """First quote fetches the whole window; tiers use percentile averages"""
+    oracle = FeeOracle(mock_web3, window=10, refresh_interval=0)
+    quote = oracle.quote('average')
+
+    assert chain.requests == [(10, 100)]
+    assert quote['base_fee'] == 101 * GWEI                       # next block's base fee
+    assert quote['max_priority_fee_per_gas'] == 50 * sum(range(91, 101)) // 10
+    assert quote['expected_fee_per_gas'] == 101 * GWEI + quote['max_priority_fee_per_gas']
+
+def test_window_updates_incrementally(mock_web3, chain):
+    """New blocks are fetched as a delta and the oldest ones evicted"""
+    oracle = FeeOracle(mock_web3, window=10, refresh_interval=0)
+    oracle.update()
+    chain.head = 102
+    assert oracle.update() == 2
+    assert oracle.update() == 0
+    assert chain.requests == [(10, 100), (2, 102)]
+    assert oracle.quote('slow')['max_priority_fee_per_gas'] == 10 * sum(range(93, 103)) // 10
+
+    chain.head = 500  # fell far behind: refetch one window, not 398 blocks
+    oracle.on_new_head(500)
+    assert chain.requests[-1] == (10, 500)
+    assert oracle.quote('slow')['max_priority_fee_per_gas'] == 10 * sum(range(491, 501)) // 10
+
+def test_quotes_are_cached_between_refreshes(mock_web3, chain):
+    """quote() makes no RPC calls until refresh_interval has passed"""
+    clock = FakeClock()
+    oracle = FeeOracle(mock_web3, window=5, refresh_interval=12, clock=clock)
+    for _ in range(100):
+        oracle.quote('fast')
+    assert oracle.fetches == 1
+
+    chain.head = 101
+    clock.now = 12
+    oracle.quote('fast')
+    assert oracle.fetches == 2
+
+def test_base_fee_projection(mock_web3, chain):
+    """Each block ahead allows the 12.5% maximum base fee increase"""
+    oracle = FeeOracle(mock_web3, window=5, refresh_interval=0)
+    oracle.update()
+    assert oracle.base_fee_projection(1) == 101 * GWEI
+    assert oracle.base_fee_projection(3) == 127_828_125_000   # 101 gwei * 1.125**2
+    fast, slow = oracle.quote('fast'), oracle.quote('slow')
+    assert fast['max_fee_per_gas'] == oracle.base_fee_projection(7) + fast['max_priority_fee_per_gas']
+    assert slow['max_fee_per_gas'] == oracle.base_fee_projection(12) + slow['max_priority_fee_per_gas']
+
+def test_every_tier_survives_base_fee_doubling(mock_web3, chain):
+    """Even the slow tier's fee cap leaves ~2x headroom over the next base fee"""
+    oracle = FeeOracle(mock_web3, window=5, refresh_interval=0)
+    oracle.update()
+    for tier in ('slow', 'average', 'fast', 'instant'):
+        quote = oracle.quote(tier)
+        assert quote['max_fee_per_gas'] - quote['max_priority_fee_per_gas'] >= 2 * quote['base_fee']
+
+def test_unknown_tier(mock_web3, chain):
+    with pytest.raises(ValueError):
+        FeeOracle(mock_web3).quote('ludicrous')
+
+def test_get_gas_prices_in_gwei(mock_web3, chain):
+    """get_gas_prices reports expected base + priority fee per tier in Gwei"""
+    prices = get_gas_prices(mock_web3, FeeOracle(mock_web3, window=1, refresh_interval=0))
+    assert prices['average'] == '101.000005'   # 101 gwei + 50 * 100 wei
+    assert list(prices) == ['slow', 'average', 'fast', 'instant']
+
+def test_sign_transaction_eip1559(mock_web3, chain):
+    """With an oracle, sign_transaction builds a type-2 transaction"""
+    mock_web3.eth.chain_id = 1
+    mock_web3.eth.get_transaction_count.return_value = 0
+    mock_web3.to_wei.side_effect = lambda value, unit: int(value * 10**18)
+    oracle = FeeOracle(mock_web3, window=5, refresh_interval=0)
+
+    result = sign_transaction(mock_web3, Account.create().key, '0xd8dA6BF26964aF9D7eEd9e03E53415D37aA96045',
+                              0.001, fee_oracle=oracle, fee_tier='fast')
+    transaction = result['transaction']
+    assert 'gasPrice' not in transaction
+    assert transaction['maxFeePerGas'] == oracle.quote('fast')['max_fee_per_gas']
+    assert result['raw_transaction'].startswith('02')
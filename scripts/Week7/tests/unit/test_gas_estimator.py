@@ -0,0 +1,141 @@
+"""Tests for cached eth_estimateGas"""
+import pytest
+from hexbytes import HexBytes
+
+from estimate_gas import GasEstimator, calldata_length_class, estimate_simple_transfer
+from rpc_batch import BatchRPCClient
+
+TOKEN = '0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48'
+OTHER_TOKEN = '0x6B175474E89094C44Da98b954EedeAC495271d0F'
+EOA = '0xd8dA6BF26964aF9D7eEd9e03E53415D37aA96045'
+REVERTS = '0x1111111111111111111111111111111111111111'
+
+def transfer_data(recipient_byte, amount):
+    """ERC-20 transfer(address,uint256) calldata"""
+    return '0xa9059cbb' + '00' * 31 + f'{recipient_byte:02x}' + f'{amount:064x}'
+
+@pytest.fixture
+def estimator(mock_web3):
+    mock_web3.eth.get_code.side_effect = lambda address: HexBytes(b'' if address == EOA else b'\x60\x80' + address[-2:].encode())
+    mock_web3.eth.estimate_gas.return_value = 50000
+    return GasEstimator(mock_web3, margin_percent=20)
+
+def test_plain_transfer_to_eoa_is_exact(estimator, mock_web3):
+    """EOA transfers are 21000 without calling eth_estimateGas"""
+    assert estimator.estimate({'to': EOA, 'value': 10**18}) == 21000
+    assert mock_web3.eth.estimate_gas.call_count == 0
+    assert estimate_simple_transfer(mock_web3) == 21000
+
+def test_repeated_token_transfers_hit_cache(estimator, mock_web3):
+    """Same token, selector and length class: one RPC, margin applied"""
+    for recipient in range(1, 6):
+        gas = estimator.estimate({'to': TOKEN, 'data': transfer_data(recipient, recipient * 10**6)})
+        assert gas == 60000
+    assert mock_web3.eth.estimate_gas.call_count == 1
+    assert mock_web3.eth.get_code.call_count == 1
+    assert estimator.stats()['hits'] == 4
+
+def test_shape_changes_miss(estimator, mock_web3):
+    """A different contract, selector or calldata size is estimated separately"""
+    estimator.estimate({'to': TOKEN, 'data': transfer_data(1, 1)})
+    estimator.estimate({'to': OTHER_TOKEN, 'data': transfer_data(1, 1)})
+    estimator.estimate({'to': TOKEN, 'data': '0x095ea7b3' + transfer_data(1, 1)[10:]})  # approve
+    estimator.estimate({'to': TOKEN, 'data': transfer_data(1, 1) + '00' * 96})
+    assert mock_web3.eth.estimate_gas.call_count == 4
+
+def test_contract_creation_not_cached(estimator, mock_web3):
+    estimator.estimate({'data': '0x6080'})
+    estimator.estimate({'data': '0x6080'})
+    assert mock_web3.eth.estimate_gas.call_count == 2
+
+def test_calldata_length_class():
+    assert calldata_length_class(b'') == 0
+    assert calldata_length_class(bytes(4 + 32)) == 1
+    assert calldata_length_class(bytes(4 + 64)) == 2
+    assert calldata_length_class(bytes(4 + 96)) == calldata_length_class(bytes(4 + 128)) == 3
+
+def test_estimate_many_batches_by_shape(mock_web3, rpc_stub_server):
+    """Pending transactions are estimated once per distinct shape, in JSON-RPC batches"""
+    def handler(payload):
+        responses = []
+        for call in payload:
+            if call['method'] == 'eth_getCode':
+                code = '0x' if call['params'][0] == EOA else '0x6080'
+                responses.append({'jsonrpc': '2.0', 'id': call['id'], 'result': code})
+            elif call['params'][0]['to'] == REVERTS:
+                responses.append({'jsonrpc': '2.0', 'id': call['id'],
+                                  'error': {'code': 3, 'message': 'execution reverted'}})
+            else:
+                responses.append({'jsonrpc': '2.0', 'id': call['id'], 'result': hex(40000)})
+        return responses
+    rpc_stub_server.handle = handler
+    estimator = GasEstimator(mock_web3, margin_percent=25,
+                             batch_client=BatchRPCClient(rpc_stub_server.url, max_retries=0))
+
+    txs = [{'to': TOKEN, 'data': transfer_data(i, i)} for i in range(1, 50)]
+    txs += [{'to': EOA, 'value': 1}, {'to': REVERTS, 'data': '0x12345678'}]
+    limits = estimator.estimate_many(txs)
+
+    assert limits[:49] == [50000] * 49
+    assert limits[49] == 21000
+    assert limits[50] is None
+    assert estimator.stats()['hits'] == 0
+    methods = [[call['method'] for call in batch] for batch in rpc_stub_server.requests]
+    assert methods == [['eth_getCode'] * 3, ['eth_estimateGas'] * 2]
+
+    # Everything known now: no further requests
+    assert estimator.estimate_many(txs[:49]) == [50000] * 49
+    assert len(rpc_stub_server.requests) == 2
+    assert estimator.stats()['hits'] == 49
+
+def test_estimate_many_failed_code_lookup(mock_web3, rpc_stub_server):
+    """A failed eth_getCode only drops the transactions to that address"""
+    def handler(payload):
+        responses = []
+        for call in payload:
+            if call['method'] == 'eth_getCode' and call['params'][0] == OTHER_TOKEN:
+                responses.append({'jsonrpc': '2.0', 'id': call['id'],
+                                  'error': {'code': -32000, 'message': 'header not found'}})
+            elif call['method'] == 'eth_getCode':
+                responses.append({'jsonrpc': '2.0', 'id': call['id'], 'result': '0x6080'})
+            else:
+                responses.append({'jsonrpc': '2.0', 'id': call['id'], 'result': hex(40000)})
+        return responses
+    rpc_stub_server.handle = handler
+    estimator = GasEstimator(mock_web3, margin_percent=25,
+                             batch_client=BatchRPCClient(rpc_stub_server.url, max_retries=0))
+
+    limits = estimator.estimate_many([{'to': TOKEN, 'data': transfer_data(1, 1)},
+                                      {'to': OTHER_TOKEN, 'data': transfer_data(1, 1)}])
+
+    assert limits == [50000, None]
+    assert mock_web3.eth.get_code.call_count == 0
+    assert OTHER_TOKEN not in estimator._code_hashes
+
+def test_sign_transaction_uses_estimate(estimator, mock_web3):
+    """Contract calls are signed with the estimated gas, not 21000"""
+    from eth_account import Account
+    from sign_transaction import sign_transaction
+    mock_web3.eth.gas_price = 10**9
+    mock_web3.eth.chain_id = 1
+    mock_web3.eth.get_transaction_count.return_value = 0
+    mock_web3.to_wei.side_effect = lambda value, unit: int(value * 10**18)
+
+    result = sign_transaction(mock_web3, Account.create().key, TOKEN, 0,
+                              gas_estimator=estimator, data=transfer_data(1, 5))
+    assert result['transaction']['gas'] == 60000
+    assert result['transaction']['data'] == transfer_data(1, 5)
+
+def test_sign_transaction_value_transfer_skips_rpc(mock_web3):
+    """Without calldata or a shared estimator, a transfer is 21000 with no eth_getCode"""
+    from eth_account import Account
+    from sign_transaction import sign_transaction
+    mock_web3.eth.gas_price = 10**9
+    mock_web3.eth.chain_id = 1
+    mock_web3.eth.get_transaction_count.return_value = 0
+    mock_web3.to_wei.side_effect = lambda value, unit: int(value * 10**18)
+
+    result = sign_transaction(mock_web3, Account.create().key, EOA, 0.5)
+    assert result['transaction']['gas'] == 21000
+    assert mock_web3.eth.get_code.call_count == 0
+    assert mock_web3.eth.estimate_gas.call_count == 0
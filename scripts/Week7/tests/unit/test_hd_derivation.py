@@ -0,0 +1,98 @@
+"""Tests for the cached HD derivation engine"""
+import csv
+import io
+import json
+import pytest
+from eth_account import Account
+
+from hd_derivation import HDDeriver, split_path, derive_range, write_records
+
+Account.enable_unaudited_hdwallet_features()
+
+TEST_MNEMONIC = "test test test test test test test test test test test junk"
+
+@pytest.mark.parametrize("path", [
+    "m/44'/60'/0'/0/0",
+    "m/44'/60'/0'/0/1",
+    "m/44'/60'/1'/0/0",
+    "m/44'/60'/0'/1/0",
+    "m/44'/60'/0'/0/5'",
+])
+def test_matches_account_from_mnemonic(path):
+    """Cached derivation gives the same account as eth_account"""
+    deriver = HDDeriver()
+    expected = Account.from_mnemonic(TEST_MNEMONIC, account_path=path)
+    assert deriver.account(TEST_MNEMONIC, path).address == expected.address
+
+def test_known_hardhat_address():
+    """First Hardhat/Anvil dev account from the test mnemonic"""
+    deriver = HDDeriver()
+    account = deriver.account(TEST_MNEMONIC, "m/44'/60'/0'/0/0")
+    assert account.address == "0xf39Fd6e51aad88F6F4ce6aB8827279cffFb92266"
+
+def test_seed_and_parent_node_are_cached():
+    """Seed is stretched once and the parent node reused for every index"""
+    deriver = HDDeriver()
+    for i in range(5):
+        deriver.derive_key(TEST_MNEMONIC, f"m/44'/60'/0'/0/{i}")
+
+    info = deriver.cache_info()
+    assert info['seed_misses'] == 1
+    assert info['seed_hits'] == 4
+    assert info['node_misses'] == 1
+    assert info['node_hits'] == 4
+
+def test_node_cache_is_bounded():
+    """LRU drops the oldest parent node when full"""
+    deriver = HDDeriver(max_nodes=2)
+    for account in range(4):
+        deriver.derive_key(TEST_MNEMONIC, f"m/44'/60'/{account}'/0/0")
+    assert deriver.cache_info()['cached_nodes'] == 2
+
+def test_derive_keys_range():
+    """derive_keys yields index, path and key in order"""
+    deriver = HDDeriver()
+    results = list(deriver.derive_keys(TEST_MNEMONIC, range(3)))
+    assert [index for index, _, _ in results] == [0, 1, 2]
+    assert results[2][1] == "m/44'/60'/0'/0/2"
+    assert results[2][2] == deriver.derive_key(TEST_MNEMONIC, "m/44'/60'/0'/0/2")
+
+def test_invalid_mnemonic_raises():
+    """Invalid phrases are rejected like Account.from_mnemonic does"""
+    with pytest.raises(Exception):
+        HDDeriver().derive_key("not a real mnemonic", "m/44'/60'/0'/0/0")
+
+def test_split_path_invalid():
+    """Paths must start at the master node"""
+    with pytest.raises(ValueError):
+        split_path("44'/60'/0'/0/0")
+
+def test_derive_range_addresses_only():
+    """Records come back in index order without private keys"""
+    records = list(derive_range(TEST_MNEMONIC, 0, 5, chunk_size=2))
+    assert [r['index'] for r in records] == [0, 1, 2, 3, 4]
+    assert records[0]['address'] == "0xf39Fd6e51aad88F6F4ce6aB8827279cffFb92266"
+    assert all('private_key' not in r for r in records)
+
+def test_derive_range_process_pool_matches_serial():
+    """Multi-process derivation gives the same ordered records"""
+    serial = list(derive_range(TEST_MNEMONIC, 3, 7, chunk_size=2, include_private_keys=True))
+    parallel = list(derive_range(TEST_MNEMONIC, 3, 7, workers=2, chunk_size=2,
+                                 include_private_keys=True))
+    assert parallel == serial
+    expected = Account.from_mnemonic(TEST_MNEMONIC, account_path="m/44'/60'/0'/0/3")
+    assert serial[0]['private_key'] == '0x' + expected.key.hex().replace('0x', '')
+
+@pytest.mark.parametrize("fmt", ["jsonl", "csv"])
+def test_write_records(fmt):
+    """Records stream out as JSONL or CSV"""
+    out = io.StringIO()
+    written = write_records(derive_range(TEST_MNEMONIC, 0, 3), out, fmt)
+    assert written == 3
+
+    out.seek(0)
+    if fmt == "jsonl":
+        rows = [json.loads(line) for line in out]
+    else:
+        rows = list(csv.DictReader(out))
+    assert [str(r['index']) for r in rows] == ['0', '1', '2']
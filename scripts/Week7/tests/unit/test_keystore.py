@@ -0,0 +1,72 @@
+"""Tests for keystore export/unlock"""
+import os
+
+import pytest
+from eth_account import Account
+
+from keystore import (benchmark_kdf, decrypt_keystore, encrypt_key, kdf_iterations,
+                      list_keystores, save_keystore, unlock_many)
+
+KEYS = ['0x' + f'{i:064x}' for i in range(1, 7)]
+
+@pytest.fixture
+def keystore_dir(tmp_path):
+    for key in KEYS[:-1]:
+        save_keystore(encrypt_key(key, 'secret', kdf='scrypt', iterations=2 ** 4), tmp_path)
+    # One file under a different password
+    save_keystore(encrypt_key(KEYS[-1], 'other', kdf='pbkdf2', iterations=10), tmp_path)
+    return tmp_path
+
+@pytest.mark.parametrize('kdf,iterations', [('scrypt', 2 ** 4), ('pbkdf2', 100)])
+def test_round_trip(kdf, iterations):
+    keystore = encrypt_key(KEYS[0], 'pw', kdf=kdf, iterations=iterations)
+    assert keystore['crypto']['kdf'] == kdf
+    params = keystore['crypto']['kdfparams']
+    assert params.get('n', params.get('c')) == iterations
+    assert decrypt_keystore(keystore, 'pw') == bytes.fromhex(KEYS[0][2:])
+    with pytest.raises(ValueError):
+        decrypt_keystore(keystore, 'wrong')
+
+def test_kdf_presets_and_validation():
+    assert kdf_iterations('scrypt') == 2 ** 18
+    assert kdf_iterations('pbkdf2', 'light') == 10_000
+    assert kdf_iterations('scrypt', iterations=1024) == 1024
+    for kwargs in ({'kdf': 'argon2'}, {'preset': 'ultra'}, {'iterations': 1000}):
+        with pytest.raises(ValueError):
+            kdf_iterations(**kwargs)
+
+def test_save_keystore_is_private(tmp_path):
+    path = save_keystore(encrypt_key(KEYS[0], 'pw', iterations=2 ** 4), tmp_path)
+    assert os.path.basename(path).startswith('UTC--')
+    assert path.endswith(Account.from_key(KEYS[0]).address[2:].lower())
+    assert os.stat(path).st_mode & 0o777 == 0o600
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_unlock_many(keystore_dir, workers):
+    """Records come back in path order; a wrong password fails only its file"""
+    paths = list_keystores(keystore_dir)
+    records = list(unlock_many(paths, 'secret', workers=workers, chunk_size=2))
+    assert [r['path'] for r in records] == paths
+    unlocked = {r['address']: r['private_key'] for r in records if 'error' not in r}
+    assert unlocked == {Account.from_key(k).address: bytes.fromhex(k[2:]) for k in KEYS[:-1]}
+    assert sum('error' in r for r in records) == 1
+
+def test_wallet_manager_session(keystore_dir, tmp_path):
+    from wallet_manager import WalletManager
+    manager = WalletManager()
+    result = manager.unlock_keystores(keystore_dir, 'secret', workers=1)
+    assert len(result['unlocked']) == 5 and len(result['failed']) == 1
+
+    exported = manager.export_keystore(KEYS[-1], 'pw', tmp_path / 'out', iterations=2 ** 4)
+    assert manager.import_keystore(exported['path'], 'pw') == {'address': exported['address']}
+    key = manager.session_keys[exported['address']]
+    assert bytes(key) == bytes.fromhex(KEYS[-1][2:])
+
+    manager.lock_session()
+    assert manager.session_keys == {}
+    assert key == bytearray(32)
+
+def test_benchmark_kdf():
+    results = benchmark_kdf('pbkdf2', [10, 1000], repeats=1)
+    assert [r['iterations'] for r in results] == [10, 1000]
+    assert all(r['seconds'] > 0 for r in results)
@@ -0,0 +1,100 @@
+"""Tests for the local nonce manager"""
+import threading
+import pytest
+from eth_account import Account
+
+from nonce_manager import NonceManager
+from sign_transaction import sign_transaction
+
+TEST_PK = "0x4c0883a69102937d6231471b5dbb6204fe512961708279f8c1c9f2e1f9c0e8a7"
+SENDER = "0xE091624C6467e0F36E2E17861F64406Fd1f67C55"
+
+@pytest.fixture
+def manager(mock_web3):
+    mock_web3.eth.get_transaction_count.return_value = 5
+    return NonceManager(mock_web3)
+
+def test_fetches_once_then_increments(manager, mock_web3):
+    """Only the first allocation hits the node"""
+    assert [manager.allocate(SENDER) for _ in range(3)] == [5, 6, 7]
+    mock_web3.eth.get_transaction_count.assert_called_once_with(SENDER, 'pending')
+
+def test_addresses_are_normalized(manager):
+    """Lowercase and checksum forms share one counter"""
+    assert manager.allocate(SENDER.lower()) == 5
+    assert manager.allocate(SENDER) == 6
+
+def test_release_reuses_gap(manager):
+    """A dropped nonce in the middle is handed out again first"""
+    nonces = [manager.allocate(SENDER) for _ in range(4)]  # 5..8
+    manager.release(SENDER, 6)
+    assert manager.allocate(SENDER) == 6
+    assert manager.allocate(SENDER) == 9
+
+def test_release_last_rewinds(manager):
+    """Releasing the most recent nonces simply rewinds the counter"""
+    [manager.allocate(SENDER) for _ in range(3)]  # 5, 6, 7
+    manager.release(SENDER, 6)
+    manager.release(SENDER, 7)
+    assert manager.peek(SENDER) == 6
+    assert manager.allocate(SENDER) == 6
+    assert manager.allocate(SENDER) == 7
+
+def test_resync(manager, mock_web3):
+    """resync re-reads the chain and clears released gaps"""
+    [manager.allocate(SENDER) for _ in range(3)]
+    manager.release(SENDER, 5)
+    mock_web3.eth.get_transaction_count.return_value = 20
+    assert manager.resync(SENDER) == 20
+    assert manager.allocate(SENDER) == 20
+
+def test_thread_safe_allocation(manager):
+    """Concurrent callers never get the same nonce"""
+    results = []
+    def worker():
+        for _ in range(200):
+            results.append(manager.allocate(SENDER))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(results) == list(range(5, 5 + 1600))
+
+def test_back_to_back_signing_gets_distinct_nonces(manager, mock_web3):
+    """sign_transaction with a manager signs sequential nonces without refetching"""
+    mock_web3.eth.gas_price = 20 * 10 ** 9
+    mock_web3.eth.chain_id = 1
+    mock_web3.to_wei = lambda value, unit: int(value * 10 ** 18) if unit == 'ether' else value
+
+    first = sign_transaction(mock_web3, TEST_PK, SENDER, 0.001, nonce_manager=manager)
+    second = sign_transaction(mock_web3, TEST_PK, SENDER, 0.001, nonce_manager=manager)
+
+    assert first['transaction']['nonce'] == 5
+    assert second['transaction']['nonce'] == 6
+    assert mock_web3.eth.get_transaction_count.call_count == 1
+
+def test_release_rejects_nonces_not_allocated(manager):
+    """Nonces below the fetched base, not yet handed out or released twice are refused"""
+    with pytest.raises(ValueError):
+        manager.release(SENDER, 4)  # nothing fetched yet
+    [manager.allocate(SENDER) for _ in range(3)]  # 5, 6, 7
+    with pytest.raises(ValueError):
+        manager.release(SENDER, 4)  # already mined
+    with pytest.raises(ValueError):
+        manager.release(SENDER, 8)  # never handed out
+    manager.release(SENDER, 5)
+    with pytest.raises(ValueError):
+        manager.release(SENDER, 5)
+    assert manager.allocate(SENDER) == 5
+    assert manager.allocate(SENDER) == 8
+
+def test_release_collapses_trailing_run(manager):
+    """Releasing out of order still rewinds past every trailing released nonce"""
+    [manager.allocate(SENDER) for _ in range(6)]  # 5..10
+    for nonce in (9, 6, 8, 10):
+        manager.release(SENDER, nonce)
+    assert manager.peek(SENDER) == 6
+    assert [manager.allocate(SENDER) for _ in range(3)] == [6, 8, 9]
@@ -0,0 +1,33 @@
+"""Tests for the shared provider factory"""
+from providers import create_session, get_session, make_batch_client, make_web3
+
+def test_session_is_shared():
+    """All providers reuse one pooled session"""
+    assert get_session() is get_session()
+    assert make_batch_client('http://127.0.0.1:1').session is get_session()
+
+def test_session_pool_size():
+    """Connection pool is sized from the argument (or RPC_POOL_SIZE)"""
+    session = create_session(pool_size=7)
+    adapter = session.get_adapter('https://example.com')
+    assert adapter._pool_maxsize == 7
+    assert 'gzip' in session.headers['Accept-Encoding']
+
+def test_pool_size_from_env(monkeypatch):
+    monkeypatch.setenv('RPC_POOL_SIZE', '3')
+    adapter = create_session().get_adapter('http://example.com')
+    assert adapter._pool_maxsize == 3
+
+def test_make_web3_uses_timeout_and_url(monkeypatch):
+    """RPC_URL and RPC_TIMEOUT are picked up from the environment"""
+    monkeypatch.setenv('RPC_URL', 'http://127.0.0.1:8545')
+    monkeypatch.setenv('RPC_TIMEOUT', '5')
+    w3 = make_web3()
+    assert w3.provider.endpoint_uri == 'http://127.0.0.1:8545'
+    assert dict(w3.provider.get_request_kwargs())['timeout'] == 5.0
+
+def test_provider_requests_go_through_shared_session(rpc_stub_server):
+    """A real call is served over the pooled session"""
+    rpc_stub_server.handle = lambda payload: {'jsonrpc': '2.0', 'id': payload['id'], 'result': '0x1'}
+    w3 = make_web3(rpc_stub_server.url)
+    assert w3.eth.chain_id == 1
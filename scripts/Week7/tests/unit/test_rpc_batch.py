@@ -0,0 +1,102 @@
+"""Tests for the batched JSON-RPC client"""
+import pytest
+
+from rpc_batch import BatchRPCClient, RPCBatchError
+
+ADDRESSES = [f"0x{i:040x}" for i in range(1, 8)]
+
+def balance_handler(payload):
+    """Answer eth_getBalance with balance = address as int, in reverse order"""
+    responses = []
+    for call in payload:
+        address = call['params'][0]
+        responses.append({'jsonrpc': '2.0', 'id': call['id'], 'result': hex(int(address, 16))})
+    return list(reversed(responses))
+
+def test_get_balances_chunks_and_matches_by_id(rpc_stub_server):
+    """Balances come back in input order even when responses are reordered"""
+    rpc_stub_server.handle = balance_handler
+    client = BatchRPCClient(rpc_stub_server.url, chunk_size=3)
+
+    balances = client.get_balances(ADDRESSES)
+
+    assert balances == list(range(1, 8))
+    assert [len(batch) for batch in rpc_stub_server.requests] == [3, 3, 1]
+    assert rpc_stub_server.requests[0][0]['method'] == 'eth_getBalance'
+    assert rpc_stub_server.requests[0][0]['params'][1] == 'latest'
+
+def test_get_nonces_with_block_number(rpc_stub_server):
+    """Integer block numbers are sent as hex quantities"""
+    rpc_stub_server.handle = lambda payload: [
+        {'jsonrpc': '2.0', 'id': call['id'], 'result': '0x5'} for call in payload]
+    client = BatchRPCClient(rpc_stub_server.url)
+
+    assert client.get_nonces(ADDRESSES[:2], block=18500000) == [5, 5]
+    call = rpc_stub_server.requests[0][0]
+    assert call['method'] == 'eth_getTransactionCount'
+    assert call['params'][1] == hex(18500000)
+
+def test_retries_only_failed_entries(rpc_stub_server):
+    """Entries that error are retried alone; good ones are not re-sent"""
+    seen = set()
+
+    def flaky(payload):
+        responses = []
+        for call in payload:
+            address = call['params'][0]
+            if address.lower().endswith('3') and address not in seen:
+                seen.add(address)
+                responses.append({'jsonrpc': '2.0', 'id': call['id'],
+                                  'error': {'code': -32005, 'message': 'rate limited'}})
+            elif address.lower().endswith('5'):
+                continue  # dropped from the batch once... and every time
+            else:
+                responses.append({'jsonrpc': '2.0', 'id': call['id'], 'result': '0x1'})
+        return responses
+
+    rpc_stub_server.handle = flaky
+    client = BatchRPCClient(rpc_stub_server.url, max_retries=1)
+
+    with pytest.raises(RPCBatchError) as exc:
+        client.get_balances(ADDRESSES)
+
+    assert list(exc.value.errors) == [4]
+    assert exc.value.results[2] == '0x1'
+    assert len(rpc_stub_server.requests) == 2
+    assert len(rpc_stub_server.requests[1]) == 2  # index 2 (error) and 4 (missing)
+
+def test_null_result_is_a_per_entry_error(rpc_stub_server):
+    """A node answering "result": null fails that entry instead of raising TypeError"""
+    rpc_stub_server.handle = lambda payload: [
+        {'jsonrpc': '2.0', 'id': call['id'], 'result': None if i == 1 else '0x2'}
+        for i, call in enumerate(payload)]
+    client = BatchRPCClient(rpc_stub_server.url, max_retries=0)
+
+    with pytest.raises(RPCBatchError) as exc:
+        client.get_nonces(ADDRESSES[:3])
+
+    assert list(exc.value.errors) == [1]
+    assert exc.value.results == ['0x2', None, '0x2']
+
+def test_invalid_address_rejected():
+    """Addresses are validated before any request is sent"""
+    client = BatchRPCClient('http://127.0.0.1:1')
+    with pytest.raises(ValueError, match="Invalid Ethereum address"):
+        client.get_balances(["not_an_address"])
+
+def test_wallet_manager_get_balances(rpc_stub_server, monkeypatch):
+    """WalletManager.get_balances returns exact Ether strings via one batch"""
+    from wallet_manager import WalletManager
+
+    def handler(payload):
+        if isinstance(payload, dict):  # single-call connection probe
+            return {'jsonrpc': '2.0', 'id': payload['id'], 'result': 'stub/v1'}
+        return [{'jsonrpc': '2.0', 'id': call['id'], 'result': hex(10 ** 18)} for call in payload]
+
+    monkeypatch.setenv('RPC_URL', rpc_stub_server.url)
+    rpc_stub_server.handle = handler
+
+    manager = WalletManager()
+    assert manager.get_balances(ADDRESSES[:3]) == ['1'] * 3
+    batches = [r for r in rpc_stub_server.requests if isinstance(r, list)]
+    assert len(batches) == 1
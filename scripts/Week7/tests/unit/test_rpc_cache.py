@@ -0,0 +1,105 @@
+"""Tests for the per-block RPC response cache"""
+import pytest
+
+from providers import make_web3
+from rpc_cache import BlockCache
+
+ADDRESS = "0xd8dA6BF26964aF9D7eEd9e03E53415D37aA96045"
+
+def block_hash(number, fork=0):
+    return '0x' + f'{fork:02x}{number:062x}'
+
+class FakeChain:
+    """Minimal JSON-RPC chain: head number, fork id, per-method call counts"""
+    def __init__(self):
+        self.head = 100
+        self.fork = 0
+        self.calls = {}
+
+    def block(self, number):
+        return {
+            'number': hex(number),
+            'hash': block_hash(number, self.fork),
+            'parentHash': block_hash(number - 1, self.fork),
+            'timestamp': hex(1699564800 + number * 12),
+            'transactions': [],
+            'gasUsed': '0x0',
+            'gasLimit': '0x1c9c380',
+        }
+
+    def __call__(self, payload):
+        method, params = payload['method'], payload['params']
+        self.calls[method] = self.calls.get(method, 0) + 1
+        results = {
+            'eth_chainId': lambda: '0x1',
+            'eth_gasPrice': lambda: hex(20 * 10 ** 9 + self.head),
+            'eth_blockNumber': lambda: hex(self.head),
+            'eth_getBalance': lambda: hex(10 ** 18 + self.fork),
+            'eth_getBlockByNumber': lambda: self.block(
+                self.head if params[0] == 'latest' else int(params[0], 16)),
+        }
+        return {'jsonrpc': '2.0', 'id': payload['id'], 'result': results[method]()}
+
+@pytest.fixture
+def chain(rpc_stub_server):
+    fake = FakeChain()
+    rpc_stub_server.handle = fake
+    return fake
+
+@pytest.fixture
+def cached_w3(rpc_stub_server, chain):
+    cache = BlockCache()
+    return make_web3(rpc_stub_server.url, cache=cache), cache
+
+def test_chain_id_cached_forever(cached_w3, chain):
+    """Immutable reads hit the node once"""
+    w3, cache = cached_w3
+    assert [w3.eth.chain_id for _ in range(5)] == [1] * 5
+    assert chain.calls['eth_chainId'] == 1
+    assert cache.stats()['hits'] == 4
+
+def test_gas_price_cached_until_new_head(cached_w3, chain):
+    """Head-relative data is reused until a new block is seen"""
+    w3, cache = cached_w3
+    first = w3.eth.gas_price
+    assert w3.eth.gas_price == first
+    assert chain.calls['eth_gasPrice'] == 1
+
+    chain.head += 1
+    cache.on_new_head(chain.head)
+    assert w3.eth.gas_price == first + 1
+    assert chain.calls['eth_gasPrice'] == 2
+
+def test_head_entries_expire_after_ttl(rpc_stub_server, chain):
+    """head_ttl bounds how stale 'latest' data can get"""
+    now = [0.0]
+    cache = BlockCache(head_ttl=2.0, clock=lambda: now[0])
+    w3 = make_web3(rpc_stub_server.url, cache=cache)
+
+    w3.eth.get_balance(ADDRESS)
+    w3.eth.get_balance(ADDRESS)
+    now[0] = 3.0
+    w3.eth.get_balance(ADDRESS)
+    assert chain.calls['eth_getBalance'] == 2
+
+def test_block_by_number_invalidated_on_reorg(cached_w3, chain):
+    """A different hash at a known height drops entries at and above it"""
+    w3, cache = cached_w3
+    w3.eth.get_block(99)
+    w3.eth.get_block(99)
+    w3.eth.get_balance(ADDRESS, block_identifier=99)
+    assert chain.calls['eth_getBlockByNumber'] == 1
+
+    chain.fork = 1                      # blocks 99+ replaced by a reorg
+    w3.eth.get_block(100)               # parentHash no longer matches 99
+    assert cache.stats()['reorgs'] == 1
+
+    assert w3.eth.get_block(99)['hash'].hex().endswith(block_hash(99, 1)[2:])
+    assert w3.eth.get_balance(ADDRESS, block_identifier=99) == 10 ** 18 + 1
+    assert chain.calls['eth_getBlockByNumber'] == 3
+
+def test_pending_is_never_cached(cached_w3, chain):
+    w3, _ = cached_w3
+    w3.eth.get_balance(ADDRESS, block_identifier='pending')
+    w3.eth.get_balance(ADDRESS, block_identifier='pending')
+    assert chain.calls['eth_getBalance'] == 2
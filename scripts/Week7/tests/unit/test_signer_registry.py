@@ -0,0 +1,128 @@
+"""Tests for the signer registry"""
+import time
+import pytest
+from eth_account import Account
+from eth_account.messages import encode_defunct
+
+from signer_registry import Signer, SignerRegistry
+
+KEY = '0x' + '11' * 32
+OTHER = '0x' + '22' * 32
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+def test_signatures_match_eth_account():
+    registry = SignerRegistry()
+    address = registry.add(KEY)
+    account = Account.from_key(KEY)
+    assert address == account.address
+
+    message = encode_defunct(text="attest")
+    assert registry.sign_message(address, "attest").signature == account.sign_message(message).signature
+
+    tx = {'nonce': 0, 'to': account.address, 'value': 1, 'gas': 21000,
+          'gasPrice': 10 ** 9, 'chainId': 1}
+    assert registry.sign_transaction(address, tx).raw_transaction == account.sign_transaction(tx).raw_transaction
+
+def test_each_key_parsed_once():
+    registry = SignerRegistry()
+    first = registry.signer_for_key(KEY)
+    assert registry.signer_for_key(bytes.fromhex(KEY[2:])) is first
+    assert registry.signer_for_key(KEY[2:].upper()) is first
+    assert registry.get(first.address.lower()) is first
+    assert registry.stats() == {'signers': 1, 'loads': 1, 'hits': 3, 'evictions': 0}
+
+def test_signer_is_compact():
+    signer = SignerRegistry().signer_for_key(KEY)
+    assert isinstance(signer, Signer)
+    assert not hasattr(signer, '__dict__')
+
+def test_idle_keys_evicted_and_zeroed():
+    clock = FakeClock()
+    registry = SignerRegistry(idle_timeout=60, clock=clock)
+    idle = registry.signer_for_key(KEY)
+    clock.now = 30
+    busy = registry.signer_for_key(OTHER)
+    clock.now = 70
+    registry.get(busy.address)
+
+    assert idle.address not in registry
+    assert busy.address in registry
+    assert idle._secret == bytearray(32)
+    with pytest.raises(KeyError):
+        registry.get(idle.address)
+    # Reloading the evicted key parses it again
+    assert registry.signer_for_key(KEY) is not idle
+    assert registry.loads == 3
+
+def test_max_signers_and_remove():
+    registry = SignerRegistry(max_signers=1)
+    first = registry.signer_for_key(KEY)
+    second = registry.signer_for_key(OTHER)
+    assert len(registry) == 1 and first._secret == bytearray(32)
+    assert registry.remove(second.address) is True
+    assert registry.remove(second.address) is False
+    assert len(registry) == 0
+
+def test_invalid_key():
+    with pytest.raises(ValueError):
+        SignerRegistry().add('0x1234')
+    with pytest.raises(ValueError):
+        SignerRegistry().add('0x' + 'zz' * 32)
+
+def test_wallet_manager_signs_as_session_account(tmp_path):
+    from wallet_manager import WalletManager
+    manager = WalletManager()
+    manager.signers = SignerRegistry()
+    exported = manager.export_keystore(KEY, 'pw', tmp_path, iterations=2 ** 4)
+    manager.import_keystore(exported['path'], 'pw')
+
+    signed = manager.sign_message_as(exported['address'], "hello")
+    assert signed == manager.sign_message(KEY, "hello")
+    assert manager.signers.loads == 1
+
+    manager.lock_session()
+    assert exported['address'] not in manager.signers
+    with pytest.raises(KeyError):
+        manager.sign_message_as(exported['address'], "hello")
+
+def test_background_sweep_evicts_without_further_use():
+    """Idle keys are zeroed by the timer even if the registry is never touched again"""
+    clock = FakeClock()
+    registry = SignerRegistry(idle_timeout=60, clock=clock, sweep_interval=0.01)
+    signer = registry.signer_for_key(KEY)
+    clock.now = 61
+    deadline = time.monotonic() + 5
+    while len(registry) and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert len(registry) == 0
+    assert signer._secret == bytearray(32)
+    assert registry._sweeper is None  # nothing left, so the timer is not re-armed
+
+def test_wallet_manager_close_only_removes_its_own_signers():
+    """close() zeroes what the manager loaded but leaves other users of the shared registry alone"""
+    from signer_registry import default_registry
+    from sign_message import sign_message
+    from wallet_manager import WalletManager
+    other = default_registry.signer_for_key(OTHER)
+    sign_message(OTHER, "someone else's session")
+    manager = WalletManager()
+    assert manager.signers is default_registry
+    mine = Account.from_key(KEY).address
+    manager.sign_message(KEY, "hello")
+    manager.session_keys['0xabc'] = bytearray(b'\x01' * 32)
+    session_key = manager.session_keys['0xabc']
+    try:
+        manager.close()
+
+        assert mine not in default_registry
+        assert other.address in default_registry and other._secret != bytearray(32)
+        assert session_key == bytearray(32) and manager.session_keys == {}
+        assert sign_message(OTHER, "still works")['signature']
+    finally:
+        default_registry.remove(other.address)
@@ -0,0 +1,54 @@
+"""Tests for lazy imports and the startup benchmark"""
+import json
+import subprocess
+import sys
+
+import pytest
+from eth_account import Account
+
+from startup_benchmark import ENTRY_POINTS, SCRIPTS_DIR, compare, measure_import, parse_importtime
+
+HEAVY = ('web3', 'eth_account', 'eth_keyfile', 'mnemonic', 'dotenv', 'requests', 'aiohttp')
+
+def loaded_heavy_modules(code):
+    script = f"import sys, json\n{code}\nprint(json.dumps([m for m in {HEAVY!r} if m in sys.modules]))"
+    result = subprocess.run([sys.executable, '-c', script], cwd=SCRIPTS_DIR,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.splitlines()[-1])
+
+@pytest.mark.parametrize('module', ['providers', *ENTRY_POINTS])
+def test_entry_points_import_without_heavy_dependencies(module):
+    assert loaded_heavy_modules(f"import {module}") == []
+
+def test_offline_wallet_manager_never_builds_a_provider():
+    code = ("from wallet_manager import WalletManager\n"
+            "m = WalletManager()\n"
+            "w = m.generate_new_wallet()\n"
+            "assert m._w3 is None and m._batch is None")
+    assert loaded_heavy_modules(code) == []
+
+def test_generate_new_wallet_key_matches_address():
+    from wallet_manager import WalletManager
+    wallet = WalletManager().generate_new_wallet()
+    assert Account.from_key(wallet['private_key']).address == wallet['address']
+
+def test_parse_importtime():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   amounts\n"
+        "import time:      2000 |       5000 | wallet_manager\n"
+        "something else\n"
+    )
+    assert parse_importtime(stderr) == {'amounts': (120, 120), 'wallet_manager': (2000, 5000)}
+
+def test_compare_flags_regressions_beyond_tolerance():
+    results = [{'module': 'a', 'import_ms': 100.0}, {'module': 'b', 'import_ms': 900.0},
+               {'module': 'c', 'import_ms': 50.0}]
+    baseline = {'a': 80.0, 'b': 20.0}
+    assert compare(results, baseline, tolerance=0.5, slack_ms=20) == [('b', 20.0, 900.0)]
+
+def test_measure_import():
+    result = measure_import('amounts', runs=1)
+    assert result['module'] == 'amounts'
+    assert result['import_ms'] > 0
+    assert all(name != 'amounts' for name, _ in result['heaviest'])
@@ -0,0 +1,90 @@
+"""Tests for the persistent token metadata cache"""
+import pytest
+
+from erc20_balance_checker import ERC20BalanceChecker
+from token_metadata_cache import TokenMetadataCache
+from erc20_fakes import DAI, HOLDERS, NOT_A_TOKEN, USDC, FakeChain
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def chain(mock_web3):
+    chain = FakeChain()
+    mock_web3.eth.call.side_effect = chain.call
+    mock_web3.eth.get_code.side_effect = chain.get_code
+    mock_web3.eth.chain_id = 1
+    return chain
+
+def test_metadata_fetched_once(mock_web3, chain, tmp_path):
+    """Repeat lookups are served from memory without eth_calls"""
+    checker = ERC20BalanceChecker(w3=mock_web3, cache_path=str(tmp_path / 'tokens.db'))
+    first = checker.get_tokens_metadata([USDC, DAI])
+    calls = len(chain.calls)
+    second = checker.get_tokens_metadata(['USDC', DAI])
+
+    assert first == second
+    assert second[USDC]['decimals'] == 6
+    assert second[DAI]['total_supply'] == 5 * 10**27
+    assert len(chain.calls) == calls == 1
+
+def test_restart_warms_from_disk(mock_web3, chain, tmp_path):
+    """A new process loads immutable fields from disk; only totalSupply is re-read"""
+    path = str(tmp_path / 'tokens.db')
+    ERC20BalanceChecker(w3=mock_web3, cache_path=path).get_tokens_metadata([USDC, DAI])
+    chain.calls.clear()
+
+    checker = ERC20BalanceChecker(w3=mock_web3, cache_path=path)
+    assert len(checker.metadata_cache) == 2
+    assert checker.metadata_cache.decimals(USDC) == 6
+    assert chain.calls == []
+
+    metadata = checker.get_token_metadata(DAI)
+    assert metadata['symbol'] == 'DAI'
+    assert metadata['total_supply'] == 5 * 10**27
+    assert len(chain.calls) == 1  # a single totalSupply aggregate
+
+def test_total_supply_refreshed_after_ttl(mock_web3, chain):
+    """totalSupply is re-fetched only once supply_ttl has passed"""
+    checker = ERC20BalanceChecker(w3=mock_web3)
+    clock = FakeClock()
+    cache = TokenMetadataCache(checker, supply_ttl=60, clock=clock)
+    assert cache.get(USDC)['total_supply'] == 25 * 10**15
+
+    chain.tokens[USDC]['supply'] = 26 * 10**15
+    clock.now = 59
+    assert cache.get(USDC)['total_supply'] == 25 * 10**15
+    clock.now = 60
+    assert cache.get(USDC)['total_supply'] == 26 * 10**15
+    assert cache.fetches == 2
+
+def test_keyed_by_chain_id(mock_web3, chain, tmp_path):
+    """The same address on another chain is a different token"""
+    path = str(tmp_path / 'tokens.db')
+    ERC20BalanceChecker(w3=mock_web3, cache_path=path).get_token_metadata(USDC)
+    chain.calls.clear()
+
+    mock_web3.eth.chain_id = 10
+    ERC20BalanceChecker(w3=mock_web3, cache_path=path).get_token_metadata(USDC)
+    assert len(chain.calls) == 1
+
+def test_non_token_not_persisted(mock_web3, chain, tmp_path):
+    """Addresses that don't answer decimals() aren't pinned in the cache"""
+    checker = ERC20BalanceChecker(w3=mock_web3, cache_path=str(tmp_path / 'tokens.db'))
+    assert checker.get_token_metadata(NOT_A_TOKEN)['decimals'] is None
+    assert len(checker.metadata_cache) == 0
+
+def test_check_balances_with_warm_cache(mock_web3, chain, tmp_path):
+    """With metadata cached, a balance report is a single aggregate"""
+    checker = ERC20BalanceChecker(w3=mock_web3, cache_path=str(tmp_path / 'tokens.db'))
+    checker.get_tokens_metadata([USDC, DAI])
+    chain.calls.clear()
+
+    report = checker.check_balances([USDC, DAI], HOLDERS)
+    assert len(chain.calls) == 1
+    assert report[0]['balances'][0]['formatted'] == '1000'
+    assert report[1]['token']['symbol'] == 'DAI'
@@ -0,0 +1,81 @@
+"""Tests for the address-indexed transfer lookup"""
+import random
+import pytest
+from hexbytes import HexBytes
+
+from transfer_indexer import TRANSFER_TOPIC
+from transfer_index import TransferIndex
+
+TOKEN = '0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48'
+ALICE = '0x742d35cc6634c0532925a3b844bc454e4438f44e'
+BOB = '0xd8da6bf26964af9d7eed9e03e53415d37aa96045'
+CAROL = '0x' + '11' * 20
+
+def make_log(sender, receiver, block, log_index=0, value=1):
+    return {
+        'address': TOKEN,
+        'topics': [HexBytes(TRANSFER_TOPIC),
+                   HexBytes('0x' + '00' * 12 + sender[2:]),
+                   HexBytes('0x' + '00' * 12 + receiver[2:])],
+        'data': HexBytes(value.to_bytes(32, 'big')),
+        'blockNumber': block,
+        'transactionHash': HexBytes(block.to_bytes(32, 'big')),
+        'logIndex': log_index
+    }
+
+def linear_scan(logs, address, from_block, to_block):
+    """Reference: the old per-query scan over every log"""
+    address = address.lower()[2:]
+    return [(log['blockNumber'], log['logIndex']) for log in logs
+            if from_block <= log['blockNumber'] <= to_block
+            and (log['topics'][1].hex()[-40:] == address or log['topics'][2].hex()[-40:] == address)]
+
+@pytest.fixture
+def index():
+    index = TransferIndex()
+    index.add_logs([make_log(ALICE, BOB, 10),
+                    make_log(BOB, CAROL, 10, log_index=1),
+                    make_log(ALICE, CAROL, 20),
+                    make_log(CAROL, ALICE, 30)])
+    return index
+
+def test_sent_and_received_are_separate(index):
+    """Sent and received postings are kept per direction"""
+    assert [t['block'] for t in index.sent(ALICE)] == [10, 20]
+    assert [t['block'] for t in index.received(ALICE)] == [30]
+    assert index.sent(BOB)[0]['to'] == '0x' + '11' * 20
+
+def test_block_range_is_inclusive(index):
+    """from_block and to_block are both included"""
+    assert [t['block'] for t in index.history(ALICE, 20, 30)] == [20, 30]
+    assert index.history(ALICE, 11, 19) == []
+    assert index.count(CAROL, to_block=20) == 2
+
+def test_unknown_address_and_bytes_key(index):
+    """Unknown addresses return nothing; raw 20-byte keys work too"""
+    assert index.history('0x' + '22' * 20) == []
+    assert index.count(bytes.fromhex(BOB[2:])) == 2
+    with pytest.raises(ValueError):
+        index.sent('0x1234')
+
+def test_incremental_appends_keep_order(index):
+    """Later (even out-of-order) batches slot into sorted position"""
+    index.add_logs([make_log(ALICE, BOB, 40)])
+    index.add_logs([make_log(BOB, ALICE, 15)])
+    assert [t['block'] for t in index.history(ALICE)] == [10, 15, 20, 30, 40]
+    assert len(index) == 6
+
+def test_matches_linear_scan():
+    """Index queries agree with a full scan over random logs"""
+    rng = random.Random(7)
+    addresses = ['0x' + bytes([i]).hex() * 20 for i in range(1, 9)]
+    logs = [make_log(rng.choice(addresses), rng.choice(addresses), block, log_index)
+            for block in range(200) for log_index in range(rng.randrange(4))]
+    index = TransferIndex()
+    for start in range(0, len(logs), 50):
+        index.add_logs(logs[start:start + 50])
+
+    for address in addresses:
+        lo, hi = sorted(rng.sample(range(200), 2))
+        found = [(t['block'], t['log_index']) for t in index.history(address, lo, hi)]
+        assert found == linear_scan(logs, address, lo, hi)
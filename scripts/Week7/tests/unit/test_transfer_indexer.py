@@ -0,0 +1,150 @@
+"""Tests for the streaming Transfer log indexer"""
+import json
+import pytest
+from hexbytes import HexBytes
+from web3.exceptions import Web3RPCError
+
+from transfer_indexer import (TRANSFER_TOPIC, TransferIndexer, decode_transfer,
+                              decode_transfer_columns)
+
+TOKEN = '0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48'
+FROM = '0x742d35cc6634c0532925a3b844bc454e4438f44e'
+TO = '0xd8da6bf26964af9d7eed9e03e53415d37aa96045'
+
+def make_log(block, value=1000000, log_index=0):
+    return {
+        'address': TOKEN,
+        'topics': [HexBytes(TRANSFER_TOPIC),
+                   HexBytes('0x' + '00' * 12 + FROM[2:]),
+                   HexBytes('0x' + '00' * 12 + TO[2:])],
+        'data': HexBytes(value.to_bytes(32, 'big')),
+        'blockNumber': block,
+        'transactionHash': HexBytes(block.to_bytes(32, 'big')),
+        'logIndex': log_index
+    }
+
+class FakeLogsNode:
+    """get_logs over a fixed log set; rejects ranges wider than max_range"""
+    def __init__(self, logs, max_range=None):
+        self.logs = logs
+        self.max_range = max_range
+        self.ranges = []
+
+    def get_logs(self, params):
+        start, end = params['fromBlock'], params['toBlock']
+        self.ranges.append((start, end))
+        if self.max_range and end - start + 1 > self.max_range:
+            raise Web3RPCError("query returned more than 10000 results")
+        return [log for log in self.logs if start <= log['blockNumber'] <= end]
+
+@pytest.fixture
+def node(mock_web3):
+    logs = [make_log(block) for block in range(0, 1000, 7)]
+    fake = FakeLogsNode(logs, max_range=64)
+    mock_web3.eth.get_logs.side_effect = fake.get_logs
+    mock_web3.eth.block_number = 999
+    return fake
+
+def test_decode_transfer_exact_value():
+    """18-decimal amounts stay exact integers"""
+    value = 123456789123456789123456789
+    transfer = decode_transfer(make_log(5, value=value))
+    assert transfer['value'] == value
+    assert transfer['from'] == '0x742d35Cc6634C0532925a3b844Bc454e4438f44e'
+    assert transfer['block'] == 5
+
+def test_decode_ignores_non_erc20_transfer():
+    """ERC-721 Transfer logs (4 topics, empty data) are skipped"""
+    log = make_log(5)
+    log['topics'].append(HexBytes('0x' + '00' * 32))
+    assert decode_transfer(log) is None
+
+def test_adaptive_chunks_shrink_and_grow(mock_web3, node):
+    """Chunks shrink on 'too many results' and the whole range is covered"""
+    indexer = TransferIndexer(mock_web3, TOKEN, chunk_size=500, target_results=100)
+    blocks = [t['block'] for t in indexer.transfers(0)]
+
+    assert blocks == list(range(0, 1000, 7))
+    succeeded = [r for r in node.ranges if r[1] - r[0] + 1 <= 64]
+    failed = [r for r in node.ranges if r[1] - r[0] + 1 > 64]
+    assert succeeded[0][0] == 0 and succeeded[-1][1] == 999
+    assert len(failed) <= 6  # the ceiling stops it re-trying oversized ranges each chunk
+
+def test_grows_when_sparse(mock_web3, node):
+    node.max_range = None
+    indexer = TransferIndexer(mock_web3, TOKEN, chunk_size=10, target_results=100)
+    list(indexer.transfers(0, 999))
+    assert len(node.ranges) < 10
+
+def test_checkpoint_and_resume(mock_web3, node, tmp_path):
+    """A restarted indexer resumes after the last finished chunk"""
+    checkpoint = str(tmp_path / 'usdc.json')
+    indexer = TransferIndexer(mock_web3, TOKEN, checkpoint_path=checkpoint, chunk_size=50)
+
+    stream = indexer.transfers(0, 999)
+    first = [next(stream) for _ in range(20)]
+    stream.close()  # simulated crash
+    saved = json.load(open(checkpoint))['last_block']
+    assert saved < first[-1]['block'] + 50
+
+    resumed = TransferIndexer(mock_web3, TOKEN, checkpoint_path=checkpoint, chunk_size=50)
+    rest = list(resumed.transfers())
+    assert rest[0]['block'] == saved + 1 + (-(saved + 1) % 7)
+    assert rest[-1]['block'] == 994
+    assert json.load(open(checkpoint))['last_block'] == 999
+
+def test_on_chunk_runs_before_checkpoint(mock_web3, node, tmp_path):
+    """The consumer's hook sees each chunk finished while the checkpoint still lags behind"""
+    checkpoint = str(tmp_path / 'usdc.json')
+    indexer = TransferIndexer(mock_web3, TOKEN, checkpoint_path=checkpoint, chunk_size=50)
+    seen = []
+
+    def on_chunk(chunk_to):
+        saved = indexer.load_checkpoint()
+        seen.append((saved, chunk_to))
+
+    list(indexer.transfers(0, 999, on_chunk=on_chunk))
+
+    assert seen[0] == (None, 49)
+    assert all(saved == previous for (saved, _), (_, previous) in zip(seen[1:], seen))
+    assert seen[-1][1] == 999 == indexer.load_checkpoint()
+
+def test_other_errors_propagate(mock_web3):
+    mock_web3.eth.get_logs.side_effect = Web3RPCError("execution reverted")
+    indexer = TransferIndexer(mock_web3, TOKEN)
+    with pytest.raises(Web3RPCError):
+        list(indexer.transfers(0, 10))
+
+def test_decode_transfer_columns_matches_rows():
+    """Columnar decoding agrees with per-log decoding"""
+    logs = [make_log(b, value=b * 10 ** 18 + 1, log_index=b % 3) for b in range(10)]
+    columns = decode_transfer_columns(logs)
+
+    assert len(columns) == 10
+    assert list(columns.rows()) == [decode_transfer(log) for log in logs]
+    assert columns.sender(3) == bytes.fromhex(FROM[2:])
+    assert columns.blocks.typecode == 'q'
+
+def test_decode_transfer_columns_hex_strings():
+    """Raw JSON-RPC logs with hex-string fields decode the same way"""
+    log = make_log(42, value=2 ** 255 + 7, log_index=4)
+    raw = {
+        'address': TOKEN.lower(),
+        'topics': ['0x' + bytes(t).hex() for t in log['topics']],
+        'data': '0x' + bytes(log['data']).hex(),
+        'blockNumber': hex(42),
+        'transactionHash': '0x' + bytes(log['transactionHash']).hex(),
+        'logIndex': hex(4),
+    }
+    columns = decode_transfer_columns([raw, {**raw, 'data': '0x'}])
+
+    assert len(columns) == 1
+    assert columns.row(0) == decode_transfer(log)
+    assert columns.values[0] == 2 ** 255 + 7
+
+def test_transfer_columns_batches(mock_web3, node):
+    node.max_range = None
+    indexer = TransferIndexer(mock_web3, TOKEN, chunk_size=100, max_chunk=100)
+    batches = list(indexer.transfer_columns(0, 999))
+    assert len(batches) == 10
+    assert sum(len(b) for b in batches) == len(range(0, 1000, 7))
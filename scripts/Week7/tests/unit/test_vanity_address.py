@@ -0,0 +1,59 @@
+"""Tests for the vanity address search"""
+import pytest
+from eth_account import Account
+
+from vanity_address import compile_pattern, estimate_eta, search
+
+def matches(address, prefix='', suffix=''):
+    body = address[2:].lower()
+    return body.startswith(prefix.lower()) and body.endswith(suffix.lower())
+
+def test_compile_pattern_masks():
+    """Prefix and suffix nibbles map onto the 160-bit address integer"""
+    pattern = compile_pattern('0xAb', 'c')
+    assert pattern['nibbles'] == 3
+    assert pattern['difficulty'] == 16 ** 3
+    assert pattern['mask'] == (0xff << 152) | 0xf
+    assert pattern['value'] == (0xab << 152) | 0xc
+    assert compile_pattern()['difficulty'] == 1
+
+@pytest.mark.parametrize('prefix,suffix', [('zz', ''), ('', '0' * 41)])
+def test_compile_pattern_rejects_bad_input(prefix, suffix):
+    with pytest.raises(ValueError):
+        compile_pattern(prefix, suffix)
+
+def test_search_finds_valid_key():
+    """The returned key really controls the matching address"""
+    wallet = search('a', 'b1', workers=1, seed=7)
+    assert matches(wallet['address'], 'a', 'b1')
+    assert Account.from_key(wallet['private_key']).address == wallet['address']
+    assert wallet['attempts'] >= 1
+    assert wallet['difficulty'] == 16 ** 3
+
+def test_seeded_search_is_reproducible():
+    first = search('', 'ee', workers=1, seed=42)
+    second = search('', 'ee', workers=1, seed=42)
+    assert first['private_key'] == second['private_key']
+    assert first['attempts'] == second['attempts']
+    assert search('', 'ee', workers=1, seed=43)['private_key'] != first['private_key']
+
+def test_max_attempts_and_progress():
+    """An unreachable pattern gives up and reports progress on the way"""
+    reports = []
+    result = search('0' * 20, workers=1, seed=1, batch_size=64, max_attempts=640,
+                    progress=reports.append, progress_interval=0)
+    assert result is None
+    assert reports and reports[-1]['attempts'] >= 640
+    assert reports[-1]['rate'] > 0
+    assert reports[-1]['p50_seconds'] > reports[-1]['expected_seconds'] / 2
+
+def test_multiprocess_stops_on_first_hit():
+    wallet = search('f', workers=2, seed=5, progress_interval=0.05)
+    assert matches(wallet['address'], 'f')
+    assert Account.from_key(wallet['private_key']).address == wallet['address']
+
+def test_estimate_eta():
+    eta = estimate_eta(16, 16, 8.0)
+    assert eta['expected_seconds'] == 2.0
+    assert 0.6 < eta['probability'] < 0.65
+    assert estimate_eta(16, 0, 0)['p50_seconds'] is None
@@ -0,0 +1,71 @@
+"""Tests for batch signature verification"""
+import pytest
+from eth_account import Account
+from eth_account.messages import encode_defunct
+
+from sign_message import hash_eip191, verify_many, verify_signature
+
+TEST_PK = "0x4c0883a69102937d6231471b5dbb6204fe512961708279f8c1c9f2e1f9c0e8a7"
+ADDRESS = "0xE091624C6467e0F36E2E17861F64406Fd1f67C55"
+
+@pytest.fixture
+def signed_batch():
+    account = Account.from_key(TEST_PK)
+    messages = [f"Sign in nonce {i}" for i in range(6)]
+    signatures = [account.sign_message(encode_defunct(text=m)).signature for m in messages]
+    return messages, signatures
+
+def test_hash_eip191_matches_eth_account():
+    message = "Test message for Week 7"
+    signed = Account.from_key(TEST_PK).sign_message(encode_defunct(text=message))
+    assert hash_eip191(message) == bytes(signed.message_hash)
+
+def test_verify_many_all_valid(signed_batch):
+    messages, signatures = signed_batch
+    valid, failed = verify_many(messages, signatures, [ADDRESS.lower()] * 6)
+    assert valid == bytearray([1] * 6)
+    assert failed == []
+
+def test_verify_many_reports_failed_indices(signed_batch):
+    """Wrong message, wrong signer, garbage signature and bad address all fail"""
+    messages, signatures = signed_batch
+    messages[1] = "tampered"
+    expected = [ADDRESS] * 6
+    expected[2] = "0xd8dA6BF26964aF9D7eEd9e03E53415D37aA96045"
+    expected[5] = "not_an_address"
+    signatures[3] = "0x" + "00" * 65
+
+    valid, failed = verify_many(messages, signatures, expected, chunk_size=2)
+
+    assert failed == [1, 2, 3, 5]
+    assert list(valid) == [1, 0, 0, 0, 1, 0]
+
+def test_verify_many_rejects_wrong_length_signatures(signed_batch):
+    """Trailing junk or a truncated signature fails, as Account.recover_message would"""
+    messages, signatures = signed_batch
+    signatures[0] = bytes(signatures[0]) + b'junkjunk'
+    signatures[1] = '0x' + bytes(signatures[1]).hex() + '1b'
+    signatures[2] = bytes(signatures[2])[:64]
+    signatures[3] = bytes(signatures[3])[:-10]
+
+    valid, failed = verify_many(messages, signatures, [ADDRESS] * 6)
+
+    assert failed == [0, 1, 2, 3]
+    assert list(valid) == [0, 0, 0, 0, 1, 1]
+
+def test_verify_many_process_pool(signed_batch):
+    messages, signatures = signed_batch
+    hex_signatures = ['0x' + bytes(s).hex() for s in signatures]
+    serial = verify_many(messages, hex_signatures, [ADDRESS] * 6, chunk_size=2)
+    parallel = verify_many(messages, hex_signatures, [ADDRESS] * 6, workers=2, chunk_size=2)
+    assert parallel == serial
+
+def test_verify_many_length_mismatch():
+    with pytest.raises(ValueError):
+        verify_many(["a"], [], [ADDRESS])
+
+def test_verify_signature_case_insensitive(signed_batch):
+    """Single verification still accepts any address casing"""
+    messages, signatures = signed_batch
+    result = verify_signature(messages[0], signatures[0], ADDRESS.lower())
+    assert result['is_valid']
@@ -0,0 +1,153 @@
+"""Tests for the headless wallet_manager batch mode"""
+import io
+import json
+
+import pytest
+
+TEST_MNEMONIC = "test test test test test test test test test test test junk"
+KEY = '0x' + '11' * 32
+GOOD = '0x742d35Cc6634C0532925a3b844Bc454e4438f44e'
+FAILING = '0x' + '00' * 19 + '01'
+
+@pytest.fixture
+def manager(monkeypatch, rpc_stub_server):
+    from wallet_manager import WalletManager
+
+    def handler(payload):
+        if isinstance(payload, dict):  # connection probe
+            return {'jsonrpc': '2.0', 'id': payload['id'], 'result': 'stub/v1'}
+        responses = []
+        for call in payload:
+            if call['params'][0] == FAILING:
+                responses.append({'jsonrpc': '2.0', 'id': call['id'],
+                                  'error': {'code': -32000, 'message': 'boom'}})
+            else:
+                responses.append({'jsonrpc': '2.0', 'id': call['id'], 'result': hex(15 * 10 ** 17)})
+        return responses
+
+    monkeypatch.setenv('RPC_URL', rpc_stub_server.url)
+    rpc_stub_server.handle = handler
+    manager = WalletManager()
+    manager.batch.max_retries = 0
+    manager.server = rpc_stub_server
+    return manager
+
+def records(*lines):
+    from wallet_manager import iter_jsonl
+    return iter_jsonl(io.StringIO("\n".join(lines)))
+
+def test_balance_chunks_and_per_record_errors(manager):
+    from wallet_manager import run_batch
+    lines = [json.dumps({'id': i, 'address': a}) for i, a in
+             enumerate([GOOD, 'nope', FAILING, GOOD.lower()])] + ['{broken']
+    results = list(run_batch(manager, 'balance', records(*lines), chunk_size=3))
+
+    assert [r['line'] for r in results] == [1, 2, 3, 4, 5]
+    assert results[0] == {'line': 1, 'id': 0, 'address': GOOD, 'balance': '1.5'}
+    assert 'Invalid Ethereum address' in results[1]['error']
+    assert 'boom' in results[2]['error']
+    assert results[3]['balance'] == '1.5'
+    assert results[4]['error'].startswith('invalid JSON')
+    batches = [r for r in manager.server.requests if isinstance(r, list)]
+    assert [len(b) for b in batches] == [2, 1]   # one RPC batch per chunk
+
+def test_sign_then_verify(manager):
+    from wallet_manager import run_batch
+    signed = list(run_batch(manager, 'sign', records(
+        json.dumps({'private_key': KEY, 'message': 'one'}),
+        json.dumps({'address': GOOD, 'message': 'two'}))))
+    assert signed[0]['signature']
+    assert 'No key unlocked' in signed[1]['error']
+
+    checks = [
+        {'message': 'one', 'signature': signed[0]['signature'], 'address': signed[0]['signer']},
+        {'message': 'other', 'signature': signed[0]['signature'], 'address': signed[0]['signer']},
+        {'message': 'one', 'signature': signed[0]['signature']},
+        {'message': 'one'},
+    ]
+    verified = list(run_batch(manager, 'verify', records(*map(json.dumps, checks))))
+    assert verified[0]['valid'] is True
+    assert verified[1]['valid'] is False
+    assert verified[2]['signer'] == signed[0]['signer']
+    assert 'required' in verified[3]['error']
+
+def test_derive_expands_records(manager):
+    from wallet_manager import run_batch
+    results = list(run_batch(manager, 'derive', records(
+        json.dumps({'mnemonic': TEST_MNEMONIC, 'start': 0, 'count': 3}),
+        json.dumps({'start': 0}))))
+    assert [r.get('index') for r in results] == [0, 1, 2, None]
+    assert results[0]['address'] == '0xf39Fd6e51aad88F6F4ce6aB8827279cffFb92266'
+    assert 'private_key' not in results[0]
+    assert 'mnemonic' in results[3]['error']
+
+def test_malformed_records_do_not_abort(manager):
+    """Wrong field types, a bogus mnemonic and bad signatures become per-record errors"""
+    from wallet_manager import run_batch
+    signed = list(run_batch(manager, 'sign', records(
+        json.dumps({'private_key': KEY, 'message': 5}),
+        json.dumps({'private_key': KEY, 'message': 'ok'}))))
+    assert 'message must be a string' in signed[0]['error']
+    signature, signer = signed[1]['signature'], signed[1]['signer']
+
+    derived = list(run_batch(manager, 'derive', records(
+        json.dumps({'mnemonic': 'bogus words'}),
+        json.dumps({'mnemonic': TEST_MNEMONIC}))))
+    assert 'error' in derived[0]
+    assert derived[1]['index'] == 0
+
+    checks = [
+        {'message': 1, 'signature': signature, 'address': signer},
+        {'message': 'ok', 'signature': signature + '00', 'address': signer},
+        {'message': 'ok', 'signature': signature[:-2], 'address': signer},
+        {'message': 'ok', 'signature': 'zz', 'address': signer},
+        {'message': 'ok', 'signature': signature, 'address': 'not_an_address'},
+        {'message': 'ok', 'signature': signature, 'address': GOOD},
+        {'message': 'ok', 'signature': signature, 'address': signer},
+    ]
+    verified = list(run_batch(manager, 'verify', records(*map(json.dumps, checks))))
+    assert ['error' in r for r in verified] == [True] * 5 + [False] * 2
+    assert '65 bytes' in verified[1]['error'] and '65 bytes' in verified[2]['error']
+    assert verified[5]['valid'] is False
+    assert verified[6]['valid'] is True
+
+def test_batch_main_counts_verify_errors(manager, tmp_path, capsys):
+    from wallet_manager import batch_main
+    source = tmp_path / 'in.jsonl'
+    source.write_text(json.dumps({'message': 'hi', 'signature': '0x' + '11' * 66, 'address': GOOD}) + "\n")
+    out = tmp_path / 'out.jsonl'
+    assert batch_main(['--op', 'verify', '--input', str(source), '--output', str(out)]) == 1
+    assert 'error' in json.loads(out.read_text())
+    assert '1 errors' in capsys.readouterr().err
+
+def test_derive_streams_large_counts(manager):
+    """A huge count is derived lazily as output is consumed, not collected up front"""
+    from itertools import islice
+    from wallet_manager import run_batch
+    pulled = []
+
+    def derive_range(mnemonic, start, count, **kwargs):
+        for index in range(start, start + count):
+            pulled.append(index)
+            yield {'index': index}
+
+    manager.derive_range = derive_range
+    stream = run_batch(manager, 'derive', records(
+        json.dumps({'mnemonic': TEST_MNEMONIC, 'start': 0, 'count': 10 ** 12})))
+    assert [r['index'] for r in islice(stream, 3)] == [0, 1, 2]
+    assert len(pulled) == 3
+
+def test_batch_main_files(manager, tmp_path, monkeypatch, capsys):
+    from wallet_manager import batch_main
+    source = tmp_path / 'in.jsonl'
+    source.write_text(json.dumps({'address': GOOD}) + "\n\n" + json.dumps({'address': GOOD}) + "\n")
+    out = tmp_path / 'out.jsonl'
+    assert batch_main(['--op', 'nonce', '--input', str(source), '--output', str(out)]) == 0
+    lines = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [(r['line'], r['nonce']) for r in lines] == [(1, 15 * 10 ** 17), (3, 15 * 10 ** 17)]
+    assert '2 records in, 2 out, 0 errors' in capsys.readouterr().err
+
+def test_unknown_op(manager):
+    from wallet_manager import run_batch
+    with pytest.raises(ValueError):
+        list(run_batch(manager, 'transfer', []))
@@ -3,6 +3,8 @@ import pytest
 from unittest.mock import Mock, MagicMock
 from web3 import Web3
 
+from amounts import format_units
+
 @pytest.fixture
 def mock_erc20_contract():
     """Mock ERC-20 contract"""
@@ -37,9 +39,9 @@ def test_get_token_metadata(mock_erc20_contract):
     assert metadata['total_supply'] == 25000000000000000
 
 def get_token_balance(contract, address, decimals):
-    """Get formatted token balance"""
+    """Get formatted token balance (exact decimal string)"""
     raw_balance = contract.functions.balanceOf(address).call()
-    formatted_balance = raw_balance / (10 ** decimals)
+    formatted_balance = format_units(raw_balance, decimals)
     return formatted_balance
 
 def test_get_token_balance(mock_erc20_contract, sample_addresses):
@@ -50,15 +52,16 @@ def test_get_token_balance(mock_erc20_contract, sample_addresses):
         6
     )
     
-    assert balance == 1000.0  # 1000000000 / 10^6
+    assert balance == '1000'  # 1000000000 / 10^6
 
 @pytest.mark.parametrize("raw_balance,decimals,expected", [
-    (1000000, 6, 1.0),
-    (1500000, 6, 1.5),
-    (1000000000000000000, 18, 1.0),
-    (0, 18, 0.0)
+    (1000000, 6, '1'),
+    (1500000, 6, '1.5'),
+    (1000000000000000000, 18, '1'),
+    (0, 18, '0'),
+    (123456789123456789123456789, 18, '123456789.123456789123456789')  # beyond float precision
 ])
 def test_balance_formatting(raw_balance, decimals, expected):
     """Test balance formatting with various decimals"""
-    result = raw_balance / (10 ** decimals)
+    result = format_units(raw_balance, decimals)
     assert result == expected
@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Address validation helpers shared by the sync and async wallet code.
+"""
+
+
+def checksum_address(address):
+    """Validate an address and return its checksummed form."""
+    from eth_utils import is_address, to_checksum_address  # deferred: slow to import
+    if not address or not is_address(address):
+        raise ValueError(f"Invalid Ethereum address: {address}")
+    return to_checksum_address(address)
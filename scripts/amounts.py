@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Exact fixed-point formatting for token and ETH amounts.
+
+On-chain amounts are integers scaled by 10**decimals. Dividing them as floats
+loses precision above 2**53 (about 0.009 ETH in wei), and going through
+Decimal allocates an object per amount. Everything here is integer divmod
+against a cached power-of-ten table, producing exact decimal strings.
+
+    format_units(1500000, 6)                -> '1.5'
+    format_ether(10**18 // 3, precision=6)  -> '0.333333'
+    parse_units('0.001', 18)                -> 1000000000000000
+"""
+
+from decimal import Decimal
+from functools import lru_cache
+
+UNIT_DECIMALS = {'wei': 0, 'gwei': 9, 'ether': 18}
+
+# decimals() is a uint8, but nearly every token uses 0-18
+_POWERS_OF_TEN = tuple(10 ** i for i in range(78))
+
+
+def power_of_ten(decimals):
+    """10**decimals, from the precomputed table when possible."""
+    if 0 <= decimals < len(_POWERS_OF_TEN):
+        return _POWERS_OF_TEN[decimals]
+    return _large_power_of_ten(decimals)
+
+
+@lru_cache(maxsize=None)
+def _large_power_of_ten(decimals):
+    if decimals < 0:
+        raise ValueError(f"decimals must be non-negative, got {decimals}")
+    return 10 ** decimals
+
+
+def format_units(amount, decimals, precision=None):
+    """
+    Format an integer amount with the given number of decimals as an exact
+    decimal string.
+
+    Args:
+        amount: Raw integer amount (e.g. a balanceOf() result or wei)
+        decimals: Token decimals (18 for ETH in wei, 9 for gwei)
+        precision: Fixed number of fractional digits, rounded half up
+            (default: exact, with trailing zeros stripped)
+    """
+    sign = ''
+    if amount < 0:
+        sign = '-'
+        amount = -amount
+
+    if precision is None:
+        whole, frac = divmod(amount, power_of_ten(decimals))
+        if not frac:
+            return f'{sign}{whole}'
+        return f'{sign}{whole}.{frac:0{decimals}d}'.rstrip('0')
+
+    if precision < decimals:
+        step = power_of_ten(decimals - precision)
+        amount = (amount + step // 2) // step
+    elif precision > decimals:
+        amount *= power_of_ten(precision - decimals)
+    if not amount:
+        sign = ''
+    whole, frac = divmod(amount, power_of_ten(precision))
+    if not precision:
+        return f'{sign}{whole}'
+    return f'{sign}{whole}.{frac:0{precision}d}'
+
+
+def format_units_batch(amounts, decimals, precision=None):
+    """
+    format_units() over many amounts with the same decimals, e.g. every
+    balance of one token in a report. None entries (failed lookups) stay None.
+    """
+    if precision is not None:
+        return [None if amount is None else format_units(amount, decimals, precision)
+                for amount in amounts]
+
+    scale = power_of_ten(decimals)
+    formatted = []
+    append = formatted.append
+    for amount in amounts:
+        if amount is None:
+            append(None)
+        elif amount < 0:
+            append(format_units(amount, decimals))
+        else:
+            whole, frac = divmod(amount, scale)
+            append(f'{whole}.{frac:0{decimals}d}'.rstrip('0') if frac else str(whole))
+    return formatted
+
+
+def format_ether(wei, precision=None):
+    """Wei as an exact ETH string."""
+    return format_units(wei, 18, precision)
+
+
+def parse_units(value, decimals):
+    """
+    Convert a human amount (str, int, float or Decimal) to a raw integer.
+    Digits beyond `decimals` are truncated, as Web3.to_wei does.
+    """
+    if isinstance(value, int):
+        return value * power_of_ten(decimals)
+    if isinstance(value, float):
+        value = Decimal(repr(value))  # shortest repr, e.g. 0.1 -> '0.1', not its binary expansion
+    text = value.strip() if isinstance(value, str) else format(value, 'f')
+    sign = 1
+    if text.startswith('-'):
+        sign = -1
+        text = text[1:]
+    whole, _, frac = text.partition('.')
+    if not (whole or frac) or not (whole + frac).isdigit():
+        raise ValueError(f"Invalid amount: {value}")
+    frac = frac[:decimals].ljust(decimals, '0')
+    return sign * (int(whole or '0') * power_of_ten(decimals) + int(frac or '0'))
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Async Wallet Manager - asyncio variant of WalletManager's RPC methods.
+Portfolio sweeps over tens of thousands of addresses spend almost all their
+time waiting on the network, so requests are fanned out concurrently with a
+semaphore bounding how many are in flight.
+"""
+
+import asyncio
+
+from address_utils import checksum_address
+from amounts import format_ether
+from connection_health import ConnectionHealth
+from providers import make_async_web3
+
+
+class AsyncWalletManager:
+    def __init__(self, rpc_url=None):
+        self.w3 = make_async_web3(rpc_url)
+        self.health = ConnectionHealth(self.w3)
+
+    async def get_balance(self, address):
+        """Get ETH balance for address as an exact decimal string. Raises NotConnectedError if offline."""
+        balance_wei = await self.health.call_async(self.w3.eth.get_balance,
+                                                   checksum_address(address))
+        return format_ether(balance_wei)
+
+    async def get_nonce(self, address):
+        """Get transaction nonce for address. Raises NotConnectedError if offline."""
+        return await self.health.call_async(self.w3.eth.get_transaction_count,
+                                            checksum_address(address))
+
+    async def gather_balances(self, addresses, concurrency=64):
+        """
+        Fetch balances for many addresses, yielding results as they finish.
+
+        At most `concurrency` requests are in flight at once. Each result is a
+        dict with 'address', 'balance' (ETH, or None) and 'error' (or None),
+        so one bad address doesn't abort the sweep.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(address):
+            async with semaphore:
+                try:
+                    balance = await self.get_balance(address)
+                    return {'address': address, 'balance': balance, 'error': None}
+                except Exception as e:
+                    return {'address': address, 'balance': None, 'error': str(e)}
+
+        tasks = [asyncio.ensure_future(fetch(address)) for address in addresses]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def close(self):
+        """Close the provider's HTTP session."""
+        await self.w3.provider.disconnect()
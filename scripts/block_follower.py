@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Follow new block headers as an async iterator.
+
+Uses an eth_subscribe('newHeads') WebSocket stream when WS_URL is available
+and falls back to polling eth_blockNumber (with backoff on errors) over
+HTTP. Every header is checked against its parent hash: missing blocks are
+fetched to fill gaps, and when a known block is replaced the reorg depth is
+reported on the first header of the new branch.
+
+Usage:
+    follower = BlockFollower(rpc_url, ws_url)
+    follower.add_listener(lambda h: cache.on_block(h['number'], h['hash'], h['parent_hash']))
+    async for header in follower:
+        print(header['number'], header['reorg_depth'])
+
+aiohttp and websockets are imported when following starts.
+"""
+
+from collections import deque
+from contextlib import aclosing
+import asyncio
+import itertools
+import json
+import os
+import sys
+import time
+
+from providers import get_rpc_url, get_timeout, load_env
+
+
+def _transport_errors():
+    """Exceptions meaning the connection failed rather than the request."""
+    import aiohttp
+    from websockets.exceptions import WebSocketException
+    return (OSError, asyncio.TimeoutError, aiohttp.ClientError, WebSocketException)
+
+
+class RPCError(ValueError):
+    """JSON-RPC error response."""
+
+
+def normalize_header(raw):
+    """Convert a JSON-RPC block header into a dict with int fields."""
+    base_fee = raw.get('baseFeePerGas')
+    return {
+        'number': int(raw['number'], 16),
+        'hash': raw['hash'].lower(),
+        'parent_hash': raw['parentHash'].lower(),
+        'timestamp': int(raw['timestamp'], 16),
+        'base_fee': int(base_fee, 16) if base_fee is not None else None,
+        'reorg_depth': 0
+    }
+
+
+class BlockFollower:
+    def __init__(self, rpc_url=None, ws_url=None, poll_interval=2.0, max_backoff=30.0,
+                 max_reorg_depth=64, max_gap=128, ws_retry_interval=60.0, clock=time.monotonic):
+        """
+        Args:
+            rpc_url: HTTP endpoint for polling and backfills (default RPC_URL)
+            ws_url: WebSocket endpoint for newHeads (default WS_URL; None to only poll)
+            poll_interval: Seconds between eth_blockNumber polls
+            max_backoff: Longest wait between retries after errors
+            max_reorg_depth: Number of recent block hashes remembered for reorg checks
+            max_gap: Largest gap that is backfilled; beyond it the chain view restarts
+            ws_retry_interval: Seconds of polling before the WebSocket is tried again
+        """
+        load_env()
+        self.rpc_url = get_rpc_url(rpc_url)
+        self.ws_url = ws_url if ws_url is not None else os.getenv('WS_URL')
+        self.poll_interval = poll_interval
+        self.max_backoff = max_backoff
+        self.max_reorg_depth = max_reorg_depth
+        self.max_gap = max_gap
+        self.ws_retry_interval = ws_retry_interval
+        self._clock = clock
+        self._listeners = []
+        self._hashes = {}          # block number -> hash, for the last max_reorg_depth blocks
+        self._ids = itertools.count(1)
+        self._ws = None
+        self._ws_buffer = deque()
+        self._http = None
+        self.mode = None
+        self.head = None
+        self.reorgs = 0
+        self.gaps_filled = 0
+        self.gaps_skipped = 0
+        self.errors = 0
+
+    def add_listener(self, callback):
+        """Call callback(header) for every header, before it is yielded."""
+        self._listeners.append(callback)
+
+    def __aiter__(self):
+        return self.follow()
+
+    # -- transports -- #
+
+    async def _request(self, method, params):
+        if self._ws is not None:
+            return await self._ws_request(method, params)
+        request = {'jsonrpc': '2.0', 'id': next(self._ids), 'method': method, 'params': params}
+        async with self._http.post(self.rpc_url, json=request) as response:
+            response.raise_for_status()
+            body = await response.json()
+        if body.get('error') is not None:
+            raise RPCError(body['error'])
+        return body.get('result')
+
+    async def _ws_request(self, method, params):
+        request_id = next(self._ids)
+        await self._ws.send(json.dumps(
+            {'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params}))
+        while True:
+            message = json.loads(await self._ws.recv())
+            if message.get('id') == request_id:
+                if message.get('error') is not None:
+                    raise RPCError(message['error'])
+                return message.get('result')
+            # A new head arrived while waiting: keep it for the stream
+            self._ws_buffer.append(message)
+
+    async def _next_ws_message(self):
+        if self._ws_buffer:
+            return self._ws_buffer.popleft()
+        return json.loads(await self._ws.recv())
+
+    async def _header_by_hash(self, block_hash):
+        raw = await self._request('eth_getBlockByHash', [block_hash, False])
+        if raw is None:
+            raise RPCError(f"block {block_hash} not found")
+        return normalize_header(raw)
+
+    # -- chain tracking -- #
+
+    async def _accept(self, header):
+        """
+        Link header to the known chain, fetching parents for gaps and
+        replaced blocks. Returns the headers to emit, oldest first.
+        """
+        if self._hashes.get(header['number']) == header['hash']:
+            return []  # already seen
+
+        newest = max(self._hashes) if self._hashes else None
+        chain = [header]
+        if newest is not None and header['number'] - newest - 1 > self.max_gap:
+            self.gaps_skipped += 1
+            self._hashes.clear()
+            newest = None
+
+        while newest is not None:
+            tip = chain[-1]
+            parent_number = tip['number'] - 1
+            known = self._hashes.get(parent_number)
+            if known == tip['parent_hash']:
+                break
+            if known is None and parent_number <= newest:
+                break  # older than what we remember: accept as is
+            if known is not None and newest - parent_number >= self.max_reorg_depth:
+                break
+            if known is None:
+                self.gaps_filled += 1
+            chain.append(await self._header_by_hash(tip['parent_hash']))
+
+        chain.reverse()
+        fork = chain[0]['number']
+        replaced = [number for number in self._hashes if number >= fork]
+        if replaced:
+            self.reorgs += 1
+            chain[0]['reorg_depth'] = len(replaced)
+            for number in replaced:
+                del self._hashes[number]
+
+        for block in chain:
+            self._hashes[block['number']] = block['hash']
+            for callback in self._listeners:
+                callback(block)
+        while len(self._hashes) > self.max_reorg_depth:
+            del self._hashes[min(self._hashes)]
+        self.head = chain[-1]
+        return chain
+
+    # -- following -- #
+
+    async def follow(self):
+        """Yield headers forever, preferring the WebSocket stream."""
+        import aiohttp
+
+        retryable = (RPCError, *_transport_errors())
+        ws_retry_at = 0.0
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=get_timeout())) as http:
+            self._http = http
+            while True:
+                if self.ws_url and self._clock() >= ws_retry_at:
+                    try:
+                        async with aclosing(self._follow_ws()) as headers:
+                            async for header in headers:
+                                yield header
+                    except retryable:
+                        self.errors += 1
+                    finally:
+                        self._ws = None
+                        self._ws_buffer.clear()
+                    ws_retry_at = self._clock() + self.ws_retry_interval
+
+                # The HTTP endpoint is always set (get_rpc_url falls back to the
+                # default), so polling covers every gap until WebSockets is retried
+                async with aclosing(self._follow_polling(ws_retry_at if self.ws_url else None)) as headers:
+                    async for header in headers:
+                        yield header
+
+    async def _follow_ws(self):
+        import websockets
+
+        async with websockets.connect(self.ws_url) as ws:
+            self._ws = ws
+            subscription = await self._ws_request('eth_subscribe', ['newHeads'])
+            self.mode = 'ws'
+            while True:
+                message = await self._next_ws_message()
+                params = message.get('params') or {}
+                if message.get('method') != 'eth_subscription' or params.get('subscription') != subscription:
+                    continue
+                for header in await self._accept(normalize_header(params['result'])):
+                    yield header
+
+    async def _follow_polling(self, until=None):
+        self.mode = 'poll'
+        retryable = (RPCError, *_transport_errors())
+        backoff = self.poll_interval
+        while until is None or self._clock() < until:
+            try:
+                number = int(await self._request('eth_blockNumber', []), 16)
+                if self.head is None or number > self.head['number']:
+                    raw = await self._request('eth_getBlockByNumber', [hex(number), False])
+                    headers = await self._accept(normalize_header(raw)) if raw else []
+                else:
+                    headers = []
+            except retryable:
+                self.errors += 1
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+
+            backoff = self.poll_interval
+            for header in headers:
+                yield header
+            if not headers:
+                await asyncio.sleep(self.poll_interval)
+
+    def stats(self):
+        return {
+            'mode': self.mode,
+            'head': self.head['number'] if self.head else None,
+            'reorgs': self.reorgs,
+            'gaps_filled': self.gaps_filled,
+            'gaps_skipped': self.gaps_skipped,
+            'errors': self.errors
+        }
+
+
+async def _print_heads(follower, limit):
+    count = 0
+    async for header in follower:
+        marker = f" ⚠️  reorg, {header['reorg_depth']} block(s) replaced" if header['reorg_depth'] else ""
+        print(f"🧱 #{header['number']} {header['hash'][:18]}... via {follower.mode}{marker}")
+        count += 1
+        if limit and count >= limit:
+            break
+
+
+def main():
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    follower = BlockFollower()
+    print("=" * 70)
+    print("BLOCK FOLLOWER (Ctrl+C to stop)")
+    print("=" * 70)
+    try:
+        asyncio.run(_print_heads(follower, limit))
+    except KeyboardInterrupt:
+        pass
+    print(f"\n📊 {follower.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Connection-health tracking for Web3 providers.
+
+Calling w3.is_connected() before every request doubles the request count.
+ConnectionHealth remembers that the provider worked: any successful call
+marks it healthy for `ttl` seconds, and a real probe is only sent after a
+failure or once the TTL has expired.
+"""
+
+import threading
+import time
+
+
+class NotConnectedError(ConnectionError):
+    """Raised when the Ethereum node cannot be reached."""
+
+
+class ConnectionHealth:
+    def __init__(self, w3, ttl=30.0, clock=time.monotonic):
+        """
+        Args:
+            w3: Web3 instance to track
+            ttl: Seconds a successful call keeps the provider marked healthy
+            clock: Time source (overridable in tests)
+        """
+        self.w3 = w3
+        self.ttl = ttl
+        self._clock = clock
+        self._healthy_until = 0.0
+        self._lock = threading.Lock()
+        self.probes = 0
+        self.probes_saved = 0
+        self.failures = 0
+
+    @property
+    def is_healthy(self):
+        """True while a recent success is within the TTL."""
+        return self._clock() < self._healthy_until
+
+    def mark_healthy(self):
+        with self._lock:
+            self._healthy_until = self._clock() + self.ttl
+
+    def mark_failed(self):
+        with self._lock:
+            self._healthy_until = 0.0
+            self.failures += 1
+
+    def _needs_probe(self):
+        with self._lock:
+            if self._clock() < self._healthy_until:
+                self.probes_saved += 1
+                return False
+            self.probes += 1
+            return True
+
+    def _probe_result(self, connected):
+        if not connected:
+            self.mark_failed()
+            raise NotConnectedError("Failed to connect to Ethereum node")
+        self.mark_healthy()
+
+    def ensure_connected(self):
+        """Probe the provider only if its health is unknown, stale or failed."""
+        if not self._needs_probe():
+            return
+        try:
+            connected = self.w3.is_connected()
+        except OSError:
+            connected = False
+        self._probe_result(connected)
+
+    async def ensure_connected_async(self):
+        """Async version of ensure_connected() for AsyncWeb3 instances."""
+        if not self._needs_probe():
+            return
+        try:
+            connected = await self.w3.is_connected()
+        except OSError:
+            connected = False
+        self._probe_result(connected)
+
+    def call(self, fn, *args, **kwargs):
+        """
+        Run an RPC call, tracking provider health around it.
+        Raises NotConnectedError if the node is unreachable.
+        """
+        self.ensure_connected()
+        try:
+            result = fn(*args, **kwargs)
+        except OSError as e:
+            # requests' ConnectionError/Timeout are OSError subclasses
+            self.mark_failed()
+            raise NotConnectedError(f"RPC call failed: {e}") from e
+        self.mark_healthy()
+        return result
+
+    async def call_async(self, fn, *args, **kwargs):
+        """Await an async RPC call, tracking provider health around it."""
+        await self.ensure_connected_async()
+        try:
+            result = await fn(*args, **kwargs)
+        except OSError as e:
+            # aiohttp connection errors and timeouts are OSError subclasses
+            self.mark_failed()
+            raise NotConnectedError(f"RPC call failed: {e}") from e
+        self.mark_healthy()
+        return result
+
+    def stats(self):
+        """Return probe counters."""
+        return {
+            'probes': self.probes,
+            'probes_saved': self.probes_saved,
+            'failures': self.failures,
+            'healthy': self.is_healthy
+        }
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Helper functions for the token/transfer database.
+
+Bulk ingest goes through executemany inserts on the Core connection, in large
+transactions, instead of adding ORM objects one at a time. Engines are
+opened in WAL mode so readers aren't blocked while a backfill is writing.
+"""
+
+from sqlalchemy import create_engine, event, func, insert, or_, select
+from sqlalchemy.orm import sessionmaker
+
+from address_utils import checksum_address
+from models import Base, Token, Transfer, Wallet
+
+DIRECTIONS = ('sent', 'received', 'both')
+
+
+def create_db_engine(path):
+    """
+    Create a SQLite engine for path (or a full database URL) with WAL
+    journaling and relaxed fsyncs, and make sure all tables exist.
+    """
+    url = path if '://' in path else f'sqlite:///{path}'
+    engine = create_engine(url)
+
+    if engine.dialect.name == 'sqlite':
+        @event.listens_for(engine, 'connect')
+        def _set_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute('PRAGMA journal_mode=WAL')
+            # Safe with WAL: a crash can lose the last commit, never corrupt the file
+            cursor.execute('PRAGMA synchronous=NORMAL')
+            # 64 MB page cache keeps the address indexes hot during bulk ingest
+            cursor.execute('PRAGMA cache_size=-65536')
+            cursor.close()
+
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def create_session(engine):
+    return sessionmaker(bind=engine)()
+
+
+TRANSFER_COLUMNS = ('token_address', 'from_address', 'to_address', 'value',
+                    'block_number', 'log_index', 'tx_hash')
+INSERT_TRANSFERS = (f"INSERT OR IGNORE INTO transfers ({', '.join(TRANSFER_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(TRANSFER_COLUMNS))})")
+
+
+def _transfer_params(transfer):
+    # Positional tuples go straight to the driver's executemany, skipping
+    # per-row parameter processing
+    return (transfer['token'], transfer['from'], transfer['to'], str(transfer['value']),
+            transfer['block'], transfer['log_index'], transfer['tx_hash'])
+
+
+def ingest_transfers(engine, transfers, batch_size=50000):
+    """
+    Bulk insert decoded transfers (decode_transfer() dicts or a
+    TransferColumns batch). Each batch is one executemany in one
+    transaction; transfers already stored (same tx_hash and log_index) are
+    skipped, so re-ingesting an overlapping range is safe.
+
+    Args:
+        engine: Engine from create_db_engine()
+        transfers: Iterable of transfer dicts, or TransferColumns
+        batch_size: Rows per transaction
+
+    Returns:
+        Number of new rows inserted
+    """
+    if hasattr(transfers, 'rows'):
+        transfers = transfers.rows()
+
+    known_tokens = set()
+    inserted = 0
+
+    batch = []
+    for transfer in transfers:
+        batch.append(_transfer_params(transfer))
+        if len(batch) >= batch_size:
+            inserted += _ingest_batch(engine, batch, known_tokens)
+            batch = []
+    if batch:
+        inserted += _ingest_batch(engine, batch, known_tokens)
+    return inserted
+
+
+def _ingest_batch(engine, batch, known_tokens):
+    new_tokens = {row[0] for row in batch} - known_tokens
+    with engine.begin() as conn:
+        if new_tokens:
+            # Placeholder rows so every transfer has its token; metadata is filled in later
+            conn.execute(insert(Token.__table__).prefix_with('OR IGNORE'),
+                         [{'address': address} for address in new_tokens])
+        before = _total_changes(conn)
+        conn.exec_driver_sql(INSERT_TRANSFERS, batch)
+        inserted = _total_changes(conn) - before
+    known_tokens.update(new_tokens)
+    return inserted
+
+
+def _total_changes(conn):
+    return conn.exec_driver_sql('SELECT total_changes()').scalar()
+
+
+def _address_filter(address, direction):
+    if direction not in DIRECTIONS:
+        raise ValueError(f"direction must be one of {DIRECTIONS}, got {direction!r}")
+    address = checksum_address(address)
+    if direction == 'sent':
+        return Transfer.from_address == address
+    if direction == 'received':
+        return Transfer.to_address == address
+    return or_(Transfer.from_address == address, Transfer.to_address == address)
+
+
+def _block_filters(from_block, to_block):
+    filters = []
+    if from_block is not None:
+        filters.append(Transfer.block_number >= from_block)
+    if to_block is not None:
+        filters.append(Transfer.block_number <= to_block)
+    return filters
+
+
+def get_transfers_by_address(session, address, from_block=None, to_block=None,
+                             direction='both', limit=None):
+    """
+    Transfers touching address in [from_block, to_block], in chain order.
+
+    Args:
+        session: SQLAlchemy session
+        address: Wallet address
+        from_block / to_block: Inclusive block bounds (optional)
+        direction: 'sent', 'received' or 'both'
+        limit: Maximum number of rows (optional)
+    """
+    query = (select(Transfer)
+             .where(_address_filter(address, direction), *_block_filters(from_block, to_block))
+             .order_by(Transfer.block_number, Transfer.log_index))
+    if limit is not None:
+        query = query.limit(limit)
+    return list(session.scalars(query))
+
+
+def count_transfers(session, address, from_block=None, to_block=None, direction='both'):
+    """Number of transfers touching address; answered from the address indexes."""
+    query = (select(func.count())
+             .select_from(Transfer)
+             .where(_address_filter(address, direction), *_block_filters(from_block, to_block)))
+    return session.scalar(query)
+
+
+def get_token(session, address):
+    return session.scalar(select(Token).where(Token.address == checksum_address(address)))
+
+
+def add_wallet(session, address, label=None):
+    """Track a wallet address (no-op if already tracked). Returns the Wallet."""
+    address = checksum_address(address)
+    wallet = session.scalar(select(Wallet).where(Wallet.address == address))
+    if wallet is None:
+        wallet = Wallet(address=address, label=label)
+        session.add(wallet)
+        session.commit()
+    return wallet
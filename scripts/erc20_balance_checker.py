@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+ERC-20 balance checker for any token and any number of holders.
+
+Balances for N holders x M tokens, plus each token's name/symbol/decimals/
+totalSupply, are packed into Multicall3 aggregate3() calls, so a report
+costs a few eth_calls instead of one per function per token. Chunks of
+calls run concurrently. On chains without Multicall3 (e.g. a fresh local
+dev chain) the same calls are made one eth_call at a time.
+
+Usage:
+    python3 scripts/erc20_balance_checker.py --examples
+    python3 scripts/erc20_balance_checker.py USDC 0xADDRESS1 0xADDRESS2
+    python3 scripts/erc20_balance_checker.py USDC 0xADDRESS --cache tokens.db
+
+eth_abi and web3 are imported on first use so --help and errors stay fast.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import threading
+
+from amounts import format_units, format_units_batch
+from providers import make_web3
+from token_metadata_cache import TokenMetadataCache
+
+# Same address on mainnet and most EVM chains
+MULTICALL3_ADDRESS = '0xcA11bde05977b3631167028862bE2a173976CA11'
+
+# Function selectors: keccak256(signature)[:4]
+AGGREGATE3_SELECTOR = bytes.fromhex('82ad56cb')    # aggregate3((address,bool,bytes)[])
+NAME_SELECTOR = bytes.fromhex('06fdde03')          # name()
+SYMBOL_SELECTOR = bytes.fromhex('95d89b41')        # symbol()
+DECIMALS_SELECTOR = bytes.fromhex('313ce567')      # decimals()
+TOTAL_SUPPLY_SELECTOR = bytes.fromhex('18160ddd')  # totalSupply()
+BALANCE_OF_SELECTOR = bytes.fromhex('70a08231')    # balanceOf(address)
+
+POPULAR_TOKENS = {
+    'USDC': '0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48',
+    'DAI': '0x6B175474E89094C44Da98b954EedeAC495271d0F',
+    'WETH': '0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2',
+    'UNI': '0x1f9840a85d5aF5bf1D1762F925BDADdC4201F984',
+    'LINK': '0x514910771AF9Ca656af840dff83E8264EcF986CA',
+}
+
+EXAMPLE_HOLDERS = [
+    '0xd8dA6BF26964aF9D7eEd9e03E53415D37aA96045',  # Vitalik
+    '0xde0B295669a9FD93d5F28D9Ec85E40f4cb697BAe',  # Ethereum Foundation
+]
+
+
+def encode_balance_of(holder):
+    """Calldata for balanceOf(holder)."""
+    return BALANCE_OF_SELECTOR + bytes(12) + bytes.fromhex(holder[2:])
+
+
+def decode_uint(data):
+    if data is None or len(data) < 32:
+        return None
+    return int.from_bytes(data[:32], 'big')
+
+
+def decode_text(data):
+    """
+    Decode a name()/symbol() result. Most tokens return an ABI string; some
+    older ones (e.g. MKR) return bytes32.
+    """
+    if data is None or len(data) < 32:
+        return None
+    if len(data) == 32:
+        return data.rstrip(b'\x00').decode('utf-8', errors='replace')
+    from eth_abi import decode
+    try:
+        return decode(['string'], data)[0]
+    except Exception:
+        return None
+
+
+class ERC20BalanceChecker:
+    def __init__(self, w3=None, rpc_url=None, multicall_address=MULTICALL3_ADDRESS,
+                 batch_size=500, max_workers=4, block='latest', cache_path=None,
+                 supply_ttl=300.0):
+        """
+        Args:
+            w3: Web3 instance (optional, created from rpc_url on first use)
+            rpc_url: RPC endpoint used when w3 is not given
+            multicall_address: Multicall3 deployment, or None to never aggregate
+            batch_size: Sub-calls per aggregate3() eth_call
+            max_workers: Aggregate eth_calls in flight at once
+            block: Block to read at, so all results come from the same state
+            cache_path: SQLite file for a persistent token metadata cache (optional)
+            supply_ttl: Seconds a cached totalSupply stays fresh
+        """
+        self._w3 = w3
+        self.rpc_url = rpc_url
+        self.multicall_address = multicall_address
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.block = block
+        self._multicall_available = None if multicall_address else False
+        self.eth_calls = 0
+        self._eth_calls_lock = threading.Lock()  # counted from executor threads
+        self._chain_id = None
+        self.metadata_cache = (TokenMetadataCache(self, cache_path, supply_ttl)
+                               if cache_path else None)
+
+    @property
+    def w3(self):
+        if self._w3 is None:
+            self._w3 = make_web3(self.rpc_url)
+        return self._w3
+
+    @property
+    def chain_id(self):
+        if self._chain_id is None:
+            self._chain_id = self.w3.eth.chain_id
+        return self._chain_id
+
+    # -- input handling -- #
+
+    def validate_address(self, address):
+        """Return the checksummed address, or None if address is empty or invalid."""
+        from eth_utils import is_address, to_checksum_address
+        if not address or not is_address(address):
+            return None
+        return to_checksum_address(address)
+
+    def resolve_token(self, token):
+        """Accept a popular token symbol (USDC, DAI, ...) or a token address."""
+        if token and token.upper() in POPULAR_TOKENS:
+            return POPULAR_TOKENS[token.upper()]
+        address = self.validate_address(token)
+        if address is None:
+            raise ValueError(f"Unknown token or invalid address: {token}")
+        return address
+
+    # -- call aggregation -- #
+
+    def _eth_call(self, to, data):
+        with self._eth_calls_lock:
+            self.eth_calls += 1
+        return bytes(self.w3.eth.call({'to': to, 'data': '0x' + data.hex()}, self.block))
+
+    def _use_multicall(self):
+        if self._multicall_available is None:
+            code = self.w3.eth.get_code(self.multicall_address)
+            self._multicall_available = len(code) > 0
+        return self._multicall_available
+
+    def _aggregate_chunk(self, calls):
+        from eth_abi import decode, encode
+        data = AGGREGATE3_SELECTOR + encode(
+            ['(address,bool,bytes)[]'],
+            [[(target, True, calldata) for target, calldata in calls]])
+        returned = self._eth_call(self.multicall_address, data)
+        results = decode(['(bool,bytes)[]'], returned)[0]
+        return [return_data if success else None for success, return_data in results]
+
+    def _single_call(self, call):
+        from web3.exceptions import BadFunctionCallOutput, ContractLogicError, Web3RPCError
+        target, calldata = call
+        try:
+            return self._eth_call(target, calldata)
+        except (ContractLogicError, Web3RPCError, BadFunctionCallOutput):
+            # Reverts and non-contract targets surface as a missing value, as in aggregate3;
+            # connection errors propagate instead of looking like missing balances
+            return None
+
+    def aggregate(self, calls):
+        """
+        Execute (target, calldata) read calls and return their raw return
+        data in order, with None for calls that reverted.
+        """
+        calls = list(calls)
+        if not calls:
+            return []
+        if not self._use_multicall():
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                return list(executor.map(self._single_call, calls))
+
+        chunks = [calls[start:start + self.batch_size]
+                  for start in range(0, len(calls), self.batch_size)]
+        if len(chunks) == 1:
+            return self._aggregate_chunk(chunks[0])
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as executor:
+            results = []
+            for chunk_results in executor.map(self._aggregate_chunk, chunks):
+                results.extend(chunk_results)
+            return results
+
+    # -- token queries -- #
+
+    def get_tokens_metadata(self, tokens):
+        """
+        Return {token_address: metadata} for many tokens, from the metadata
+        cache if enabled, otherwise in one aggregate.
+        """
+        addresses = [self.resolve_token(token) for token in tokens]
+        if self.metadata_cache is not None:
+            return self.metadata_cache.get_many(addresses)
+        return self.fetch_tokens_metadata(addresses)
+
+    def fetch_tokens_metadata(self, addresses):
+        """
+        Read metadata for checksummed token addresses from chain in one
+        aggregate, bypassing the metadata cache. Returns {address: metadata}.
+        """
+        calls = []
+        for address in addresses:
+            calls.extend((address, selector) for selector in
+                         (NAME_SELECTOR, SYMBOL_SELECTOR, DECIMALS_SELECTOR, TOTAL_SUPPLY_SELECTOR))
+        results = self.aggregate(calls)
+
+        metadata = {}
+        for i, address in enumerate(addresses):
+            name, symbol, decimals, total_supply = results[i * 4:i * 4 + 4]
+            metadata[address] = {
+                'address': address,
+                'name': decode_text(name),
+                'symbol': decode_text(symbol),
+                'decimals': decode_uint(decimals),
+                'total_supply': decode_uint(total_supply)
+            }
+        return metadata
+
+    def fetch_total_supplies(self, addresses):
+        """Read totalSupply for checksummed token addresses in one aggregate: {address: supply}."""
+        results = self.aggregate((address, TOTAL_SUPPLY_SELECTOR) for address in addresses)
+        return {address: decode_uint(data) for address, data in zip(addresses, results)}
+
+    def get_token_metadata(self, token):
+        """Return name, symbol, decimals and total supply for one token."""
+        return next(iter(self.get_tokens_metadata([token]).values()))
+
+    def get_balances(self, tokens, holders):
+        """
+        Return {token_address: {holder: raw_balance}} for every token/holder
+        pair. A balance is None when the call reverted (e.g. not a token).
+        """
+        token_addresses = [self.resolve_token(token) for token in tokens]
+        holder_addresses = self._validate_holders(holders)
+        calls = [(token, encode_balance_of(holder))
+                 for token in token_addresses for holder in holder_addresses]
+        results = iter(self.aggregate(calls))
+        return {token: {holder: decode_uint(next(results)) for holder in holder_addresses}
+                for token in token_addresses}
+
+    def get_token_balance(self, token, holder):
+        """Raw balance of one holder (None if the call failed)."""
+        balances = self.get_balances([token], [holder])
+        return next(iter(next(iter(balances.values())).values()))
+
+    def check_balances(self, tokens, holders):
+        """
+        Full report: metadata and formatted balances for every token/holder
+        pair, fetched together in as few eth_calls as the batch size allows.
+        """
+        token_addresses = [self.resolve_token(token) for token in tokens]
+        holder_addresses = self._validate_holders(holders)
+        if self.metadata_cache is not None:
+            return self._check_balances_cached(token_addresses, holder_addresses)
+
+        calls = []
+        for token in token_addresses:
+            calls.extend((token, selector) for selector in
+                         (NAME_SELECTOR, SYMBOL_SELECTOR, DECIMALS_SELECTOR, TOTAL_SUPPLY_SELECTOR))
+            calls.extend((token, encode_balance_of(holder)) for holder in holder_addresses)
+        results = iter(self.aggregate(calls))
+
+        report = []
+        for token in token_addresses:
+            metadata = {
+                'address': token,
+                'name': decode_text(next(results)),
+                'symbol': decode_text(next(results)),
+                'decimals': decode_uint(next(results)),
+                'total_supply': decode_uint(next(results))
+            }
+            raws = [decode_uint(next(results)) for _ in holder_addresses]
+            report.append({'token': metadata,
+                           'balances': _balance_rows(holder_addresses, raws, metadata['decimals'])})
+        return report
+
+    def _check_balances_cached(self, token_addresses, holder_addresses):
+        # Metadata usually comes from the cache, leaving one aggregate for balances
+        metadata = self.metadata_cache.get_many(token_addresses)
+        balances = self.get_balances(token_addresses, holder_addresses)
+        report = []
+        for token in token_addresses:
+            raws = list(balances[token].values())
+            report.append({'token': metadata[token],
+                           'balances': _balance_rows(holder_addresses, raws,
+                                                     metadata[token]['decimals'])})
+        return report
+
+    @staticmethod
+    def format_balance(raw_balance, decimals):
+        """Exact decimal string for a raw balance (None if either is unknown)."""
+        if raw_balance is None or decimals is None:
+            return None
+        return format_units(raw_balance, decimals)
+
+    def _validate_holders(self, holders):
+        addresses = []
+        for holder in holders:
+            address = self.validate_address(holder)
+            if address is None:
+                raise ValueError(f"Invalid Ethereum address: {holder}")
+            addresses.append(address)
+        return addresses
+
+
+def _balance_rows(holders, raws, decimals):
+    if decimals is None:
+        formatted = [None] * len(raws)
+    else:
+        formatted = format_units_batch(raws, decimals)
+    return [{'holder': holder, 'balance': raw, 'formatted': text}
+            for holder, raw, text in zip(holders, raws, formatted)]
+
+
+def print_report(report):
+    for entry in report:
+        token = entry['token']
+        print("=" * 70)
+        if token['symbol'] is None:
+            print(f"❌ {token['address']} does not look like an ERC-20 token")
+            continue
+        print(f"🪙 {token['name']} ({token['symbol']})")
+        print(f"   Address:      {token['address']}")
+        print(f"   Decimals:     {token['decimals']}")
+        if token['total_supply'] is not None and token['decimals'] is not None:
+            print(f"   Total Supply: {format_units(token['total_supply'], token['decimals'], precision=2)}")
+        print()
+        for balance in entry['balances']:
+            if balance['formatted'] is None:
+                print(f"   {balance['holder']}: ❌ balance unavailable")
+            else:
+                print(f"   {balance['holder']}: {balance['formatted']} {token['symbol']}")
+    print("=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check ERC-20 token balances")
+    parser.add_argument('token', nargs='?', help="token symbol (USDC, DAI, WETH, UNI, LINK) or address")
+    parser.add_argument('addresses', nargs='*', help="holder addresses")
+    parser.add_argument('--examples', action='store_true',
+                        help="check all popular tokens for a few well-known addresses")
+    parser.add_argument('--cache', help="SQLite file to cache token metadata in across runs")
+    args = parser.parse_args()
+
+    checker = ERC20BalanceChecker(cache_path=args.cache)
+    if args.examples:
+        tokens, holders = list(POPULAR_TOKENS), EXAMPLE_HOLDERS
+    elif args.token and args.addresses:
+        tokens, holders = [args.token], args.addresses
+    else:
+        parser.error("give a token and at least one address, or use --examples")
+
+    try:
+        report = checker.check_balances(tokens, holders)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    except OSError as e:  # ConnectionError and requests' transport errors
+        print(f"❌ Connection error: {e}")
+        return
+
+    print_report(report)
+    print(f"📡 {checker.eth_calls} eth_call(s) for {len(tokens)} token(s) x {len(holders)} address(es)")
+
+
+if __name__ == "__main__":
+    main()
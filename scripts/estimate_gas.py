@@ -2,44 +2,376 @@
 """
 Estimate gas costs for Ethereum transactions.
 Compare different gas prices and calculate transaction costs.
+
+Fee tiers come from FeeOracle, which keeps a rolling eth_feeHistory window
+and updates it incrementally as new blocks appear, so a fee quote per
+transaction costs no history fetch. Gas limits come from GasEstimator, which
+caches eth_estimateGas results per call shape.
 """
 
-from web3 import Web3
-from dotenv import load_dotenv
-import os
+from collections import deque
+import threading
+import time
 
-load_dotenv()
+from address_utils import checksum_address
+from amounts import UNIT_DECIMALS, format_ether, format_units, parse_units
+from lru_cache import LRUCache
+from providers import make_web3
+from rpc_batch import RPCBatchError
 
-def estimate_simple_transfer(w3):
-    """Estimate gas for a simple ETH transfer."""
-    return 21000  # Fixed cost for simple ETH transfer
+TRANSFER_GAS = 21000  # intrinsic gas of a plain ETH transfer to an account without code
 
-def get_gas_prices(w3):
-    """Get current gas prices at different priority levels."""
-    current_gas = w3.eth.gas_price
-    current_gwei = float(w3.from_wei(current_gas, 'gwei'))
-    
-    return {
-        'slow': current_gwei * 0.8,      # 20% below average
-        'average': current_gwei,
-        'fast': current_gwei * 1.2,      # 20% above average
-        'instant': current_gwei * 1.5    # 50% above average
-    }
+# tier -> (priority fee reward percentile, blocks of worst-case base fee growth to absorb).
+# Every tier covers at least 7 blocks - the known next base fee, then six 12.5%
+# rises, ~2x (the usual headroom); cheaper tiers wait longer, so they cover more.
+FEE_TIERS = {
+    'slow': (10, 12),
+    'average': (50, 9),
+    'fast': (75, 7),
+    'instant': (95, 7),
+}
+
+class FeeOracle:
+    """
+    EIP-1559 fee quotes from a rolling window of eth_feeHistory.
+
+    Each block in the window contributes its priority fee rewards at the tier
+    percentiles; per-tier sums are kept incrementally, and tier quotes are
+    recomputed only when the window changes, so quote() is O(1).
+    """
+
+    def __init__(self, w3, window=20, refresh_interval=12.0, tiers=None, clock=time.monotonic):
+        """
+        Args:
+            w3: Web3 instance
+            window: Number of recent blocks to average priority fees over
+            refresh_interval: Seconds after which quote() looks for new blocks
+                (0 to only update when update() / on_new_head() is called)
+            tiers: {name: (reward percentile, blocks ahead)} (default FEE_TIERS)
+            clock: Time source (injectable for tests)
+        """
+        self.w3 = w3
+        self.window = window
+        self.refresh_interval = refresh_interval
+        self.tiers = tiers or FEE_TIERS
+        self._clock = clock
+        self._percentiles = sorted({percentile for percentile, _ in self.tiers.values()})
+        self._lock = threading.Lock()
+        self._blocks = deque()       # (number, rewards tuple in _percentiles order)
+        self._sums = [0] * len(self._percentiles)
+        self._last_block = None
+        self._next_base_fee = None
+        self._quotes = {}
+        self._updated_at = None
+        self.fetches = 0
+
+    def update(self, latest=None):
+        """
+        Pull fee history for blocks added since the last update (the whole
+        window on first use). Returns the number of new blocks.
+        """
+        if latest is None:
+            latest = self.w3.eth.block_number
+        with self._lock:
+            self._updated_at = self._clock()
+            if self._last_block is not None and latest <= self._last_block:
+                return 0
+            count = self.window if self._last_block is None else min(self.window, latest - self._last_block)
+            self.fetches += 1
+            history = self.w3.eth.fee_history(count, latest, self._percentiles)
+            oldest = history['oldestBlock']
+            for offset, rewards in enumerate(history['reward']):
+                self._push(oldest + offset, tuple(rewards))
+            self._last_block = latest
+            self._next_base_fee = history['baseFeePerGas'][-1]
+            self._recompute()
+            return len(history['reward'])
+
+    def on_new_head(self, number):
+        """Feed from a block follower: fetch just the new block(s)."""
+        return self.update(number)
+
+    def _push(self, number, rewards):
+        if self._blocks and number <= self._blocks[-1][0]:
+            return
+        self._blocks.append((number, rewards))
+        for i, reward in enumerate(rewards):
+            self._sums[i] += reward
+        while len(self._blocks) > self.window:
+            _, evicted = self._blocks.popleft()
+            for i, reward in enumerate(evicted):
+                self._sums[i] -= reward
+
+    def _recompute(self):
+        blocks = len(self._blocks) or 1
+        index = {percentile: i for i, percentile in enumerate(self._percentiles)}
+        quotes = {}
+        for tier, (percentile, blocks_ahead) in self.tiers.items():
+            priority = self._sums[index[percentile]] // blocks
+            base_fee = self.base_fee_projection(blocks_ahead)
+            quotes[tier] = {
+                'base_fee': self._next_base_fee,
+                'max_priority_fee_per_gas': priority,
+                'max_fee_per_gas': base_fee + priority,
+                'expected_fee_per_gas': self._next_base_fee + priority
+            }
+        self._quotes = quotes
+
+    def base_fee_projection(self, blocks_ahead=1):
+        """
+        Highest base fee possible blocks_ahead blocks from now: the next
+        block's base fee is known exactly, after that each full block can
+        raise it by at most 12.5%.
+        """
+        base_fee = self._next_base_fee
+        for _ in range(blocks_ahead - 1):
+            base_fee += -(-base_fee // 8)
+        return base_fee
+
+    def quote(self, tier='average'):
+        """
+        Fee quote for a tier, in wei: base_fee (next block),
+        max_priority_fee_per_gas, max_fee_per_gas (covers base fee growth
+        for the tier's blocks ahead) and expected_fee_per_gas.
+        """
+        if tier not in self.tiers:
+            raise ValueError(f"Unknown fee tier {tier!r}, expected one of {list(self.tiers)}")
+        if self._updated_at is None or (
+                self.refresh_interval and self._clock() - self._updated_at >= self.refresh_interval):
+            self.update()
+        return self._quotes[tier]
+
+    def transaction_fields(self, tier='average'):
+        """maxFeePerGas / maxPriorityFeePerGas for a type-2 transaction."""
+        quote = self.quote(tier)
+        return {
+            'maxFeePerGas': quote['max_fee_per_gas'],
+            'maxPriorityFeePerGas': quote['max_priority_fee_per_gas']
+        }
+
+def _data_bytes(data):
+    if not data:
+        return b''
+    if isinstance(data, str):
+        return bytes.fromhex(data[2:] if data.startswith('0x') else data)
+    return bytes(data)
+
+def calldata_length_class(data):
+    """Bucket calldata by argument size: 0, 1, 2, 3-4, 5-8, ... 32-byte words."""
+    words = (max(len(data) - 4, 0) + 31) // 32
+    return (words - 1).bit_length() + 1 if words else 0
+
+class GasEstimator:
+    """
+    eth_estimateGas with a cache keyed by call shape:
+    (to, function selector, calldata length class, code hash of to).
+
+    Calls of the same shape against the same contract code cost about the
+    same gas, so e.g. repeated ERC-20 transfers on a known token skip the
+    RPC after the first estimate. A safety margin covers what the shape
+    doesn't capture (a recipient's first balance write costs more than later
+    ones). Plain transfers to accounts without code are exactly 21000 gas.
+    """
+
+    def __init__(self, w3, margin_percent=20, maxsize=4096, batch_client=None):
+        """
+        Args:
+            w3: Web3 instance
+            margin_percent: Added on top of cached/estimated gas
+            maxsize: Max call shapes (and code hashes) kept
+            batch_client: BatchRPCClient for estimate_many() (optional;
+                otherwise misses are estimated one call at a time)
+        """
+        self.w3 = w3
+        self.margin_percent = margin_percent
+        self.batch_client = batch_client
+        self._estimates = LRUCache(maxsize)
+        self._code_hashes = LRUCache(maxsize)
+        self.rpc_estimates = 0
+
+    def _with_margin(self, gas):
+        return gas * (100 + self.margin_percent) // 100
+
+    def code_hash(self, address):
+        """keccak256 of the code at address (b'' for accounts without code), cached."""
+        address = checksum_address(address)
+        code_hash = self._code_hashes.get(address)
+        if code_hash is None:
+            code_hash = self._hash_code(self.w3.eth.get_code(address))
+            self._code_hashes.put(address, code_hash)
+        return code_hash
+
+    @staticmethod
+    def _hash_code(code):
+        code = _data_bytes(code)
+        from eth_hash.auto import keccak
+        return keccak(code) if code else b''
+
+    def cache_key(self, tx):
+        """Call-shape key for tx, or None if it can't be cached (contract creation)."""
+        if not tx.get('to'):
+            return None
+        to = checksum_address(tx['to'])
+        data = _data_bytes(tx.get('data'))
+        return to, data[:4], calldata_length_class(data), self.code_hash(to)
+
+    def _rpc_tx(self, tx):
+        rpc_tx = {'data': '0x' + _data_bytes(tx.get('data')).hex()}
+        if tx.get('to'):
+            rpc_tx['to'] = checksum_address(tx['to'])
+        if tx.get('from'):
+            rpc_tx['from'] = checksum_address(tx['from'])
+        if tx.get('value'):
+            rpc_tx['value'] = tx['value']
+        return rpc_tx
+
+    def estimate(self, tx):
+        """
+        Gas limit for a transaction dict (to, data, value, from).
+        Raises the node's error if the call would revert.
+        """
+        key = self.cache_key(tx)
+        if key is not None:
+            if key[3] == b'' and not key[1]:
+                return TRANSFER_GAS
+            cached = self._estimates.get(key)
+            if cached is not None:
+                return self._with_margin(cached)
+
+        self.rpc_estimates += 1
+        gas = self.w3.eth.estimate_gas(self._rpc_tx(tx))
+        if key is not None:
+            self._estimates.put(key, gas)
+        return self._with_margin(gas)
+
+    def estimate_many(self, txs):
+        """
+        Gas limits for many pending transactions, in order. Unknown contract
+        code and cache misses are fetched once per distinct address / call
+        shape, as JSON-RPC batches when a batch client is set. Transactions
+        whose estimate or code lookup fails (e.g. would revert) get None.
+        """
+        txs = list(txs)
+        if self.batch_client is None:
+            return [self._estimate_or_none(tx) for tx in txs]
+
+        unknown_code = sorted({checksum_address(tx['to']) for tx in txs if tx.get('to')})
+        unknown_code = [address for address in unknown_code if address not in self._code_hashes]
+        failed_code = set()
+        if unknown_code:
+            try:
+                codes = self.batch_client.call_batch(
+                    [('eth_getCode', [address, 'latest']) for address in unknown_code])
+            except RPCBatchError as e:
+                codes = e.results
+            for address, code in zip(unknown_code, codes):
+                if code is None:
+                    failed_code.add(address)  # lookup failed: its transactions get None
+                else:
+                    self._code_hashes.put(address, self._hash_code(code))
+
+        # One cache lookup per transaction whose shape was already known;
+        # repeats of a missing shape ride along on its single estimate
+        skipped = {position for position, tx in enumerate(txs)
+                   if tx.get('to') and checksum_address(tx['to']) in failed_code}
+        keys = [None if position in skipped else self.cache_key(tx)
+                for position, tx in enumerate(txs)]
+        known = {}
+        misses = {}
+        for position, key in enumerate(keys):
+            if position in skipped:
+                continue
+            if key is None:
+                misses[('create', position)] = txs[position]
+            elif (key[3] != b'' or key[1]) and key not in misses:
+                gas = self._estimates.get(key)
+                if gas is None:
+                    misses[key] = txs[position]
+                else:
+                    known[key] = gas
+
+        estimated = {}
+        if misses:
+            miss_keys = list(misses)
+            calls = [('eth_estimateGas', [self._rpc_tx(misses[key])]) for key in miss_keys]
+            self.rpc_estimates += len(calls)
+            try:
+                results = self.batch_client.call_batch(calls)
+            except RPCBatchError as e:
+                results = e.results
+            for key, result in zip(miss_keys, results):
+                if result is None:
+                    continue
+                gas = estimated[key] = int(result, 16)
+                if key[0] != 'create':
+                    self._estimates.put(key, gas)
+
+        limits = []
+        for position, key in enumerate(keys):
+            if position in skipped:
+                limits.append(None)
+            elif key is None:
+                gas = estimated.get(('create', position))
+                limits.append(None if gas is None else self._with_margin(gas))
+            elif key[3] == b'' and not key[1]:
+                limits.append(TRANSFER_GAS)
+            else:
+                gas = known[key] if key in known else estimated.get(key)
+                limits.append(None if gas is None else self._with_margin(gas))
+        return limits
+
+    def _estimate_or_none(self, tx):
+        try:
+            return self.estimate(tx)
+        except Exception:
+            return None
+
+    def stats(self):
+        return {
+            'hits': self._estimates.hits,
+            'misses': self._estimates.misses,
+            'rpc_estimates': self.rpc_estimates,
+            'shapes': len(self._estimates)
+        }
+
+def estimate_simple_transfer(w3, to_address=None, value_wei=0, estimator=None):
+    """
+    Estimate gas for an ETH transfer: 21000 to an account without code,
+    estimated (and cached) when the recipient is a contract.
+    """
+    if to_address is None:
+        return TRANSFER_GAS
+    estimator = estimator or GasEstimator(w3)
+    return estimator.estimate({'to': to_address, 'value': value_wei})
+
+def get_gas_prices(w3, oracle=None):
+    """
+    Get expected gas prices (base fee + priority fee) at different priority
+    levels, in Gwei as exact decimal strings.
+    """
+    oracle = oracle or FeeOracle(w3)
+    return {tier: format_units(oracle.quote(tier)['expected_fee_per_gas'], UNIT_DECIMALS['gwei'])
+            for tier in oracle.tiers}
 
 def calculate_cost(gas_limit, gas_price_gwei, eth_price_usd=None):
-    """Calculate transaction cost in ETH and USD."""
-    gas_price_wei = Web3.to_wei(gas_price_gwei, 'gwei')
+    """
+    Calculate transaction cost in ETH and USD.
+    Amounts are exact decimal strings (total_usd is rounded to cents).
+    """
+    gas_price_wei = parse_units(gas_price_gwei, UNIT_DECIMALS['gwei'])
     total_wei = gas_limit * gas_price_wei
-    total_eth = Web3.from_wei(total_wei, 'ether')
     
     result = {
         'gas_limit': gas_limit,
         'gas_price_gwei': gas_price_gwei,
-        'total_eth': float(total_eth)
+        'total_wei': total_wei,
+        'total_eth': format_ether(total_wei)
     }
     
     if eth_price_usd:
-        result['total_usd'] = float(total_eth) * eth_price_usd
+        # wei x cents stays an integer: scale is 10**18 (wei) x 10**2 (cents)
+        price_cents = parse_units(eth_price_usd, 2)
+        result['total_usd'] = format_units(total_wei * price_cents, 20, precision=2)
     
     return result
 
@@ -50,9 +382,7 @@ def main():
     print()
     
       # Connect to Ethereum (read-only for nonce and gas price)
-    rpc_url = os.getenv('RPC_URL', 'https://eth-mainnet.g.alchemy.com/v2/YOUR_API_KEY')
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
-
+    w3 = make_web3()
     
     if not w3.is_connected():
         print("❌ Failed to connect to Ethereum node")
@@ -62,13 +392,18 @@ def main():
     print()
     
     # Get current gas prices
-    gas_prices = get_gas_prices(w3)
+    oracle = FeeOracle(w3)
+    gas_prices = get_gas_prices(w3, oracle)
+    base_fee = oracle.quote()['base_fee']
     
-    print("⛽ Current Gas Prices (Gwei):")
-    print(f"   Slow:    {gas_prices['slow']:.2f} Gwei (~10+ min)")
-    print(f"   Average: {gas_prices['average']:.2f} Gwei (~3-5 min)")
-    print(f"   Fast:    {gas_prices['fast']:.2f} Gwei (~1-2 min)")
-    print(f"   Instant: {gas_prices['instant']:.2f} Gwei (~30 sec)")
+    print(f"⛽ Next Block Base Fee: {format_units(base_fee, UNIT_DECIMALS['gwei'], precision=2)} Gwei")
+    print("   Expected Gas Prices (base fee + priority fee):")
+    for tier, label in (('slow', '~10+ min'), ('average', '~3-5 min'),
+                        ('fast', '~1-2 min'), ('instant', '~30 sec')):
+        quote = oracle.quote(tier)
+        gwei = format_units(quote['expected_fee_per_gas'], UNIT_DECIMALS['gwei'], precision=2)
+        cap = format_units(quote['max_fee_per_gas'], UNIT_DECIMALS['gwei'], precision=2)
+        print(f"   {tier.capitalize() + ':':8} {gwei} Gwei (max {cap}) ({label})")
     print()
     
     # Estimate costs for simple transfer
@@ -81,10 +416,11 @@ def main():
     
     for speed, gas_price in gas_prices.items():
         cost = calculate_cost(gas_limit, gas_price, eth_price)
+        gwei = format_units(parse_units(gas_price, UNIT_DECIMALS['gwei']), UNIT_DECIMALS['gwei'], precision=2)
         print(f"\n   {speed.capitalize():8} | "
-              f"{cost['gas_price_gwei']:8.2f} Gwei | "
-              f"{cost['total_eth']:.6f} ETH | "
-              f"${cost['total_usd']:.2f} USD")
+              f"{gwei:>8} Gwei | "
+              f"{format_ether(cost['total_wei'], precision=6)} ETH | "
+              f"${cost['total_usd']} USD")
     
     print()
     print("=" * 70)
@@ -4,15 +4,14 @@ Explore different BIP44 derivation paths for Ethereum.
 Shows how different paths create different addresses from the same seed.
 """
 
-from eth_account import Account
-Account.enable_unaudited_hdwallet_features()
+from hd_derivation import account_from_mnemonic
 
 # Test mnemonic (NEVER use this for real funds!)
 TEST_MNEMONIC = "test test test test test test test test test test test junk"
 
 def derive_with_path(mnemonic, path):
     """Derive account using custom path."""
-    account = Account.from_mnemonic(mnemonic, account_path=path)
+    account = account_from_mnemonic(mnemonic, path)
     return account.address
 
 def main():
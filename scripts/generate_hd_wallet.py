@@ -4,15 +4,14 @@ Generate HD (Hierarchical Deterministic) wallets using BIP39 mnemonic phrases.
 Demonstrates derivation paths and generating multiple addresses from one seed.
 """
 
-from mnemonic import Mnemonic
-from eth_account import Account
-Account.enable_unaudited_hdwallet_features()
+from hd_derivation import account_from_mnemonic
 
 def generate_mnemonic(strength=128):
     """
     Generate a BIP39 mnemonic phrase.
     strength: 128 bits = 12 words, 256 bits = 24 words
     """
+    from mnemonic import Mnemonic
     mnemo = Mnemonic("english")
     return mnemo.generate(strength=strength)
 
@@ -27,7 +26,7 @@ def derive_account(mnemonic, account_index=0):
     - account_index = Address index
     """
     derivation_path = f"m/44'/60'/0'/0/{account_index}"
-    account = Account.from_mnemonic(mnemonic, account_path=derivation_path)
+    account = account_from_mnemonic(mnemonic, derivation_path)
     
     return {
         'address': account.address,
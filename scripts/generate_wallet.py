@@ -4,22 +4,26 @@ Generate a new Ethereum wallet with private key, public key, and address.
 ⚠️  FOR EDUCATIONAL PURPOSES ONLY - NEVER use these wallets for real funds!
 """
 
-from eth_account import Account
 import secrets
 
 def generate_wallet():
     """Generate a new Ethereum wallet."""
+    from eth_keys import keys
+    from eth_keys.constants import SECPK1_N
     
-    # Generate a secure random private key (32 bytes = 256 bits)
-    private_key = "0x" + secrets.token_hex(32)
+    # Generate a secure random private key (32 bytes = 256 bits, below the curve order)
+    while True:
+        key = secrets.token_bytes(32)
+        if 0 < int.from_bytes(key, 'big') < SECPK1_N:
+            break
     
-    # Create account from private key
-    account = Account.from_key(private_key)
+    # Derive the public key and address (eth_keys directly: eth_account is much slower to import)
+    private_key = keys.PrivateKey(key)
     
     return {
-        'private_key': private_key,
-        'address': account.address,
-        'public_key': account._key_obj.public_key.to_hex()
+        'private_key': "0x" + key.hex(),
+        'address': private_key.public_key.to_checksum_address(),
+        'public_key': private_key.public_key.to_hex()
     }
 
 def main():
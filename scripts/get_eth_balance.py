@@ -1,55 +1,60 @@
 #!/usr/bin/env python3
 """
 get_eth_balance.py - Check ETH balance for any Ethereum address
+
+The provider is built on the first balance lookup, so importing this module
+needs neither RPC_URL nor web3.
 """
 
 import os
 import sys
-from web3 import Web3
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-
-RPC_URL = os.getenv('RPC_URL')
-
-if not RPC_URL:
-    raise ValueError("RPC_URL not found in .env file")
+from address_utils import checksum_address
+from amounts import format_ether
+from connection_health import ConnectionHealth
+from providers import load_env, make_web3
 
-# Initialize Web3
-w3 = Web3(Web3.HTTPProvider(RPC_URL))
+_w3 = None
+_health = None
 
-if not w3.is_connected():
-    raise ConnectionError("Failed to connect to Ethereum node")
-
-print("✓ Connected to Ethereum mainnet\n")
+def get_connection():
+    """
+    Return the shared (w3, health) pair, creating it on first use.
+    Raises ValueError if RPC_URL is not set.
+    """
+    global _w3, _health
+    if _w3 is None:
+        # Load environment variables
+        load_env()
+        rpc_url = os.getenv('RPC_URL')
+        if not rpc_url:
+            raise ValueError("RPC_URL not found in .env file")
+        # Connection is checked lazily on the first request
+        _w3 = make_web3(rpc_url)
+        _health = ConnectionHealth(_w3)
+    return _w3, _health
 
 # Function to convert Wei to Ether
 def wei_to_ether(wei_amount):
-    """Convert Wei to Ether"""
-    return w3.from_wei(wei_amount, 'ether')
+    """Convert Wei to Ether (exact decimal string)"""
+    return format_ether(wei_amount)
 
 # Function to check balance
 def get_balance(address):
     """Get ETH balance for an address"""
     
-    # Validate address format
-    if not w3.is_address(address):
-        raise ValueError(f"Invalid Ethereum address: {address}")
-    
-    # Convert to checksum address
-    checksum_address = w3.to_checksum_address(address)
+    # Validate and convert to checksum address
+    address = checksum_address(address)
     
     # Get balance in Wei
-    balance_wei = w3.eth.get_balance(checksum_address)
+    w3, health = get_connection()
+    balance_wei = health.call(w3.eth.get_balance, address)
     
     # Convert to Ether
     balance_ether = wei_to_ether(balance_wei)
     
     return balance_wei, balance_ether
 
-# Main execution
-if __name__ == "__main__":
+def main():
     # Example addresses (Ethereum Foundation, Vitalik's public address)
     example_addresses = [
         "0xde0B295669a9FD93d5F28D9Ec85E40f4cb697BAe",  # Ethereum Foundation
@@ -73,6 +78,11 @@ if __name__ == "__main__":
             print()
         except ValueError as e:
             print(f"Error: {e}\n")
+        except ConnectionError as e:
+            print(f"Connection error: {e}\n")
+            break
         except Exception as e:
             print(f"Unexpected error: {e}\n")
 
+if __name__ == "__main__":
+    main()
@@ -4,38 +4,39 @@ get_latest_block.py - Fetch the latest block from Ethereum mainnet
 """
 
 import os
-from web3 import Web3
-from dotenv import load_dotenv
+from connection_health import ConnectionHealth
+from providers import load_env, make_web3
 
-# Load environment variables from .env file
-load_dotenv()
+def main():
+    # Load environment variables from .env file
+    load_env()
 
-# Get RPC URL from environment
-RPC_URL = os.getenv('RPC_URL')
+    # Get RPC URL from environment
+    rpc_url = os.getenv('RPC_URL')
 
-if not RPC_URL:
-    raise ValueError("RPC_URL not found in .env file")
+    if not rpc_url:
+        raise ValueError("RPC_URL not found in .env file")
 
-# Initialize Web3 connection
-w3 = Web3(Web3.HTTPProvider(RPC_URL))
+    # Initialize Web3 connection
+    w3 = make_web3(rpc_url)
+    health = ConnectionHealth(w3)
 
-# Check if connected
-if not w3.is_connected():
-    raise ConnectionError("Failed to connect to Ethereum node")
+    # Get latest block number (raises NotConnectedError, a ConnectionError, if unreachable)
+    latest_block_number = health.call(lambda: w3.eth.block_number)
 
-print("✓ Connected to Ethereum mainnet")
+    print("✓ Connected to Ethereum mainnet")
+    print(f"\nLatest block number: {latest_block_number}")
 
-# Get latest block number
-latest_block_number = w3.eth.block_number
-print(f"\nLatest block number: {latest_block_number}")
+    # Get latest block details (no extra probe: the provider was just seen healthy)
+    latest_block = health.call(w3.eth.get_block, 'latest')
 
-# Get latest block details
-latest_block = w3.eth.get_block('latest')
+    print(f"\nBlock Details:")
+    print(f"  Hash: {latest_block['hash'].hex()}")
+    print(f"  Timestamp: {latest_block['timestamp']}")
+    print(f"  Transactions: {len(latest_block['transactions'])}")
+    print(f"  Gas Used: {latest_block['gasUsed']:,}")
+    print(f"  Gas Limit: {latest_block['gasLimit']:,}")
+    print(f"  Miner: {latest_block['miner']}")
 
-print(f"\nBlock Details:")
-print(f"  Hash: {latest_block['hash'].hex()}")
-print(f"  Timestamp: {latest_block['timestamp']}")
-print(f"  Transactions: {len(latest_block['transactions'])}")
-print(f"  Gas Used: {latest_block['gasUsed']:,}")
-print(f"  Gas Limit: {latest_block['gasLimit']:,}")
-print(f"  Miner: {latest_block['miner']}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Cached BIP32 derivation engine for HD wallets.
+
+Account.from_mnemonic() re-runs the 2048-round PBKDF2 seed stretch and walks
+the whole path from the master node on every call. This module stretches each
+seed once and keeps the parent node of a path (e.g. m/44'/60'/0'/0) in a
+bounded LRU, so deriving address N only costs the last child derivation.
+eth_account and eth_keys are imported on first use so the CLI starts fast.
+"""
+
+import argparse
+import csv
+import getpass
+import hashlib
+import hmac
+import json
+import sys
+
+from lru_cache import LRUCache
+from parallel import ordered_map
+
+DEFAULT_PATH_PREFIX = "m/44'/60'/0'/0"
+
+
+def split_path(path):
+    """
+    Split a derivation path into (parent_prefix, last_node).
+    "m/44'/60'/0'/0/7" -> ("m/44'/60'/0'/0", SoftNode(7))
+    """
+    from eth_account.hdaccount.deterministic import Node
+
+    nodes = path.split("/")
+    if nodes[0] not in ("m", "M") or len(nodes) < 2:
+        raise ValueError(f"Invalid derivation path: {path}")
+    return "/".join(nodes[:-1]), Node.decode(nodes[-1])
+
+
+class HDDeriver:
+    """
+    Derive HD keys with the seed and the parent node cached.
+
+    Seeds are cached under a digest of (mnemonic, passphrase) so the phrase
+    itself is never kept as a dict key. Parent nodes are cached under
+    (seed fingerprint, path prefix).
+    """
+
+    def __init__(self, max_seeds=16, max_nodes=256):
+        self._seeds = LRUCache(max_seeds)
+        self._nodes = LRUCache(max_nodes)
+
+    def seed(self, mnemonic, passphrase=""):
+        """Return the BIP39 seed for a mnemonic, stretching it only once."""
+        key = hashlib.sha256(f"{passphrase}\x00{mnemonic}".encode("utf-8")).digest()
+        seed = self._seeds.get(key)
+        if seed is None:
+            from eth_account.hdaccount import seed_from_mnemonic
+            seed = seed_from_mnemonic(mnemonic, passphrase)
+            self._seeds.put(key, seed)
+        return seed
+
+    def node(self, seed, path):
+        """Return the (private_key, chain_code) pair for a full path."""
+        fingerprint = hashlib.sha256(seed).digest()[:8]
+        cache_key = (fingerprint, path)
+        cached = self._nodes.get(cache_key)
+        if cached is not None:
+            return cached
+
+        from eth_account.hdaccount.deterministic import Node, derive_child_key
+        nodes = path.split("/")
+        if nodes[0] not in ("m", "M"):
+            raise ValueError(f"Invalid derivation path: {path}")
+
+        master = hmac.new(b"Bitcoin seed", seed, hashlib.sha512).digest()
+        key, chain_code = master[:32], master[32:]
+        for node in nodes[1:]:
+            key, chain_code = derive_child_key(key, chain_code, Node.decode(node))
+
+        self._nodes.put(cache_key, (key, chain_code))
+        return key, chain_code
+
+    def derive_key(self, mnemonic, path, passphrase=""):
+        """Derive the private key bytes at path from a mnemonic."""
+        from eth_account.hdaccount.deterministic import derive_child_key
+        seed = self.seed(mnemonic, passphrase)
+        prefix, last = split_path(path)
+        parent_key, parent_chain_code = self.node(seed, prefix)
+        key, _ = derive_child_key(parent_key, parent_chain_code, last)
+        return key
+
+    def derive_keys(self, mnemonic, indices, prefix=DEFAULT_PATH_PREFIX, passphrase=""):
+        """Yield (index, path, private_key) for each index under prefix."""
+        from eth_account.hdaccount.deterministic import Node, derive_child_key
+        seed = self.seed(mnemonic, passphrase)
+        parent_key, parent_chain_code = self.node(seed, prefix)
+        for index in indices:
+            key, _ = derive_child_key(parent_key, parent_chain_code, Node.decode(str(index)))
+            yield index, f"{prefix}/{index}", key
+
+    def account(self, mnemonic, path, passphrase=""):
+        """Derive a LocalAccount at path (same result as Account.from_mnemonic)."""
+        from eth_account import Account
+        return Account.from_key(self.derive_key(mnemonic, path, passphrase))
+
+    def cache_info(self):
+        """Return hit/miss counters for the seed and node caches."""
+        return {
+            'seed_hits': self._seeds.hits,
+            'seed_misses': self._seeds.misses,
+            'node_hits': self._nodes.hits,
+            'node_misses': self._nodes.misses,
+            'cached_nodes': len(self._nodes)
+        }
+
+    def clear(self):
+        """Drop all cached seeds and nodes."""
+        self._seeds.clear()
+        self._nodes.clear()
+
+
+# Shared engine used by the HD wallet scripts
+default_deriver = HDDeriver()
+
+
+def derive_key(mnemonic, path, passphrase=""):
+    """Derive private key bytes at path using the shared engine."""
+    return default_deriver.derive_key(mnemonic, path, passphrase)
+
+
+def account_from_mnemonic(mnemonic, path, passphrase=""):
+    """Drop-in replacement for Account.from_mnemonic(mnemonic, account_path=path)."""
+    return default_deriver.account(mnemonic, path, passphrase)
+
+
+def _derive_chunk(mnemonic, start, count, prefix, include_private_keys, passphrase):
+    """Worker: derive one contiguous chunk of indices as a list of records."""
+    from eth_keys import keys
+
+    records = []
+    for index, path, key in default_deriver.derive_keys(
+            mnemonic, range(start, start + count), prefix, passphrase):
+        record = {
+            'index': index,
+            'path': path,
+            'address': keys.PrivateKey(key).public_key.to_checksum_address()
+        }
+        if include_private_keys:
+            record['private_key'] = '0x' + key.hex()
+        records.append(record)
+    return records
+
+
+def derive_range(mnemonic, start, count, workers=1, chunk_size=1000,
+                 include_private_keys=False, prefix=DEFAULT_PATH_PREFIX, passphrase=""):
+    """
+    Derive addresses for indices [start, start + count) and yield records in index order.
+
+    The range is split into chunks that are derived across a process pool.
+    Only a bounded number of chunks (2 per worker) is in flight at once, so
+    the full result set is never held in memory. With include_private_keys
+    False (the default) keys never leave the worker processes.
+
+    Args:
+        mnemonic: BIP39 mnemonic phrase
+        start: First address index
+        count: Number of addresses to derive
+        workers: Number of processes (1 = derive in this process)
+        chunk_size: Indices per work unit
+        include_private_keys: Add 'private_key' to each record
+    """
+    if start < 0 or count < 0:
+        raise ValueError("start and count must be non-negative")
+    chunks = ((mnemonic, s, min(chunk_size, start + count - s), prefix,
+               include_private_keys, passphrase)
+              for s in range(start, start + count, chunk_size))
+    for records in ordered_map(_derive_chunk, chunks, workers):
+        yield from records
+
+
+def write_records(records, out, fmt='jsonl'):
+    """
+    Stream derivation records to a file object as JSONL or CSV.
+    Returns the number of records written.
+    """
+    written = 0
+    if fmt == 'jsonl':
+        for record in records:
+            out.write(json.dumps(record) + "\n")
+            written += 1
+    elif fmt == 'csv':
+        writer = None
+        for record in records:
+            if writer is None:
+                writer = csv.DictWriter(out, fieldnames=list(record.keys()))
+                writer.writeheader()
+            writer.writerow(record)
+            written += 1
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-derive HD wallet addresses")
+    parser.add_argument('--start', type=int, default=0, help="first address index")
+    parser.add_argument('--count', type=int, default=10, help="number of addresses")
+    parser.add_argument('--workers', type=int, default=1, help="worker processes")
+    parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl')
+    parser.add_argument('--out', help="output file (default: stdout)")
+    parser.add_argument('--with-private-keys', action='store_true',
+                        help="also write private keys (NEVER for real funds!)")
+    args = parser.parse_args()
+
+    mnemonic = getpass.getpass("Enter mnemonic phrase (input hidden): ").strip()
+    records = derive_range(mnemonic, args.start, args.count, workers=args.workers,
+                           include_private_keys=args.with_private_keys)
+
+    if args.out:
+        with open(args.out, 'w', newline='') as f:
+            written = write_records(records, f, args.format)
+        print(f"✅ Wrote {written} records to {args.out}", file=sys.stderr)
+    else:
+        write_records(records, sys.stdout, args.format)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Encrypted keystore (Web3 Secret Storage v3) files for managed accounts.
+
+Keys are written encrypted with scrypt or pbkdf2 at a selectable work
+factor and decrypted only into memory. The KDF is deliberately expensive
+(~0.5-1s per file at the standard scrypt cost), so unlocking a directory of
+keystores fans the files out over a process pool instead of decrypting them
+one after another. eth_account/eth_keyfile are imported on first use, as
+they take about a second to load.
+
+Usage:
+    python3 scripts/keystore.py bench
+    python3 scripts/keystore.py export --out keystores --kdf scrypt --preset light
+    python3 scripts/keystore.py unlock keystores --workers 8
+"""
+
+import argparse
+import getpass
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+from parallel import chunked, ordered_map
+
+# Work factors: scrypt n (r=8, p=1 as fixed by eth-keyfile) or pbkdf2 rounds.
+# 'standard' matches geth; 'light' is geth's --lightkdf for dev machines.
+KDF_PRESETS = {
+    'scrypt': {'standard': 2 ** 18, 'light': 2 ** 12},
+    'pbkdf2': {'standard': 1_000_000, 'light': 10_000},
+}
+
+
+def kdf_iterations(kdf='scrypt', preset='standard', iterations=None):
+    """Work factor for kdf: explicit iterations win over the preset."""
+    if kdf not in KDF_PRESETS:
+        raise ValueError(f"Unsupported KDF: {kdf}")
+    if iterations is not None:
+        if kdf == 'scrypt' and (iterations < 2 or iterations & (iterations - 1)):
+            raise ValueError("scrypt n must be a power of two")
+        return iterations
+    if preset not in KDF_PRESETS[kdf]:
+        raise ValueError(f"Unknown preset: {preset}")
+    return KDF_PRESETS[kdf][preset]
+
+
+def encrypt_key(private_key, password, kdf='scrypt', preset='standard', iterations=None):
+    """
+    Encrypt a private key into a keystore dict.
+
+    Args:
+        private_key: Hex string or bytes
+        password: Keystore password
+        kdf: 'scrypt' or 'pbkdf2'
+        preset: 'standard' or 'light' work factor (see KDF_PRESETS)
+        iterations: Explicit work factor (scrypt n or pbkdf2 rounds)
+    """
+    from eth_account import Account
+    return Account.encrypt(private_key, password, kdf=kdf,
+                           iterations=kdf_iterations(kdf, preset, iterations))
+
+
+def decrypt_keystore(keystore, password):
+    """Decrypt a keystore dict; returns the key bytes. Raises ValueError on a wrong password."""
+    from eth_keyfile import decode_keyfile_json
+    return decode_keyfile_json(keystore, password.encode('utf-8'))
+
+
+def keystore_filename(address):
+    """geth-style name: UTC--<timestamp>--<address>"""
+    stamp = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H-%M-%S.%fZ')
+    return f"UTC--{stamp}--{address.lower().removeprefix('0x')}"
+
+
+def save_keystore(keystore, directory):
+    """Write a keystore dict readable only by the owner. Returns the path."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, keystore_filename(keystore['address']))
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        json.dump(keystore, f)
+    return path
+
+
+def load_keystore(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def list_keystores(directory):
+    """Keystore files in directory, sorted by name (i.e. creation time)."""
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if not name.startswith('.') and os.path.isfile(os.path.join(directory, name)))
+
+
+def _unlock_chunk(paths, password):
+    """Worker: decrypt a chunk of keystore files."""
+    from eth_keys import keys
+    records = []
+    for path in paths:
+        try:
+            key = decrypt_keystore(load_keystore(path), password)
+            records.append({'path': path, 'address': keys.PrivateKey(key).public_key.to_checksum_address(),
+                            'private_key': key})
+        except (OSError, ValueError, KeyError) as e:
+            records.append({'path': path, 'error': str(e) or type(e).__name__})
+    return records
+
+
+def unlock_many(paths, password, workers=None, chunk_size=4):
+    """
+    Decrypt keystore files across a process pool, yielding one record per
+    path in input order: {'path', 'address', 'private_key' (bytes)} or
+    {'path', 'error'}. Standard scrypt needs 256 MB per derivation, so keep
+    workers * that within available memory.
+
+    Args:
+        paths: Keystore file paths
+        password: Shared password
+        workers: Number of processes (default: CPU count; 1 = this process)
+        chunk_size: Files per work unit
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = ((chunk, password) for chunk in chunked(paths, chunk_size))
+    for records in ordered_map(_unlock_chunk, chunks, workers):
+        yield from records
+
+
+def benchmark_kdf(kdf='scrypt', iterations=None, repeats=3):
+    """
+    Time one keystore decryption (dominated by the KDF) for each work factor.
+
+    Args:
+        kdf: 'scrypt' or 'pbkdf2'
+        iterations: Work factors to try (default: the light and standard presets)
+        repeats: Decryptions per work factor; the median is reported
+    """
+    iterations = iterations or sorted(KDF_PRESETS[kdf].values())
+    key = os.urandom(32)
+    results = []
+    for work_factor in iterations:
+        keystore = encrypt_key(key, 'benchmark', kdf=kdf, iterations=work_factor)
+        timings = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            decrypt_keystore(keystore, 'benchmark')
+            timings.append(time.perf_counter() - started)
+        results.append({'kdf': kdf, 'iterations': work_factor,
+                        'seconds': statistics.median(timings)})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Encrypted keystore export, unlock and KDF benchmark")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    bench = commands.add_parser('bench', help="time the KDF at each work factor")
+    bench.add_argument('--kdf', choices=sorted(KDF_PRESETS), default='scrypt')
+    bench.add_argument('--iterations', type=int, nargs='*', help="work factors to try")
+    bench.add_argument('--repeats', type=int, default=3)
+
+    export = commands.add_parser('export', help="encrypt a private key to a keystore file")
+    export.add_argument('--out', default='keystores', help="keystore directory")
+    export.add_argument('--kdf', choices=sorted(KDF_PRESETS), default='scrypt')
+    export.add_argument('--preset', choices=['standard', 'light'], default='standard')
+    export.add_argument('--iterations', type=int, help="explicit work factor")
+
+    unlock = commands.add_parser('unlock', help="decrypt every keystore in a directory")
+    unlock.add_argument('directory')
+    unlock.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("KEYSTORE TOOL")
+    print("=" * 70)
+
+    if args.command == 'bench':
+        for result in benchmark_kdf(args.kdf, args.iterations, args.repeats):
+            print(f"   {result['kdf']:<7} {result['iterations']:>10,}  "
+                  f"{result['seconds'] * 1000:9.1f} ms/unlock")
+
+    elif args.command == 'export':
+        private_key = getpass.getpass("Private key (input hidden): ").strip()
+        password = getpass.getpass("Keystore password: ")
+        if password != getpass.getpass("Repeat password: "):
+            print("❌ Passwords do not match")
+            sys.exit(1)
+        keystore = encrypt_key(private_key, password, args.kdf, args.preset, args.iterations)
+        print(f"✅ Saved 0x{keystore['address']} to {save_keystore(keystore, args.out)}")
+
+    else:
+        password = getpass.getpass("Keystore password: ")
+        paths = list_keystores(args.directory)
+        started = time.perf_counter()
+        unlocked = failed = 0
+        for record in unlock_many(paths, password, workers=args.workers):
+            if 'error' in record:
+                failed += 1
+                print(f"   ❌ {os.path.basename(record['path'])}: {record['error']}")
+            else:
+                unlocked += 1
+        elapsed = time.perf_counter() - started
+        print(f"✅ Unlocked {unlocked}/{len(paths)} keystores in {elapsed:.1f}s "
+              f"({failed} failed, {args.workers} workers)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+SQLAlchemy ORM models for the token/transfer database.
+
+Addresses are stored checksummed, as decode_transfer() produces them.
+Transfer values are uint256 and don't fit SQLite's 64-bit integers, so they
+are stored as exact decimal strings.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import (BigInteger, Column, DateTime, ForeignKey, Index, Integer, String,
+                        UniqueConstraint)
+from sqlalchemy.orm import declarative_base, relationship
+
+Base = declarative_base()
+
+
+class Token(Base):
+    __tablename__ = 'tokens'
+
+    id = Column(Integer, primary_key=True)
+    address = Column(String(42), nullable=False, unique=True)
+    name = Column(String(100))
+    symbol = Column(String(20))
+    decimals = Column(Integer)
+
+    transfers = relationship('Transfer', back_populates='token')
+
+    def __repr__(self):
+        return f"<Token {self.symbol} {self.address}>"
+
+
+class Transfer(Base):
+    __tablename__ = 'transfers'
+
+    id = Column(Integer, primary_key=True)
+    token_address = Column(String(42), ForeignKey('tokens.address'), nullable=False)
+    from_address = Column(String(42), nullable=False)
+    to_address = Column(String(42), nullable=False)
+    value = Column(String(78), nullable=False)
+    block_number = Column(BigInteger, nullable=False)
+    log_index = Column(Integer, nullable=False)
+    tx_hash = Column(String(66), nullable=False)
+
+    token = relationship('Token', back_populates='transfers')
+
+    __table_args__ = (
+        # A log is identified by its transaction and position; re-ingesting is a no-op
+        UniqueConstraint('tx_hash', 'log_index', name='uq_transfers_log'),
+        # Address + block range lookups and counts are answered from the index alone
+        Index('ix_transfers_from_block', 'from_address', 'block_number', 'log_index'),
+        Index('ix_transfers_to_block', 'to_address', 'block_number', 'log_index'),
+    )
+
+    @property
+    def amount(self):
+        """Raw token amount as an int."""
+        return int(self.value)
+
+    def __repr__(self):
+        return f"<Transfer {self.from_address} -> {self.to_address} {self.value} @{self.block_number}>"
+
+
+class Wallet(Base):
+    __tablename__ = 'wallets'
+
+    id = Column(Integer, primary_key=True)
+    address = Column(String(42), nullable=False, unique=True)
+    label = Column(String(100))
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f"<Wallet {self.label or ''} {self.address}>"
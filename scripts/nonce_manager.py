@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Local nonce manager for high-rate transaction signing.
+
+Fetches each address's pending nonce from the chain once, then hands out
+increments locally, so back-to-back signings from one account get distinct
+nonces without an eth_getTransactionCount round trip per signature.
+"""
+
+import bisect
+import threading
+
+from address_utils import checksum_address
+
+
+class _AddressNonces:
+    __slots__ = ('lock', 'base', 'next_nonce', 'released')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.base = None        # pending nonce fetched from chain; nothing below it is ours
+        self.next_nonce = None
+        self.released = []      # sorted nonces handed back by release()
+
+
+class NonceManager:
+    def __init__(self, w3):
+        """
+        Args:
+            w3: Web3 instance used to fetch the starting (pending) nonce
+        """
+        self.w3 = w3
+        self._states = {}
+        self._states_lock = threading.Lock()
+        self.fetches = 0
+
+    def _state(self, address):
+        address = checksum_address(address)
+        with self._states_lock:
+            state = self._states.get(address)
+            if state is None:
+                state = self._states[address] = _AddressNonces()
+            return address, state
+
+    def _fetch(self, address):
+        self.fetches += 1
+        return self.w3.eth.get_transaction_count(address, 'pending')
+
+    def allocate(self, address):
+        """
+        Return the next nonce to use for address.
+        Released gaps are filled first, lowest nonce first.
+        """
+        address, state = self._state(address)
+        with state.lock:
+            if state.released:
+                return state.released.pop(0)
+            if state.next_nonce is None:
+                state.base = state.next_nonce = self._fetch(address)
+            nonce = state.next_nonce
+            state.next_nonce += 1
+            return nonce
+
+    def release(self, address, nonce):
+        """
+        Hand back a nonce whose signed transaction was dropped (never sent),
+        so the next allocate() reuses it instead of leaving a gap.
+        Raises ValueError for a nonce that allocate() has not handed out
+        (or that was already released).
+        """
+        address, state = self._state(address)
+        with state.lock:
+            if state.next_nonce is None or not state.base <= nonce < state.next_nonce:
+                raise ValueError(f"Nonce {nonce} was not allocated for {address}")
+            position = bisect.bisect_left(state.released, nonce)
+            if position < len(state.released) and state.released[position] == nonce:
+                raise ValueError(f"Nonce {nonce} was already released for {address}")
+            state.released.insert(position, nonce)
+            # Trailing released nonces are now simply unallocated
+            while state.released and state.released[-1] == state.next_nonce - 1:
+                state.released.pop()
+                state.next_nonce -= 1
+
+    def resync(self, address):
+        """Re-read the pending nonce from chain, dropping local state. Returns it."""
+        address, state = self._state(address)
+        with state.lock:
+            state.released = []
+            state.base = state.next_nonce = self._fetch(address)
+            return state.next_nonce
+
+    def peek(self, address):
+        """Return the nonce allocate() would hand out next (None if not fetched yet)."""
+        address, state = self._state(address)
+        with state.lock:
+            if state.released:
+                return state.released[0]
+            return state.next_nonce
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Process-pool helper for the CPU-bound bulk jobs (HD derivation, signing,
+signature recovery): results come back in submission order while only a
+bounded number of work units is in flight, so huge inputs stream through
+without being materialised.
+"""
+
+from collections import deque
+
+
+def ordered_map(fn, arg_tuples, workers=1, in_flight_per_worker=2):
+    """
+    Yield fn(*args) for each args tuple, in input order.
+
+    Args:
+        fn: Picklable module-level function
+        arg_tuples: Iterable of argument tuples (consumed lazily)
+        workers: Number of processes (1 = run in this process)
+        in_flight_per_worker: Work units queued per worker
+    """
+    arg_tuples = iter(arg_tuples)
+    if workers <= 1:
+        for args in arg_tuples:
+            yield fn(*args)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for args in arg_tuples:
+            pending.append(pool.submit(fn, *args))
+            if len(pending) >= workers * in_flight_per_worker:
+                break
+
+        while pending:
+            result = pending.popleft().result()
+            args = next(arg_tuples, None)
+            if args is not None:
+                pending.append(pool.submit(fn, *args))
+            yield result
+
+
+def chunked(iterable, size):
+    """Yield lists of up to size items from iterable."""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
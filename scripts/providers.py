@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Provider factory shared by all scripts.
+
+Every Web3 instance gets its HTTP provider from here, backed by one pooled
+keep-alive requests.Session, so a long-running process reuses TCP/TLS
+connections instead of hand-shaking again for each new provider.
+
+Tunable through .env:
+    RPC_URL           JSON-RPC endpoint
+    RPC_TIMEOUT       request timeout in seconds (default 30)
+    RPC_POOL_SIZE     max pooled connections per host (default 20)
+    RPC_MAX_RETRIES   transport-level retries for failed connects (default 0)
+
+web3, requests, aiohttp and dotenv are imported on first use, so scripts
+that never touch the network don't pay for them at startup.
+"""
+
+import os
+import threading
+
+DEFAULT_RPC_URL = 'https://eth-mainnet.g.alchemy.com/v2/YOUR_API_KEY'
+
+_session = None
+_session_lock = threading.Lock()
+_env_loaded = False
+
+
+def load_env():
+    """Load .env into the environment once, on the first setting lookup."""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+
+
+def get_rpc_url(rpc_url=None):
+    """Return rpc_url, falling back to RPC_URL from the environment."""
+    if rpc_url:
+        return rpc_url
+    load_env()
+    return os.getenv('RPC_URL', DEFAULT_RPC_URL)
+
+
+def get_timeout():
+    load_env()
+    return float(os.getenv('RPC_TIMEOUT', 30))
+
+
+def create_session(pool_size=None, max_retries=None):
+    """
+    Build a keep-alive requests.Session with a sized connection pool.
+    requests negotiates gzip/deflate by default; it's stated explicitly here.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    load_env()
+    pool_size = pool_size or int(os.getenv('RPC_POOL_SIZE', 20))
+    if max_retries is None:
+        max_retries = int(os.getenv('RPC_MAX_RETRIES', 0))
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                          max_retries=max_retries)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive'
+    })
+    return session
+
+
+def get_session():
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
+
+
+def make_provider(rpc_url=None, timeout=None, session=None):
+    """Create an HTTPProvider that uses the shared pooled session."""
+    from web3 import Web3
+    return Web3.HTTPProvider(
+        get_rpc_url(rpc_url),
+        request_kwargs={'timeout': timeout or get_timeout()},
+        session=session or get_session()
+    )
+
+
+def make_web3(rpc_url=None, timeout=None, session=None, cache=None):
+    """
+    Create a Web3 instance on a pooled provider.
+    Pass a rpc_cache.BlockCache as cache to serve repeated chain reads locally.
+    """
+    from web3 import Web3
+    w3 = Web3(make_provider(rpc_url, timeout, session))
+    if cache is not None:
+        w3.middleware_onion.inject(cache, name='block_cache', layer=0)
+    return w3
+
+
+def make_async_web3(rpc_url=None, timeout=None):
+    """
+    Create an AsyncWeb3 instance. aiohttp sessions are bound to an event
+    loop, so the provider keeps its own pooled session per loop.
+    """
+    import aiohttp
+    from web3 import AsyncWeb3
+    client_timeout = aiohttp.ClientTimeout(total=timeout or get_timeout())
+    return AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(
+        get_rpc_url(rpc_url),
+        request_kwargs={'timeout': client_timeout}
+    ))
+
+
+def make_batch_client(rpc_url=None, timeout=None, **kwargs):
+    """Create a BatchRPCClient that shares the pooled session."""
+    from rpc_batch import BatchRPCClient
+    return BatchRPCClient(get_rpc_url(rpc_url), timeout=timeout or get_timeout(),
+                          session=get_session(), **kwargs)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Batched JSON-RPC client.
+
+Packs many eth_getBalance / eth_getTransactionCount calls into JSON-RPC batch
+arrays so checking 1,000 addresses costs a handful of HTTP round trips
+instead of one (or two) per address.
+"""
+
+import time
+
+from address_utils import checksum_address
+
+
+class RPCBatchError(Exception):
+    """Raised when some batch entries still fail after all retries."""
+
+    def __init__(self, errors, results):
+        self.errors = errors      # {position: error} for the failed entries
+        self.results = results    # results list with None for failed entries
+        super().__init__(f"{len(errors)} batch request(s) failed: "
+                         f"{next(iter(errors.values()))}")
+
+
+class BatchRPCClient:
+    def __init__(self, rpc_url, chunk_size=100, max_retries=2, timeout=30, session=None):
+        """
+        Args:
+            rpc_url: HTTP JSON-RPC endpoint
+            chunk_size: Max calls per batch request (providers often cap this)
+            max_retries: Extra attempts for entries that fail or go missing
+            timeout: HTTP request timeout in seconds
+            session: Optional requests.Session to reuse connections
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.rpc_url = rpc_url
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.timeout = timeout
+        if session is None:
+            import requests
+            session = requests.Session()
+        self.session = session
+        self._next_id = 1
+
+    def _post(self, payload):
+        """Send one batch and return {id: response} for the entries we got back."""
+        response = self.session.post(self.rpc_url, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        body = response.json()
+        if isinstance(body, dict):
+            # Some providers answer a rejected batch with a single error object
+            return {}, body.get('error', body)
+        return {item.get('id'): item for item in body if isinstance(item, dict)}, None
+
+    def call_batch(self, calls):
+        """
+        Execute (method, params) calls as JSON-RPC batches.
+
+        Responses are matched back by id, so providers may reorder them.
+        Only entries that errored or went missing are retried.
+        Returns a list of results in the same order as calls.
+        """
+        import requests
+
+        calls = list(calls)
+        results = [None] * len(calls)
+        errors = {}
+        pending = list(range(len(calls)))
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(min(0.1 * 2 ** (attempt - 1), 2.0))
+            failed = []
+
+            for start in range(0, len(pending), self.chunk_size):
+                chunk = pending[start:start + self.chunk_size]
+                ids = {}
+                payload = []
+                for position in chunk:
+                    method, params = calls[position]
+                    request_id = self._next_id
+                    self._next_id += 1
+                    ids[request_id] = position
+                    payload.append({'jsonrpc': '2.0', 'id': request_id,
+                                    'method': method, 'params': params})
+
+                try:
+                    responses, batch_error = self._post(payload)
+                except (requests.RequestException, ValueError) as e:
+                    responses, batch_error = {}, str(e)
+
+                for request_id, position in ids.items():
+                    item = responses.get(request_id)
+                    if item is None:
+                        errors[position] = batch_error or "missing response"
+                        failed.append(position)
+                    elif item.get('error') is not None:
+                        errors[position] = item['error']
+                        failed.append(position)
+                    else:
+                        results[position] = item.get('result')
+                        errors.pop(position, None)
+
+            pending = failed
+            if not pending:
+                break
+
+        if pending:
+            raise RPCBatchError({p: errors[p] for p in pending}, results)
+        return results
+
+    def _call_quantities(self, calls):
+        """
+        call_batch for methods returning a hex quantity. A null result is a
+        per-entry error too: RPCBatchError lists it alongside the failed calls.
+        """
+        try:
+            results = self.call_batch(calls)
+            errors = {}
+        except RPCBatchError as e:
+            results, errors = e.results, dict(e.errors)
+        for position, result in enumerate(results):
+            if result is None and position not in errors:
+                errors[position] = "null result"
+        if errors:
+            raise RPCBatchError(dict(sorted(errors.items())), results)
+        return [int(result, 16) for result in results]
+
+    def get_balances(self, addresses, block='latest'):
+        """Return balances in Wei for each address, in input order."""
+        calls = [('eth_getBalance', [checksum_address(a), _block_param(block)]) for a in addresses]
+        return self._call_quantities(calls)
+
+    def get_nonces(self, addresses, block='latest'):
+        """Return transaction counts for each address, in input order."""
+        calls = [('eth_getTransactionCount', [checksum_address(a), _block_param(block)])
+                 for a in addresses]
+        return self._call_quantities(calls)
+
+
+def _block_param(block):
+    return hex(block) if isinstance(block, int) else block
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Per-block response cache for chain reads, as Web3 middleware.
+
+Three classes of reads are cached:
+    * immutable:  eth_chainId, and anything pinned to a block hash
+                  (eth_getBlockByHash, eth_getBalance at {'blockHash': ...})
+    * by number:  reads at an explicit block number; kept until a reorg
+                  replaces a block at or below that number
+    * head:       'latest' reads, eth_gasPrice, eth_blockNumber; kept until a
+                  new head is seen (on_new_head / on_block, or a newer block
+                  in any response) or head_ttl seconds pass
+
+Usage:
+    cache = BlockCache()
+    w3 = make_web3(cache=cache)
+    ...
+    print(cache.stats())
+"""
+
+import threading
+import time
+
+from web3.middleware import Web3Middleware
+
+from lru_cache import LRUCache
+
+IMMUTABLE_METHODS = {'eth_chainId', 'net_version'}
+HEAD_METHODS = {'eth_gasPrice', 'eth_blockNumber', 'eth_maxPriorityFeePerGas'}
+# Methods whose last parameter is a block identifier
+BLOCK_PARAM_METHODS = {'eth_getBalance', 'eth_getTransactionCount', 'eth_getCode',
+                       'eth_getStorageAt', 'eth_call', 'eth_getBlockByNumber'}
+HEAD_TAGS = {'latest', 'safe', 'finalized'}
+
+
+def _freeze(value):
+    """Make JSON-RPC params hashable for use in cache keys."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _block_ref(method, params):
+    """
+    Classify a request: ('immutable', None), ('number', n), ('head', None)
+    or (None, None) when it must not be cached.
+    """
+    if method in IMMUTABLE_METHODS or method == 'eth_getBlockByHash':
+        return 'immutable', None
+    if method in HEAD_METHODS:
+        return 'head', None
+    if method not in BLOCK_PARAM_METHODS:
+        return None, None
+
+    if method == 'eth_getBlockByNumber':
+        block = params[0] if params else 'latest'
+    else:
+        block = params[-1] if params else 'latest'
+
+    if isinstance(block, dict):
+        # EIP-1898 block reference
+        if 'blockHash' in block:
+            return 'immutable', None
+        block = block.get('blockNumber', 'latest')
+    if isinstance(block, int):
+        return 'number', block
+    if block in HEAD_TAGS:
+        return 'head', None
+    if block == 'earliest':
+        return 'number', 0
+    if isinstance(block, str) and block.startswith('0x'):
+        if len(block) == 66:
+            return 'immutable', None
+        return 'number', int(block, 16)
+    return None, None  # 'pending' and anything unrecognised
+
+
+class BlockCache:
+    """
+    Shared cache state. Pass the instance to make_web3(cache=...) or
+    w3.middleware_onion.inject(cache, name='block_cache', layer=0).
+    """
+
+    def __init__(self, maxsize=4096, head_ttl=2.0, clock=time.monotonic):
+        self.head_ttl = head_ttl
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._entries = LRUCache(maxsize)   # immutable + by-number entries
+        self._keys_by_number = {}           # block number -> cache keys
+        self._head = {}                     # head-relative entries
+        self._head_expires = 0.0
+        self._head_number = None
+        self._hash_by_number = {}           # block number -> block hash seen
+        self._max_tracked_blocks = maxsize
+        self.head_hits = 0
+        self.head_misses = 0
+        self.reorgs = 0
+        self.invalidated = 0
+
+    def __call__(self, w3):
+        # web3 instantiates middleware by calling it with the Web3 instance
+        return BlockCacheMiddleware(w3, self)
+
+    # -- lookups -- #
+
+    def get(self, method, params):
+        kind, number = _block_ref(method, params)
+        if kind is None:
+            return None
+        key = (method, _freeze(params))
+        if kind == 'head':
+            with self._lock:
+                if self._clock() >= self._head_expires:
+                    self._head.clear()
+                response = self._head.get(key)
+                if response is None:
+                    self.head_misses += 1
+                else:
+                    self.head_hits += 1
+                return response
+        return self._entries.get(key)
+
+    def put(self, method, params, response):
+        if not isinstance(response, dict) or 'error' in response:
+            return
+        result = response.get('result')
+        if result is None:
+            return  # unknown block / not yet available: don't pin a miss
+
+        kind, number = _block_ref(method, params)
+        self._observe(method, result)
+        if kind is None:
+            return
+        key = (method, _freeze(params))
+        with self._lock:
+            if kind == 'head':
+                if not self._head:
+                    self._head_expires = self._clock() + self.head_ttl
+                self._head[key] = response
+            else:
+                self._entries.put(key, response)
+                if kind == 'number':
+                    self._keys_by_number.setdefault(number, set()).add(key)
+                    if len(self._keys_by_number) > self._max_tracked_blocks:
+                        for old_key in self._keys_by_number.pop(min(self._keys_by_number)):
+                            self._entries.pop(old_key)
+
+    # -- head / reorg tracking -- #
+
+    def _observe(self, method, result):
+        if method == 'eth_blockNumber':
+            self.on_new_head(int(result, 16))
+        elif method in ('eth_getBlockByNumber', 'eth_getBlockByHash') and isinstance(result, dict):
+            number = result.get('number')
+            block_hash = result.get('hash')
+            if number is None or block_hash is None:
+                return
+            number = int(number, 16) if isinstance(number, str) else number
+            self.on_block(number, block_hash, result.get('parentHash'))
+
+    def on_block(self, number, block_hash, parent_hash=None):
+        """
+        Record a block seen on chain. A different hash at a known height (or a
+        parent hash that doesn't match) means a reorg: everything cached at or
+        above the replaced height is dropped.
+        """
+        block_hash = _hex(block_hash)
+        with self._lock:
+            known = self._hash_by_number.get(number)
+            if known is not None and known != block_hash:
+                self._reorg(number)
+            elif parent_hash is not None and number > 0:
+                known_parent = self._hash_by_number.get(number - 1)
+                if known_parent is not None and known_parent != _hex(parent_hash):
+                    self._reorg(number - 1)
+            self._hash_by_number[number] = block_hash
+            if len(self._hash_by_number) > self._max_tracked_blocks:
+                del self._hash_by_number[min(self._hash_by_number)]
+            self.on_new_head(number)
+
+    def on_new_head(self, number):
+        """Drop head-relative entries when a newer block number is seen."""
+        with self._lock:
+            if self._head_number is None or number > self._head_number:
+                self._head_number = number
+                self._head.clear()
+
+    def _reorg(self, from_number):
+        self.reorgs += 1
+        for number in [n for n in self._keys_by_number if n >= from_number]:
+            for key in self._keys_by_number.pop(number):
+                if self._entries.pop(key) is not None:
+                    self.invalidated += 1
+        for number in [n for n in self._hash_by_number if n >= from_number]:
+            del self._hash_by_number[number]
+        # Block-by-hash entries stay valid: a hash always names the same block
+        self._head.clear()
+        self._head_number = None
+
+    def stats(self):
+        """Return hit/miss counters and cache sizes."""
+        hits = self._entries.hits + self.head_hits
+        misses = self._entries.misses + self.head_misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'entries': len(self._entries),
+            'head_entries': len(self._head),
+            'reorgs': self.reorgs,
+            'invalidated': self.invalidated
+        }
+
+
+class BlockCacheMiddleware(Web3Middleware):
+    def __init__(self, w3, cache):
+        super().__init__(w3)
+        self.cache = cache
+
+    def wrap_make_request(self, make_request):
+        def middleware(method, params):
+            cached = self.cache.get(method, params)
+            if cached is not None:
+                return cached
+            response = make_request(method, params)
+            self.cache.put(method, params, response)
+            return response
+
+        return middleware
+
+
+def _hex(value):
+    if isinstance(value, (bytes, bytearray)):
+        return '0x' + bytes(value).hex()
+    return value.lower() if isinstance(value, str) else value
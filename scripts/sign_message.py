@@ -2,15 +2,24 @@
 """
 Sign and verify messages with Ethereum private keys.
 Demonstrates EIP-191 message signing standard.
+
+eth_account and the signer registry are imported by the functions that use
+them, so importing this module (or running --help) stays fast.
 """
 
-from eth_account import Account
-from eth_account.messages import encode_defunct
-from web3 import Web3
+from parallel import chunked, ordered_map
 
-def sign_message(private_key, message):
-    """Sign a message with a private key."""
-    account = Account.from_key(private_key)
+def sign_message(private_key, message, registry=None):
+    """
+    Sign a message with a private key.
+    
+    The key is parsed once and kept in a SignerRegistry (default: the shared
+    one), so signing repeatedly with the same key skips Account.from_key().
+    """
+    from eth_account.messages import encode_defunct
+    if registry is None:
+        from signer_registry import default_registry as registry
+    account = registry.signer_for_key(private_key)
     
     # Encode message according to EIP-191
     message_encoded = encode_defunct(text=message)
@@ -29,12 +38,14 @@ def sign_message(private_key, message):
 
 def verify_signature(message, signature, expected_address):
     """Verify a signature and recover the signer's address."""
+    from eth_account import Account
+    from eth_account.messages import encode_defunct
     message_encoded = encode_defunct(text=message)
     
     # Recover address from signature
     recovered_address = Account.recover_message(message_encoded, signature=signature)
     
-    is_valid = recovered_address.lower() == expected_address.lower()
+    is_valid = _address_bytes(recovered_address) == _address_bytes(expected_address)
     
     return {
         'is_valid': is_valid,
@@ -42,7 +53,81 @@ def verify_signature(message, signature, expected_address):
         'expected_address': expected_address
     }
 
+def hash_eip191(message):
+    """EIP-191 (personal_sign) hash of a text or bytes message."""
+    from eth_hash.auto import keccak
+    if isinstance(message, str):
+        message = message.encode('utf-8')
+    return keccak(b"\x19Ethereum Signed Message:\n" + str(len(message)).encode() + message)
+
+def _address_bytes(address):
+    """20-byte form of a hex address (None if malformed)."""
+    try:
+        raw = bytes.fromhex(address[2:] if address.startswith(('0x', '0X')) else address)
+    except (ValueError, AttributeError):
+        return None
+    return raw if len(raw) == 20 else None
+
+def signature_bytes(signature):
+    """65-byte r || s || v form of a signature. Raises ValueError if malformed."""
+    if isinstance(signature, (bytes, bytearray)):
+        sig = bytes(signature)
+    elif isinstance(signature, str):
+        sig = bytes.fromhex(signature[2:] if signature.startswith(('0x', '0X')) else signature)
+    else:
+        raise ValueError(f"Signature must be hex or bytes, got {type(signature).__name__}")
+    if len(sig) != 65:
+        raise ValueError(f"Signature must be 65 bytes, got {len(sig)}")
+    return sig
+
+def _verify_chunk(items):
+    """Worker: recover signers for (msg_hash, signature, expected_bytes) items."""
+    from eth_keys import keys
+    results = []
+    for msg_hash, signature, expected in items:
+        try:
+            sig = signature_bytes(signature)
+            v = sig[64]
+            if v >= 27:
+                v -= 27
+            recovered = keys.Signature(sig[:64] + bytes([v])).recover_public_key_from_msg_hash(
+                msg_hash).to_canonical_address()
+            results.append(expected is not None and recovered == expected)
+        except Exception:
+            results.append(False)
+    return results
+
+def verify_many(messages, signatures, expected_addresses, workers=1, chunk_size=2000):
+    """
+    Verify many EIP-191 signatures at once.
+    
+    Messages are hashed up front, signer recovery runs on a process pool and
+    recovered signers are compared to the expected addresses as 20-byte
+    values (no string lowercasing).
+    
+    Returns:
+        (valid, failed) where valid is a bytearray with 1 for each good
+        signature and 0 otherwise, and failed lists the indices that failed.
+    """
+    messages = list(messages)
+    signatures = list(signatures)
+    expected_addresses = list(expected_addresses)
+    if not len(messages) == len(signatures) == len(expected_addresses):
+        raise ValueError("messages, signatures and expected_addresses must have the same length")
+    
+    items = ((hash_eip191(m), sig, _address_bytes(a))
+             for m, sig, a in zip(messages, signatures, expected_addresses))
+    chunks = ((chunk,) for chunk in chunked(items, chunk_size))
+    
+    valid = bytearray()
+    for results in ordered_map(_verify_chunk, chunks, workers):
+        valid.extend(results)
+    failed = [i for i, ok in enumerate(valid) if not ok]
+    return valid, failed
+
 def main():
+    from eth_account import Account
+    
     print("=" * 70)
     print("MESSAGE SIGNING & VERIFICATION")
     print("=" * 70)
@@ -2,21 +2,22 @@
 """
 Sign Ethereum transactions (without sending them).
 Demonstrates nonce management and transaction structure.
+eth_account, web3 and the signer registry are imported on first use.
 """
 
-from web3 import Web3
-from eth_account import Account
-from dotenv import load_dotenv
-import os
-
-# Load environment variables
-load_dotenv()
+import json
+from amounts import format_units
+from estimate_gas import TRANSFER_GAS, FeeOracle, GasEstimator
+from parallel import chunked, ordered_map
+from providers import make_web3
 
 def get_nonce(w3, address):
     """Get the current nonce (transaction count) for an address."""
     return w3.eth.get_transaction_count(address)
 
-def sign_transaction(w3, private_key, to_address, value_eth, gas_price_gwei=None):
+def sign_transaction(w3, private_key, to_address, value_eth, gas_price_gwei=None,
+                     nonce_manager=None, fee_oracle=None, fee_tier='average',
+                     gas_estimator=None, data=None, signer_registry=None):
     """
     Sign a transaction without broadcasting it.
     
@@ -26,30 +27,66 @@ def sign_transaction(w3, private_key, to_address, value_eth, gas_price_gwei=None
         to_address: Recipient address
         value_eth: Amount in ETH
         gas_price_gwei: Gas price in Gwei (optional, will estimate if not provided)
+        nonce_manager: NonceManager to allocate nonces locally (optional,
+            otherwise the nonce is fetched from the node on every call)
+        fee_oracle: FeeOracle for EIP-1559 fees (optional; used when
+            gas_price_gwei is not given, producing a type-2 transaction)
+        fee_tier: Fee oracle tier ('slow', 'average', 'fast', 'instant')
+        gas_estimator: GasEstimator to reuse across calls (optional, so
+            repeated calls of the same shape skip eth_estimateGas). Without
+            one, only calls with data are estimated; value transfers use 21000
+        data: Calldata for contract calls (optional)
+        signer_registry: SignerRegistry holding the parsed key (default: the
+            shared registry, so the key is only parsed on first use)
     """
-    account = Account.from_key(private_key)
-    
-    # Get current nonce
-    nonce = get_nonce(w3, account.address)
+    if signer_registry is None:
+        from signer_registry import default_registry as signer_registry
+    account = signer_registry.signer_for_key(private_key)
+    
+    # Get gas price (EIP-1559 fee caps when an oracle is available)
+    if gas_price_gwei is not None:
+        fees = {'gasPrice': w3.to_wei(gas_price_gwei, 'gwei')}
+    elif fee_oracle is not None:
+        fees = fee_oracle.transaction_fields(fee_tier)
+    else:
+        fees = {'gasPrice': w3.eth.gas_price}
+    chain_id = w3.eth.chain_id
+    value_wei = w3.to_wei(value_eth, 'ether')
+    
+    # Estimate gas for contract calls (or when an estimator is shared); a plain
+    # value transfer is 21000 without any RPC
+    if data or gas_estimator is not None:
+        gas_estimator = gas_estimator or GasEstimator(w3)
+        gas = gas_estimator.estimate({'from': account.address, 'to': to_address,
+                                      'value': value_wei, 'data': data})
+    else:
+        gas = TRANSFER_GAS
     
-    # Get gas price
-    if gas_price_gwei is None:
-        gas_price = w3.eth.gas_price
+    # Get current nonce (last, so a failed RPC above never wastes an allocated nonce)
+    if nonce_manager is not None:
+        nonce = nonce_manager.allocate(account.address)
     else:
-        gas_price = w3.to_wei(gas_price_gwei, 'gwei')
+        nonce = get_nonce(w3, account.address)
     
     # Build transaction
     transaction = {
         'nonce': nonce,
         'to': to_address,
-        'value': w3.to_wei(value_eth, 'ether'),
-        'gas': 21000,  # Standard ETH transfer gas limit
-        'gasPrice': gas_price,
-        'chainId': w3.eth.chain_id
+        'value': value_wei,
+        'gas': gas,
+        'chainId': chain_id,
+        **fees
     }
+    if data:
+        transaction['data'] = data
     
-    # Sign transaction
-    signed_txn = account.sign_transaction(transaction)
+    # Sign transaction (hand the nonce back if signing fails, so no gap is left)
+    try:
+        signed_txn = account.sign_transaction(transaction)
+    except Exception:
+        if nonce_manager is not None:
+            nonce_manager.release(account.address, nonce)
+        raise
     
     return {
         'transaction': transaction,
@@ -58,15 +95,89 @@ def sign_transaction(w3, private_key, to_address, value_eth, gas_price_gwei=None
         'transaction_hash': signed_txn.hash.hex()
     }
 
+def _sign_chunk(private_key, chain_id, gas_price, items):
+    """Worker: sign a chunk of (nonce, (to, value_wei, gas, data)) items."""
+    from eth_account import Account
+    from web3 import Web3
+
+    account = Account.from_key(private_key)
+    records = []
+    for nonce, (to_address, value_wei, gas, data) in items:
+        transaction = {
+            'nonce': nonce,
+            'to': Web3.to_checksum_address(to_address),
+            'value': value_wei,
+            'gas': gas,
+            'gasPrice': gas_price,
+            'chainId': chain_id,
+            'data': data or '0x'
+        }
+        signed_txn = account.sign_transaction(transaction)
+        records.append({
+            'nonce': nonce,
+            'to': transaction['to'],
+            'value': value_wei,
+            'transaction_hash': Web3.to_hex(signed_txn.hash),
+            'raw_transaction': Web3.to_hex(signed_txn.raw_transaction)
+        })
+    return records
+
+def sign_transactions_bulk(w3, private_key, tx_specs, workers=1, chunk_size=500,
+                           chain_id=None, gas_price=None, start_nonce=None):
+    """
+    Sign many transactions offline, yielding records in nonce order.
+    
+    chain_id, gas price and the starting nonce are fetched once (only the ones
+    not passed in), then signing runs on a process pool since secp256k1
+    signing is CPU-bound. With all three given, w3 may be None and no network
+    access happens at all.
+    
+    Args:
+        w3: Web3 instance (or None, see above)
+        private_key: Sender's private key
+        tx_specs: Iterable of (to, value_wei, gas, data) tuples; data may be None
+        workers: Number of signing processes
+        chunk_size: Transactions per work unit
+        chain_id: Chain ID (optional)
+        gas_price: Gas price in Wei (optional)
+        start_nonce: Nonce for the first transaction (optional)
+    """
+    from eth_account import Account
+
+    sender = Account.from_key(private_key).address
+    if chain_id is None:
+        chain_id = w3.eth.chain_id
+    if gas_price is None:
+        gas_price = w3.eth.gas_price
+    if start_nonce is None:
+        start_nonce = w3.eth.get_transaction_count(sender, 'pending')
+    
+    numbered = enumerate(tx_specs, start=start_nonce)
+    chunks = ((private_key, chain_id, gas_price, items)
+              for items in chunked(numbered, chunk_size))
+    for records in ordered_map(_sign_chunk, chunks, workers):
+        yield from records
+
+def write_signed_jsonl(records, out):
+    """Write signed transaction records to a file object as JSONL. Returns the count."""
+    written = 0
+    for record in records:
+        out.write(json.dumps(record) + "\n")
+        written += 1
+    return written
+
 def main():
+    from eth_account import Account
+    from rpc_cache import BlockCache
+
     print("=" * 70)
     print("TRANSACTION SIGNING (OFFLINE)")
     print("=" * 70)
     print()
     
     # Connect to Ethereum (read-only for nonce and gas price)
-    rpc_url = os.getenv('RPC_URL', 'https://eth-mainnet.g.alchemy.com/v2/YOUR_API_KEY')
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
+    # chain_id and gas_price are read several times below; serve repeats from cache
+    w3 = make_web3(cache=BlockCache())
     
     if not w3.is_connected():
         print("❌ Failed to connect to Ethereum node")
@@ -97,10 +208,12 @@ def main():
     print(f"   (This is transaction #{nonce} from this address)")
     print()
     
-    # Estimate gas price
-    gas_price_wei = w3.eth.gas_price
-    gas_price_gwei = w3.from_wei(gas_price_wei, 'gwei')
-    print(f"⛽ Current Gas Price: {gas_price_gwei:.2f} Gwei")
+    # Quote EIP-1559 fees from recent fee history
+    fee_oracle = FeeOracle(w3)
+    quote = fee_oracle.quote('average')
+    print(f"⛽ Base Fee:     {format_units(quote['base_fee'], 9, precision=2)} Gwei")
+    print(f"   Priority Fee: {format_units(quote['max_priority_fee_per_gas'], 9, precision=2)} Gwei")
+    print(f"   Max Fee:      {format_units(quote['max_fee_per_gas'], 9, precision=2)} Gwei")
     print()
     
     # Sign transaction (but don't send!)
@@ -109,7 +222,8 @@ def main():
         w3, 
         account.key.hex(), 
         to_address, 
-        value_eth
+        value_eth,
+        fee_oracle=fee_oracle
     )
     
     print()
@@ -122,7 +236,7 @@ def main():
     print("💡 Key Concepts:")
     print("  • Nonce: Prevents replay attacks, must increment sequentially")
     print("  • Signing ≠ Sending: Signed transactions can be broadcast later")
-    print("  • Gas Price: Higher = faster confirmation (but more expensive)")
+    print("  • Fees (EIP-1559): base fee is burned, priority fee tips the builder")
     print("  • Chain ID: Prevents transactions from working on wrong network")
     print()
     print("⚠️  This transaction was NOT sent to the network!")
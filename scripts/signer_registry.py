@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+In-memory registry of parsed signing keys, looked up by address.
+
+Account.from_key() parses the key and derives the public key (a full
+secp256k1 scalar multiplication) on every call, and LocalAccount's signing
+methods hand the raw key bytes back to Account, which parses them again. The
+registry builds each key's eth_keys PrivateKey once and signs with it
+directly. Keys unused for idle_timeout seconds are evicted and their bytes
+overwritten, by a background sweep every sweep_interval seconds while any
+key is loaded. clear() drops everything at once; the shared default_registry
+is cleared at interpreter exit.
+
+Usage:
+    registry = SignerRegistry()
+    address = registry.add(private_key)
+    registry.sign_message(address, "hello")
+"""
+
+from collections import OrderedDict
+import atexit
+import hashlib
+import os
+import threading
+import time
+
+from eth_account import Account
+from eth_account.messages import encode_defunct
+from eth_keys import keys
+
+from address_utils import checksum_address
+
+
+class Signer:
+    """
+    Minimal LocalAccount stand-in holding a parsed key: exposes address,
+    sign_message, sign_transaction and unsafe_sign_hash.
+    """
+    __slots__ = ('address', 'last_used', '_secret', '_key')
+
+    def __init__(self, secret, key, now):
+        self._secret = secret          # bytearray we own, so it can be zeroed
+        self._key = key                # eth_keys PrivateKey (public key derived once)
+        self.address = key.public_key.to_checksum_address()
+        self.last_used = now
+
+    def sign_message(self, signable_message):
+        return Account.sign_message(signable_message, private_key=self._key)
+
+    def sign_transaction(self, transaction_dict):
+        return Account.sign_transaction(transaction_dict, self._key)
+
+    def unsafe_sign_hash(self, message_hash):
+        return Account.unsafe_sign_hash(message_hash, private_key=self._key)
+
+    def wipe(self):
+        """
+        Overwrite the key bytes owned by the signer and drop the parsed key.
+        (eth_keys keeps its own immutable copy, which is released for GC.)
+        """
+        self._secret[:] = bytes(len(self._secret))
+        self._key = None
+
+
+def _key_bytes(private_key):
+    if isinstance(private_key, keys.PrivateKey):
+        return bytearray(private_key.to_bytes())
+    if isinstance(private_key, str):
+        text = private_key[2:] if private_key.startswith(('0x', '0X')) else private_key
+        try:
+            return bytearray.fromhex(text)
+        except ValueError:
+            raise ValueError("Private key must be hex") from None
+    return bytearray(private_key)
+
+
+class SignerRegistry:
+    def __init__(self, idle_timeout=900.0, max_signers=1024, clock=time.monotonic,
+                 sweep_interval=60.0):
+        """
+        Args:
+            idle_timeout: Seconds a key may go unused before it is evicted and zeroed
+            max_signers: Most keys held at once (least recently used go first)
+            clock: Time source (injectable for tests)
+            sweep_interval: Seconds between background idle sweeps while keys
+                are loaded (None: only evict when the registry is used)
+        """
+        self.idle_timeout = idle_timeout
+        self.max_signers = max_signers
+        self.sweep_interval = sweep_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._sweeper = None
+        self._signers = OrderedDict()  # address -> Signer, least recently used first
+        self._by_fingerprint = {}      # keyed digest of the key -> address
+        self._salt = os.urandom(16)
+        self.loads = 0
+        self.hits = 0
+        self.evictions = 0
+
+    def _fingerprint(self, secret):
+        return hashlib.blake2b(secret, key=self._salt, digest_size=16).digest()
+
+    def add(self, private_key):
+        """Load a key (hex, bytes or eth_keys PrivateKey) if needed. Returns its address."""
+        return self.signer_for_key(private_key).address
+
+    def signer_for_key(self, private_key):
+        """Signer for a private key, parsing it only the first time it is seen."""
+        secret = _key_bytes(private_key)
+        if len(secret) != 32:
+            raise ValueError(f"Private key must be 32 bytes, got {len(secret)}")
+        fingerprint = self._fingerprint(secret)
+        now = self._clock()
+        with self._lock:
+            self._evict_idle(now)
+            address = self._by_fingerprint.get(fingerprint)
+            if address is not None:
+                secret[:] = bytes(32)
+                self.hits += 1
+                return self._touch(address, now)
+
+        key = private_key if isinstance(private_key, keys.PrivateKey) else keys.PrivateKey(bytes(secret))
+        signer = Signer(secret, key, now)
+        with self._lock:
+            existing = self._signers.get(signer.address)
+            if existing is not None:  # loaded concurrently
+                signer.wipe()
+                return self._touch(existing.address, now)
+            self.loads += 1
+            self._signers[signer.address] = signer
+            self._by_fingerprint[fingerprint] = signer.address
+            while len(self._signers) > self.max_signers:
+                self._evict(next(iter(self._signers)))
+            self._schedule_sweep()
+        return signer
+
+    def get(self, address):
+        """Signer for a loaded address. Raises KeyError if it isn't loaded (or was evicted)."""
+        now = self._clock()
+        with self._lock:
+            self._evict_idle(now)
+            if address not in self._signers:
+                address = checksum_address(address)
+                if address not in self._signers:
+                    raise KeyError(f"No signer loaded for {address}")
+            self.hits += 1
+            return self._touch(address, now)
+
+    def sign_message(self, address, message):
+        """EIP-191 sign a text message (or a SignableMessage) as address."""
+        signable = encode_defunct(text=message) if isinstance(message, str) else message
+        return self.get(address).sign_message(signable)
+
+    def sign_transaction(self, address, transaction_dict):
+        return self.get(address).sign_transaction(transaction_dict)
+
+    def remove(self, address):
+        """Evict and zero one key. Returns True if it was loaded."""
+        with self._lock:
+            if address not in self._signers:
+                return False
+            self._evict(address)
+            return True
+
+    def evict_idle(self):
+        """Evict keys idle for longer than idle_timeout. Returns the number evicted."""
+        with self._lock:
+            before = self.evictions
+            self._evict_idle(self._clock())
+            return self.evictions - before
+
+    def clear(self):
+        """Evict and zero every key. Call on exit/logout rather than waiting for the sweep."""
+        with self._lock:
+            for address in list(self._signers):
+                self._evict(address)
+            if self._sweeper is not None:
+                self._sweeper.cancel()
+                self._sweeper = None
+
+    def _schedule_sweep(self):
+        # A one-shot daemon timer, re-armed only while keys remain loaded
+        if self.sweep_interval and self._sweeper is None and self._signers:
+            self._sweeper = threading.Timer(self.sweep_interval, self._sweep)
+            self._sweeper.daemon = True
+            self._sweeper.start()
+
+    def _sweep(self):
+        with self._lock:
+            self._sweeper = None
+            self._evict_idle(self._clock())
+            self._schedule_sweep()
+
+    def _touch(self, address, now):
+        signer = self._signers[address]
+        signer.last_used = now
+        self._signers.move_to_end(address)
+        return signer
+
+    def _evict_idle(self, now):
+        # Least recently used first, so stop at the first key still in use
+        while self._signers:
+            address, signer = next(iter(self._signers.items()))
+            if now - signer.last_used < self.idle_timeout:
+                break
+            self._evict(address)
+
+    def _evict(self, address):
+        signer = self._signers.pop(address)
+        self._by_fingerprint.pop(self._fingerprint(signer._secret), None)
+        signer.wipe()
+        self.evictions += 1
+
+    def __contains__(self, address):
+        return address in self._signers
+
+    def __len__(self):
+        return len(self._signers)
+
+    def stats(self):
+        return {
+            'signers': len(self._signers),
+            'loads': self.loads,
+            'hits': self.hits,
+            'evictions': self.evictions
+        }
+
+
+default_registry = SignerRegistry()
+atexit.register(default_registry.clear)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Track the import cost of each CLI entry point with `python -X importtime`.
+
+Every entry point is imported in a fresh interpreter (a few times, keeping
+the fastest run) and its cumulative import time is reported together with
+the slowest modules it pulled in. Saving a baseline and comparing later
+runs against it makes a newly added top-level web3/eth_account import show
+up as a regression.
+
+Usage:
+    python3 scripts/startup_benchmark.py
+    python3 scripts/startup_benchmark.py --save startup.json
+    python3 scripts/startup_benchmark.py --baseline startup.json --tolerance 0.5
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# CLI scripts; each must import without touching the network or RPC_URL
+ENTRY_POINTS = (
+    'wallet_manager',
+    'generate_wallet',
+    'generate_hd_wallet',
+    'explore_derivation_paths',
+    'hd_derivation',
+    'vanity_address',
+    'keystore',
+    'sign_message',
+    'sign_transaction',
+    'estimate_gas',
+    'erc20_balance_checker',
+    'transfer_indexer',
+    'store_transfers',
+    'block_follower',
+    'get_eth_balance',
+    'get_latest_block',
+)
+
+
+def parse_importtime(stderr):
+    """
+    Parse `-X importtime` output into {module: (self_us, cumulative_us)}.
+    Nested imports are indented under their parent; names are stripped.
+    """
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header row
+        timings[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+    return timings
+
+
+def measure_import(module, runs=3, top=5, python=sys.executable):
+    """
+    Import module in fresh interpreters and report the fastest run.
+
+    Returns:
+        dict with module, import_ms (cumulative) and heaviest: the top
+        modules by self time as (name, ms) pairs
+    """
+    best = None
+    for _ in range(runs):
+        result = subprocess.run([python, '-X', 'importtime', '-c', f'import {module}'],
+                                cwd=SCRIPTS_DIR, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{result.stderr.strip()[-500:]}")
+        timings = parse_importtime(result.stderr)
+        if module not in timings:
+            raise RuntimeError(f"No importtime entry for {module}")
+        if best is None or timings[module][1] < best[module][1]:
+            best = timings
+
+    heaviest = sorted(((name, t[0]) for name, t in best.items() if name != module),
+                      key=lambda item: item[1], reverse=True)[:top]
+    return {
+        'module': module,
+        'import_ms': best[module][1] / 1000,
+        'heaviest': [(name, us / 1000) for name, us in heaviest]
+    }
+
+
+def compare(results, baseline, tolerance=0.5, slack_ms=20.0):
+    """
+    Entry points whose import time grew past baseline * (1 + tolerance) +
+    slack_ms. Returns a list of (module, baseline_ms, current_ms).
+    """
+    regressions = []
+    for result in results:
+        before = baseline.get(result['module'])
+        if before is not None and result['import_ms'] > before * (1 + tolerance) + slack_ms:
+            regressions.append((result['module'], before, result['import_ms']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time of each entry point")
+    parser.add_argument('modules', nargs='*', help="entry points (default: all)")
+    parser.add_argument('--runs', type=int, default=3, help="fresh interpreters per module")
+    parser.add_argument('--save', help="write {module: import_ms} to this JSON file")
+    parser.add_argument('--baseline', help="compare against a saved JSON file")
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help="allowed relative slowdown vs the baseline")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("STARTUP IMPORT TIME (python -X importtime)")
+    print("=" * 70)
+    results = []
+    failed = False
+    for module in args.modules or ENTRY_POINTS:
+        try:
+            result = measure_import(module, runs=args.runs)
+        except RuntimeError as e:
+            failed = True
+            print(f"   ❌ {e}")
+            continue
+        results.append(result)
+        heaviest = ', '.join(f"{name} {ms:.0f}ms" for name, ms in result['heaviest'][:3])
+        print(f"   {module:<26} {result['import_ms']:8.1f} ms   ({heaviest})")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({r['module']: round(r['import_ms'], 1) for r in results}, f, indent=2)
+        print(f"\n💾 Saved baseline to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\n❌ Startup regressions:")
+            for module, before, after in regressions:
+                print(f"   {module}: {before:.1f} ms -> {after:.1f} ms")
+            sys.exit(1)
+        print("\n✅ No startup regressions")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Fetch ERC-20 Transfer events and store them in the SQLite database.
+
+Each eth_getLogs chunk is decoded column-wise and bulk-inserted in one
+transaction; the indexer checkpoint makes reruns resume where they stopped.
+SQLAlchemy and web3 are imported only after the arguments are parsed.
+
+Usage:
+    python3 scripts/store_transfers.py TOKEN_ADDRESS --db transfers.db \
+        --from-block 6082465 --checkpoint usdc.checkpoint.json
+"""
+
+import argparse
+import time
+
+from providers import make_web3
+from transfer_indexer import TransferIndexer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Store ERC-20 Transfer events in SQLite")
+    parser.add_argument('token', help="token contract address")
+    parser.add_argument('--db', default='transfers.db', help="SQLite database file")
+    parser.add_argument('--from-block', type=int, help="start block (default: resume from checkpoint)")
+    parser.add_argument('--to-block', type=int, help="end block (default: latest)")
+    parser.add_argument('--checkpoint', help="checkpoint file for resuming")
+    args = parser.parse_args()
+
+    from db_helper import create_db_engine, ingest_transfers
+    engine = create_db_engine(args.db)
+    indexer = TransferIndexer(make_web3(), args.token, checkpoint_path=args.checkpoint)
+
+    stored = 0
+    started = time.perf_counter()
+    for columns in indexer.transfer_columns(args.from_block, args.to_block or 'latest'):
+        stored += ingest_transfers(engine, columns)
+    elapsed = time.perf_counter() - started
+    print(f"✅ Stored {stored} transfers in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
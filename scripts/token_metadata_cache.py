@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Token metadata cache keyed by (chain_id, token address).
+
+name, symbol and decimals never change once a token is deployed, so they
+are kept permanently in a small SQLite file and loaded into memory at
+startup; a restarted service formats balances without re-fetching metadata
+for every token it has seen. totalSupply does change and is refreshed after
+supply_ttl seconds.
+
+Usage:
+    checker = ERC20BalanceChecker(cache_path='tokens.db')
+    checker.get_token_metadata('USDC')   # fetched once, then served from cache
+"""
+
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS token_metadata (
+    chain_id INTEGER NOT NULL,
+    address TEXT NOT NULL,
+    name TEXT,
+    symbol TEXT,
+    decimals INTEGER NOT NULL,
+    PRIMARY KEY (chain_id, address)
+)
+"""
+
+
+class TokenMetadataCache:
+    def __init__(self, checker, path=':memory:', supply_ttl=300.0, clock=time.monotonic):
+        """
+        Args:
+            checker: ERC20BalanceChecker used to fetch what isn't cached
+            path: SQLite file for the immutable fields (':memory:' to not persist)
+            supply_ttl: Seconds before a cached totalSupply is refreshed
+            clock: Time source (injectable for tests)
+        """
+        self.checker = checker
+        self.path = path
+        self.supply_ttl = supply_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        if path != ':memory:':
+            self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(SCHEMA)
+        self._db.commit()
+        self._immutable = {}   # (chain_id, address) -> {'name', 'symbol', 'decimals'}
+        self._supply = {}      # (chain_id, address) -> (total_supply, expires_at)
+        self.fetches = 0
+        self.warm()
+
+    def warm(self):
+        """Load every persisted token into memory. Returns the number loaded."""
+        rows = self._db.execute(
+            'SELECT chain_id, address, name, symbol, decimals FROM token_metadata').fetchall()
+        with self._lock:
+            for chain_id, address, name, symbol, decimals in rows:
+                self._immutable[(chain_id, address)] = {
+                    'name': name, 'symbol': symbol, 'decimals': decimals}
+        return len(rows)
+
+    def __len__(self):
+        return len(self._immutable)
+
+    def get_many(self, addresses):
+        """
+        Return {address: metadata} for checksummed token addresses. Unknown
+        tokens are fetched (and persisted) and stale supplies refreshed, each
+        group in a single aggregated fetch.
+        """
+        chain_id = self.checker.chain_id
+        now = self._clock()
+        with self._lock:
+            missing = [a for a in addresses if (chain_id, a) not in self._immutable]
+            stale = [a for a in addresses if (chain_id, a) in self._immutable
+                     and self._supply.get((chain_id, a), (None, 0.0))[1] <= now]
+
+        if missing:
+            self._store(chain_id, self.checker.fetch_tokens_metadata(missing), now)
+        if stale:
+            self.fetches += 1
+            supplies = self.checker.fetch_total_supplies(stale)
+            with self._lock:
+                for address, total_supply in supplies.items():
+                    self._supply[(chain_id, address)] = (total_supply, now + self.supply_ttl)
+
+        with self._lock:
+            return {address: self._entry(chain_id, address) for address in addresses}
+
+    def get(self, address):
+        return self.get_many([address])[address]
+
+    def decimals(self, address):
+        """Decimals only; never triggers a totalSupply refresh for known tokens."""
+        key = (self.checker.chain_id, address)
+        with self._lock:
+            known = self._immutable.get(key)
+        if known is not None:
+            return known['decimals']
+        return self.get(address)['decimals']
+
+    def _entry(self, chain_id, address):
+        immutable = self._immutable.get((chain_id, address))
+        supply = self._supply.get((chain_id, address))
+        return {
+            'address': address,
+            'name': immutable['name'] if immutable else None,
+            'symbol': immutable['symbol'] if immutable else None,
+            'decimals': immutable['decimals'] if immutable else None,
+            'total_supply': supply[0] if supply else None
+        }
+
+    def _store(self, chain_id, metadata, now):
+        self.fetches += 1
+        rows = []
+        with self._lock:
+            for address, fields in metadata.items():
+                if fields['decimals'] is None:
+                    continue  # not an ERC-20 (or the call reverted): don't pin it
+                immutable = {k: fields[k] for k in ('name', 'symbol', 'decimals')}
+                self._immutable[(chain_id, address)] = immutable
+                self._supply[(chain_id, address)] = (fields['total_supply'], now + self.supply_ttl)
+                rows.append((chain_id, address, fields['name'], fields['symbol'], fields['decimals']))
+            if rows:
+                self._db.executemany(
+                    'INSERT OR REPLACE INTO token_metadata VALUES (?, ?, ?, ?, ?)', rows)
+                self._db.commit()
+
+    def close(self):
+        self._db.close()
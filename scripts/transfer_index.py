@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Address-indexed lookup over decoded ERC-20 transfers.
+
+Built once over TransferColumns batches, the index maps each 20-byte
+address to sorted (block, logIndex) postings, kept separately for sent and
+received transfers. Wallet-history queries by address and block range are
+two binary searches instead of a scan over every log.
+"""
+
+from array import array
+from bisect import bisect_left
+
+from transfer_indexer import decode_transfer_columns
+
+# Postings are sorted int64 keys: block number in the high bits, log index in the low bits
+LOG_INDEX_BITS = 20
+MAX_LOG_INDEX = (1 << LOG_INDEX_BITS) - 1
+
+
+def _posting_key(block, log_index):
+    if log_index > MAX_LOG_INDEX:
+        raise ValueError(f"log index {log_index} too large to index")
+    return (block << LOG_INDEX_BITS) | log_index
+
+
+def _address_key(address):
+    """Normalize a hex string or raw bytes address to 20 bytes."""
+    if isinstance(address, (bytes, bytearray)):
+        raw = bytes(address)
+    else:
+        raw = bytes.fromhex(address[2:] if address.startswith(('0x', '0X')) else address)
+    if len(raw) != 20:
+        raise ValueError(f"Invalid Ethereum address: {address}")
+    return raw
+
+
+class _Postings:
+    __slots__ = ('keys', 'rows')
+
+    def __init__(self):
+        self.keys = array('q')
+        self.rows = array('q')
+
+    def add(self, key, row_id):
+        if not self.keys or key >= self.keys[-1]:
+            # Common case: new blocks arrive in order
+            self.keys.append(key)
+            self.rows.append(row_id)
+        else:
+            position = bisect_left(self.keys, key)
+            self.keys.insert(position, key)
+            self.rows.insert(position, row_id)
+
+    def range(self, from_block, to_block):
+        lo = 0 if from_block is None else bisect_left(self.keys, from_block << LOG_INDEX_BITS)
+        hi = (len(self.keys) if to_block is None
+              else bisect_left(self.keys, (to_block + 1) << LOG_INDEX_BITS))
+        return self.rows[lo:hi]
+
+
+class TransferIndex:
+    def __init__(self):
+        self._batches = []
+        self._row_refs = array('q')   # row id -> batch index << 32 | row within batch
+        self._sent = {}
+        self._received = {}
+
+    def __len__(self):
+        return len(self._row_refs)
+
+    def add(self, columns):
+        """Index a TransferColumns batch. Batches may be appended as new blocks arrive."""
+        batch_index = len(self._batches)
+        self._batches.append(columns)
+        for i in range(len(columns)):
+            row_id = len(self._row_refs)
+            self._row_refs.append((batch_index << 32) | i)
+            key = _posting_key(columns.blocks[i], columns.log_indexes[i])
+
+            sender = columns.sender(i)
+            postings = self._sent.get(sender)
+            if postings is None:
+                postings = self._sent[sender] = _Postings()
+            postings.add(key, row_id)
+
+            receiver = columns.receiver(i)
+            postings = self._received.get(receiver)
+            if postings is None:
+                postings = self._received[receiver] = _Postings()
+            postings.add(key, row_id)
+
+    def add_logs(self, logs):
+        """Decode raw Transfer logs and index them."""
+        self.add(decode_transfer_columns(logs))
+
+    def _rows(self, row_ids):
+        for row_id in row_ids:
+            ref = self._row_refs[row_id]
+            yield self._batches[ref >> 32].row(ref & 0xFFFFFFFF)
+
+    def _lookup(self, table, address, from_block, to_block):
+        postings = table.get(_address_key(address))
+        if postings is None:
+            return array('q')
+        return postings.range(from_block, to_block)
+
+    def sent(self, address, from_block=None, to_block=None):
+        """Transfers sent by address within [from_block, to_block], in chain order."""
+        return list(self._rows(self._lookup(self._sent, address, from_block, to_block)))
+
+    def received(self, address, from_block=None, to_block=None):
+        """Transfers received by address within [from_block, to_block], in chain order."""
+        return list(self._rows(self._lookup(self._received, address, from_block, to_block)))
+
+    def history(self, address, from_block=None, to_block=None):
+        """All transfers touching address (sent or received), in chain order."""
+        sent = self._lookup(self._sent, address, from_block, to_block)
+        received = self._lookup(self._received, address, from_block, to_block)
+        merged = sorted(set(sent) | set(received),
+                        key=lambda row_id: self._sort_key(row_id))
+        return list(self._rows(merged))
+
+    def count(self, address, from_block=None, to_block=None):
+        """Number of transfers touching address, without materialising rows."""
+        sent = self._lookup(self._sent, address, from_block, to_block)
+        received = self._lookup(self._received, address, from_block, to_block)
+        return len(set(sent) | set(received))
+
+    def _sort_key(self, row_id):
+        ref = self._row_refs[row_id]
+        columns = self._batches[ref >> 32]
+        i = ref & 0xFFFFFFFF
+        return columns.blocks[i], columns.log_indexes[i]
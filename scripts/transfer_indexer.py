@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Streaming ERC-20 Transfer log indexer.
+
+Walks a block range with eth_getLogs in adaptive chunks: the chunk shrinks
+when the provider complains about too many results and grows again while
+responses are sparse. Transfers are decoded lazily as a generator and the
+last fully processed block is checkpointed, so a restart resumes there.
+
+Delivery is at-least-once: output for a chunk is flushed and fsynced before
+its checkpoint is written, so a crash in between re-appends that chunk on
+restart. Consumers of --out should dedupe on (tx_hash, log_index).
+eth_utils and web3 are imported on first use so the CLI starts fast.
+
+Usage:
+    python3 scripts/transfer_indexer.py TOKEN_ADDRESS --from-block 6082465 \
+        --checkpoint usdc.checkpoint.json --out usdc_transfers.jsonl
+"""
+
+from array import array
+from functools import lru_cache
+import argparse
+import json
+import os
+import sys
+
+from address_utils import checksum_address
+from providers import make_web3
+
+TRANSFER_TOPIC = '0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef'
+
+# Phrases providers use when a getLogs range returns too much data
+TOO_MANY_RESULTS_MARKERS = (
+    'too many results',
+    'query returned more than',
+    'limit exceeded',
+    'response size exceeded',
+    'block range is too large',
+    'range too large',
+    'exceed maximum block range',
+)
+
+
+def _to_bytes(value):
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    return bytes.fromhex(value[2:] if value.startswith('0x') else value)
+
+
+def _to_hex(value):
+    if isinstance(value, (bytes, bytearray)):
+        return '0x' + bytes(value).hex()
+    return value
+
+
+def decode_transfer(log):
+    """
+    Decode a raw Transfer log into a dict with an exact integer value.
+    Returns None for logs that aren't standard ERC-20 Transfers (e.g. ERC-721,
+    where the token id is indexed and data is empty).
+    """
+    topics = log['topics']
+    if len(topics) != 3:
+        return None
+    data = _to_bytes(log['data'])
+    if len(data) != 32:
+        return None
+    from eth_utils import to_checksum_address
+    return {
+        'token': to_checksum_address(log['address']),
+        'from': to_checksum_address(_to_bytes(topics[1])[-20:]),
+        'to': to_checksum_address(_to_bytes(topics[2])[-20:]),
+        'value': int.from_bytes(data, 'big'),
+        'block': log['blockNumber'],
+        'log_index': log['logIndex'],
+        'tx_hash': _to_hex(log['transactionHash'])
+    }
+
+
+@lru_cache(maxsize=65536)
+def _checksum(raw_address):
+    # Hot senders/receivers repeat constantly; checksum each one once
+    from eth_utils import to_checksum_address
+    return to_checksum_address(raw_address)
+
+
+def _address_from_topic(topic):
+    if isinstance(topic, str):
+        return bytes.fromhex(topic[-40:])
+    return bytes(topic[-20:])
+
+
+class TransferColumns:
+    """
+    Decoded transfers stored column-wise.
+
+    Addresses are packed 20 bytes per row and tx hashes 32 bytes per row.
+    Values are exact Python ints (no float division by 10**decimals), and
+    block numbers and log indices are int64 arrays. Checksummed addresses are
+    only computed when rows are read out.
+    """
+
+    __slots__ = ('tokens', 'senders', 'receivers', 'values', 'blocks', 'log_indexes', 'tx_hashes')
+
+    def __init__(self, tokens, senders, receivers, values, blocks, log_indexes, tx_hashes):
+        self.tokens = tokens
+        self.senders = senders
+        self.receivers = receivers
+        self.values = values
+        self.blocks = blocks
+        self.log_indexes = log_indexes
+        self.tx_hashes = tx_hashes
+
+    def __len__(self):
+        return len(self.values)
+
+    def sender(self, i):
+        """Raw 20-byte sender of row i."""
+        return self.senders[i * 20:(i + 1) * 20]
+
+    def receiver(self, i):
+        """Raw 20-byte receiver of row i."""
+        return self.receivers[i * 20:(i + 1) * 20]
+
+    def row(self, i):
+        """Row i as a dict in the same shape as decode_transfer()."""
+        return {
+            'token': _checksum(self.tokens[i * 20:(i + 1) * 20]),
+            'from': _checksum(self.sender(i)),
+            'to': _checksum(self.receiver(i)),
+            'value': self.values[i],
+            'block': self.blocks[i],
+            'log_index': self.log_indexes[i],
+            'tx_hash': '0x' + self.tx_hashes[i * 32:(i + 1) * 32].hex()
+        }
+
+    def rows(self):
+        for i in range(len(self)):
+            yield self.row(i)
+
+
+def decode_transfer_columns(logs):
+    """
+    Decode a batch of raw Transfer logs (HexBytes or hex-string fields) into
+    TransferColumns. Non-ERC-20 Transfer logs are skipped, as in decode_transfer().
+    """
+    tokens, senders, receivers, tx_hashes = [], [], [], []
+    values = []
+    blocks = array('q')
+    log_indexes = array('q')
+
+    for log in logs:
+        topics = log['topics']
+        if len(topics) != 3:
+            continue
+        data = log['data']
+        if isinstance(data, str):
+            if len(data) != 66:
+                continue
+            value = int(data, 16)
+        else:
+            if len(data) != 32:
+                continue
+            value = int.from_bytes(data, 'big')
+
+        tokens.append(_to_bytes(log['address']))
+        senders.append(_address_from_topic(topics[1]))
+        receivers.append(_address_from_topic(topics[2]))
+        tx_hashes.append(_to_bytes(log['transactionHash']))
+        values.append(value)
+        block = log['blockNumber']
+        log_index = log['logIndex']
+        blocks.append(int(block, 16) if isinstance(block, str) else block)
+        log_indexes.append(int(log_index, 16) if isinstance(log_index, str) else log_index)
+
+    return TransferColumns(b''.join(tokens), b''.join(senders), b''.join(receivers),
+                           values, blocks, log_indexes, b''.join(tx_hashes))
+
+
+def is_too_many_results(error):
+    message = str(error).lower()
+    return any(marker in message for marker in TOO_MANY_RESULTS_MARKERS)
+
+
+class TransferIndexer:
+    def __init__(self, w3, token_address, checkpoint_path=None, chunk_size=2000,
+                 min_chunk=1, max_chunk=100000, target_results=5000):
+        """
+        Args:
+            w3: Web3 instance
+            token_address: ERC-20 contract to index
+            checkpoint_path: JSON file recording the last finished block (optional)
+            chunk_size: Initial number of blocks per eth_getLogs call
+            min_chunk / max_chunk: Bounds for the adaptive chunk size
+            target_results: Grow the chunk while responses have fewer than half this many logs
+        """
+        self.w3 = w3
+        self.token_address = checksum_address(token_address)
+        self.checkpoint_path = checkpoint_path
+        self.chunk_size = chunk_size
+        self.min_chunk = min_chunk
+        self.max_chunk = max_chunk
+        self.target_results = target_results
+        # Largest chunk known to work; relaxed again after a run of successes
+        self._ceiling = max_chunk
+        self._successes = 0
+
+    # -- checkpoints -- #
+
+    def load_checkpoint(self):
+        """Return the last finished block from the checkpoint file, or None."""
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path) as f:
+            checkpoint = json.load(f)
+        if checkpoint.get('token') != self.token_address:
+            raise ValueError(f"Checkpoint {self.checkpoint_path} belongs to "
+                             f"token {checkpoint.get('token')}")
+        return checkpoint['last_block']
+
+    def save_checkpoint(self, last_block):
+        if not self.checkpoint_path:
+            return
+        tmp_path = self.checkpoint_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'token': self.token_address, 'last_block': last_block}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+
+    # -- log walking -- #
+
+    def _get_logs(self, from_block, to_block):
+        return self.w3.eth.get_logs({
+            'address': self.token_address,
+            'topics': [TRANSFER_TOPIC],
+            'fromBlock': from_block,
+            'toBlock': to_block
+        })
+
+    def iter_log_chunks(self, from_block, to_block):
+        """
+        Yield (chunk_from, chunk_to, logs) for consecutive block ranges,
+        adapting the range size to the provider's limits.
+        """
+        from web3.exceptions import Web3RPCError
+
+        start = from_block
+        while start <= to_block:
+            end = min(start + self.chunk_size - 1, to_block)
+            try:
+                logs = self._get_logs(start, end)
+            except (Web3RPCError, ValueError) as e:
+                if not is_too_many_results(e) or self.chunk_size <= self.min_chunk:
+                    raise
+                self.chunk_size = max(self.min_chunk, self.chunk_size // 2)
+                self._ceiling = self.chunk_size
+                self._successes = 0
+                continue
+
+            yield start, end, logs
+
+            self._successes += 1
+            if self._successes >= 10:
+                self._ceiling = min(self.max_chunk, self._ceiling * 2)
+                self._successes = 0
+            if len(logs) < self.target_results // 2:
+                self.chunk_size = min(self._ceiling, self.chunk_size * 2)
+            start = end + 1
+
+    def _resolve_range(self, from_block, to_block):
+        if from_block is None:
+            last_block = self.load_checkpoint()
+            from_block = 0 if last_block is None else last_block + 1
+        if to_block == 'latest':
+            to_block = self.w3.eth.block_number
+        return from_block, to_block
+
+    def _finish_chunk(self, chunk_to, on_chunk):
+        if on_chunk is not None:
+            on_chunk(chunk_to)
+        self.save_checkpoint(chunk_to)
+
+    def transfers(self, from_block=None, to_block='latest', on_chunk=None):
+        """
+        Yield decoded transfers in block order.
+
+        Resumes after the checkpointed block when from_block is None. The
+        checkpoint advances only after every transfer of a chunk has been
+        consumed, so a crash re-delivers at most one chunk.
+
+        Args:
+            on_chunk: Called with a chunk's last block after its transfers
+                were consumed and before the checkpoint is written (e.g. to
+                flush and fsync the consumer's output)
+        """
+        from_block, to_block = self._resolve_range(from_block, to_block)
+        for _, chunk_to, logs in self.iter_log_chunks(from_block, to_block):
+            for log in logs:
+                transfer = decode_transfer(log)
+                if transfer is not None:
+                    yield transfer
+            self._finish_chunk(chunk_to, on_chunk)
+
+    def transfer_columns(self, from_block=None, to_block='latest', on_chunk=None):
+        """
+        Like transfers(), but yields one TransferColumns batch per chunk,
+        which is much cheaper for bulk backfills.
+        """
+        from_block, to_block = self._resolve_range(from_block, to_block)
+        for _, chunk_to, logs in self.iter_log_chunks(from_block, to_block):
+            yield decode_transfer_columns(logs)
+            self._finish_chunk(chunk_to, on_chunk)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index ERC-20 Transfer events")
+    parser.add_argument('token', help="token contract address")
+    parser.add_argument('--from-block', type=int, help="start block (default: resume from checkpoint)")
+    parser.add_argument('--to-block', type=int, help="end block (default: latest)")
+    parser.add_argument('--checkpoint', help="checkpoint file for resuming")
+    parser.add_argument('--chunk-size', type=int, default=2000, help="initial blocks per request")
+    parser.add_argument('--out', help="JSONL output file (appended to, at-least-once: dedupe "
+                                      "on tx_hash + log_index; default: stdout)")
+    args = parser.parse_args()
+
+    w3 = make_web3()
+    indexer = TransferIndexer(w3, args.token, checkpoint_path=args.checkpoint,
+                              chunk_size=args.chunk_size)
+    out = open(args.out, 'a') if args.out else sys.stdout
+    count = 0
+
+    def sync_output(chunk_to):
+        # Make the chunk durable before the checkpoint moves past it
+        out.flush()
+        if args.out:
+            os.fsync(out.fileno())
+
+    try:
+        for transfer in indexer.transfers(args.from_block, args.to_block or 'latest',
+                                          on_chunk=sync_output):
+            out.write(json.dumps(transfer) + "\n")
+            count += 1
+    finally:
+        if args.out:
+            out.close()
+    print(f"✅ Indexed {count} transfers", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
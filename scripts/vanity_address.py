@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Search for Ethereum addresses matching a hex prefix and/or suffix.
+⚠️  FOR EDUCATIONAL PURPOSES ONLY - NEVER use these wallets for real funds!
+
+Account.create() pays for a full scalar multiplication plus object and hex
+construction per attempt. Instead each worker picks a random starting key k
+and walks k, k+1, k+2, ...: the public key of k+i is P + i*G, a single point
+addition. Additions are done a batch at a time against a precomputed table
+of i*G, sharing one modular inversion per batch. Each candidate costs one
+keccak256, and its 20 address bytes are compared as an integer against the
+pattern's precompiled mask.
+
+Usage:
+    python3 scripts/vanity_address.py --prefix dead --suffix 00 --workers 8
+"""
+
+import argparse
+import math
+import multiprocessing
+import os
+import queue
+import random
+import secrets
+import time
+
+BATCH_SIZE = 256
+ADDRESS_NIBBLES = 40
+
+_G_TABLES = {}
+
+
+def compile_pattern(prefix='', suffix=''):
+    """
+    Compile a hex prefix/suffix into an integer mask over the 160-bit address.
+    Matching is case-insensitive (checksum casing is not part of the pattern).
+
+    Returns:
+        dict with mask, value, nibbles and difficulty (expected attempts)
+    """
+    prefix = prefix[2:] if prefix.lower().startswith('0x') else prefix
+    for part in (prefix, suffix):
+        if part and not all(c in '0123456789abcdefABCDEF' for c in part):
+            raise ValueError(f"Pattern must be hex: {part}")
+    if len(prefix) + len(suffix) > ADDRESS_NIBBLES:
+        raise ValueError("Pattern is longer than an address")
+
+    mask = value = 0
+    for position, char in enumerate(prefix.lower()):
+        shift = 4 * (ADDRESS_NIBBLES - 1 - position)
+        mask |= 0xf << shift
+        value |= int(char, 16) << shift
+    for position, char in enumerate(reversed(suffix.lower())):
+        shift = 4 * position
+        if (mask >> shift) & 0xf and (value >> shift) & 0xf != int(char, 16):
+            raise ValueError("Prefix and suffix overlap with different digits")
+        mask |= 0xf << shift
+        value |= int(char, 16) << shift
+
+    nibbles = bin(mask).count('1') // 4
+    return {
+        'mask': mask,
+        'value': value,
+        'nibbles': nibbles,
+        'difficulty': 16 ** nibbles
+    }
+
+
+def estimate_eta(difficulty, attempts, rate):
+    """
+    Progress figures for a search. Every attempt is an independent trial, so
+    the expected remaining time does not shrink as attempts accumulate.
+
+    Returns:
+        dict with probability (of a hit by now), expected_seconds and
+        p50_seconds (time for a 50% chance of a hit)
+    """
+    probability = 1 - (1 - 1 / difficulty) ** attempts
+    if not rate:
+        return {'probability': probability, 'expected_seconds': None, 'p50_seconds': None}
+    return {
+        'probability': probability,
+        'expected_seconds': difficulty / rate,
+        'p50_seconds': difficulty * math.log(2) / rate
+    }
+
+
+def _point_add(x1, y1, x2, y2):
+    from eth_keys.constants import SECPK1_P
+    lam = (y2 - y1) * pow(x2 - x1, -1, SECPK1_P) % SECPK1_P
+    x3 = (lam * lam - x1 - x2) % SECPK1_P
+    return x3, (lam * (x1 - x3) - y1) % SECPK1_P
+
+
+def _g_table(batch_size):
+    """[(x, y) of i*G for i in 1..batch_size]"""
+    table = _G_TABLES.get(batch_size)
+    if table is None:
+        from eth_keys.constants import SECPK1_G
+        table = [SECPK1_G, _public_point(2)][:batch_size]
+        while len(table) < batch_size:
+            table.append(_point_add(*table[-1], *SECPK1_G))
+        _G_TABLES[batch_size] = table
+    return table
+
+
+def _public_point(key):
+    from eth_keys import keys
+    public = keys.PrivateKey(key.to_bytes(32, 'big')).public_key.to_bytes()
+    return int.from_bytes(public[:32], 'big'), int.from_bytes(public[32:], 'big')
+
+
+def _random_start(rng, batch_size):
+    # Far from 0 and N so no walk ever meets a table point or wraps
+    from eth_keys.constants import SECPK1_N
+    return rng.randrange(2 ** 64, SECPK1_N - 2 ** 64 - batch_size)
+
+
+def _scan(rng, mask, value, batch_size, should_stop, on_batch):
+    """
+    Walk consecutive keys from random starts until one matches or
+    should_stop() is true. Returns the matching key as an int, or None.
+    """
+    from eth_hash.auto import keccak
+    from eth_keys.constants import SECPK1_N, SECPK1_P
+
+    table = _g_table(batch_size)
+    p = SECPK1_P
+    key = _random_start(rng, batch_size)
+    bx, by = _public_point(key)
+
+    while not should_stop():
+        # One inversion for the batch (Montgomery's trick)
+        products = []
+        acc = 1
+        for gx, _ in table:
+            acc = acc * (gx - bx) % p
+            products.append(acc)
+        inverse = pow(acc, -1, p)
+        inverses = [0] * batch_size
+        for i in range(batch_size - 1, 0, -1):
+            inverses[i] = inverse * products[i - 1] % p
+            inverse = inverse * (table[i][0] - bx) % p
+        inverses[0] = inverse
+
+        # Candidate i is key + i; its point is B for i == 0 and B + i*G after
+        x, y = bx, by
+        for i in range(batch_size):
+            if i:
+                gx, gy = table[i - 1]
+                lam = (gy - by) * inverses[i - 1] % p
+                x = (lam * lam - bx - gx) % p
+                y = (lam * (bx - x) - by) % p
+            digest = keccak(x.to_bytes(32, 'big') + y.to_bytes(32, 'big'))
+            if int.from_bytes(digest[12:], 'big') & mask == value:
+                on_batch(i + 1)
+                return key + i
+
+        # Next base is B + batch_size*G, which the last table entry gives
+        gx, gy = table[-1]
+        lam = (gy - by) * inverses[-1] % p
+        nx = (lam * lam - bx - gx) % p
+        bx, by = nx, (lam * (bx - nx) - by) % p
+        key += batch_size
+        on_batch(batch_size)
+        if key >= SECPK1_N - batch_size:
+            key = _random_start(rng, batch_size)
+            bx, by = _public_point(key)
+    return None
+
+
+def _make_rng(seed, worker_index):
+    if seed is None:
+        return secrets.SystemRandom()
+    return random.Random(f"{seed}:{worker_index}")
+
+
+def _worker(worker_index, seed, mask, value, batch_size, stop, counter, results):
+    """Process entry point: scan until any worker finds a match."""
+    def on_batch(count):
+        with counter.get_lock():
+            counter.value += count
+
+    key = _scan(_make_rng(seed, worker_index), mask, value, batch_size, stop.is_set, on_batch)
+    if key is not None:
+        results.put(key)
+        stop.set()
+
+
+def search(prefix='', suffix='', workers=None, seed=None, batch_size=BATCH_SIZE,
+           progress=None, progress_interval=1.0, max_attempts=None):
+    """
+    Find a key whose address matches prefix/suffix, using every core.
+
+    Args:
+        prefix: Hex digits the address must start with (after 0x)
+        suffix: Hex digits the address must end with
+        workers: Number of processes (default: CPU count; 1 = this process)
+        seed: Seed for the starting keys - reproducible, so tests only!
+        batch_size: Keys checked per modular inversion
+        progress: Called with a stats dict every progress_interval seconds
+        max_attempts: Give up (returning None) after roughly this many attempts
+
+    Returns:
+        dict with address, private_key, attempts, elapsed, rate and
+        difficulty, or None if max_attempts was reached
+    """
+    pattern = compile_pattern(prefix, suffix)
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    last_report = started
+
+    def stats(attempts):
+        elapsed = time.perf_counter() - started
+        rate = attempts / elapsed if elapsed > 0 else 0.0
+        return {
+            'attempts': attempts,
+            'elapsed': elapsed,
+            'rate': rate,
+            'difficulty': pattern['difficulty'],
+            **estimate_eta(pattern['difficulty'], attempts, rate)
+        }
+
+    if workers <= 1:
+        attempts = 0
+
+        def on_batch(count):
+            nonlocal attempts, last_report
+            attempts += count
+            now = time.perf_counter()
+            if progress and now - last_report >= progress_interval:
+                last_report = now
+                progress(stats(attempts))
+
+        key = _scan(_make_rng(seed, 0), pattern['mask'], pattern['value'], batch_size,
+                    lambda: max_attempts is not None and attempts >= max_attempts, on_batch)
+    else:
+        stop = multiprocessing.Event()
+        counter = multiprocessing.Value('Q', 0)
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(
+                target=_worker, daemon=True,
+                args=(i, seed, pattern['mask'], pattern['value'], batch_size, stop, counter, results))
+            for i in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        key = None
+        try:
+            while key is None:
+                try:
+                    key = results.get(timeout=progress_interval)
+                except queue.Empty:
+                    attempts = counter.value
+                    if progress:
+                        progress(stats(attempts))
+                    if max_attempts is not None and attempts >= max_attempts:
+                        break
+                    if not any(process.is_alive() for process in processes):
+                        raise RuntimeError("All search workers exited without a result")
+        finally:
+            stop.set()
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+        attempts = counter.value
+
+    if key is None:
+        return None
+    from eth_keys import keys
+    private_key = keys.PrivateKey(key.to_bytes(32, 'big'))
+    return {
+        'address': private_key.public_key.to_checksum_address(),
+        'private_key': '0x' + private_key.to_bytes().hex(),
+        **{k: v for k, v in stats(attempts).items() if k in ('attempts', 'elapsed', 'rate', 'difficulty')}
+    }
+
+
+def _format_seconds(seconds):
+    if seconds is None:
+        return "?"
+    for unit, size in (('d', 86400), ('h', 3600), ('m', 60)):
+        if seconds >= size:
+            return f"{seconds / size:.1f}{unit}"
+    return f"{seconds:.1f}s"
+
+
+def _print_progress(stats):
+    print(f"   ⏳ {stats['attempts']:,} attempts | {stats['rate']:,.0f}/s | "
+          f"{stats['probability']:.0%} chance so far | "
+          f"50% ETA {_format_seconds(stats['p50_seconds'])}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search for a vanity Ethereum address")
+    parser.add_argument('--prefix', default='', help="hex digits the address starts with")
+    parser.add_argument('--suffix', default='', help="hex digits the address ends with")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="processes to use")
+    parser.add_argument('--interval', type=float, default=2.0, help="seconds between progress lines")
+    args = parser.parse_args()
+
+    pattern = compile_pattern(args.prefix, args.suffix)
+    print("=" * 70)
+    print("VANITY ADDRESS SEARCH")
+    print("⚠️  FOR EDUCATIONAL PURPOSES ONLY!")
+    print("=" * 70)
+    print(f"Pattern:    0x{args.prefix or ''}...{args.suffix or ''}")
+    print(f"Difficulty: 1 in {pattern['difficulty']:,} ({args.workers} workers)")
+    print()
+
+    wallet = search(args.prefix, args.suffix, workers=args.workers,
+                    progress=_print_progress, progress_interval=args.interval)
+    print()
+    print(f"✅ Found after {wallet['attempts']:,} attempts in "
+          f"{_format_seconds(wallet['elapsed'])} ({wallet['rate']:,.0f}/s)")
+    print(f"Address:     {wallet['address']}")
+    print(f"Private Key: {wallet['private_key']}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,43 +2,109 @@
 """
 Secure Wallet Manager - Week 3 Deliverable
 A comprehensive tool demonstrating all Week 3 concepts with security best practices.
+
+Run without arguments for the interactive menu, or headless over JSONL:
+    python3 scripts/wallet_manager.py batch --op balance < addresses.jsonl > balances.jsonl
+
+web3, eth_account, mnemonic and the helper modules built on them are
+imported inside the methods that need them, and the RPC provider is only
+created on the first network call, so offline operations start quickly.
 """
 
-from eth_account import Account
-from eth_account.messages import encode_defunct
-from web3 import Web3
-from mnemonic import Mnemonic
-from dotenv import load_dotenv
+from parallel import chunked
+from address_utils import checksum_address
+from connection_health import NotConnectedError
+from amounts import format_ether, format_units_batch
+import argparse
 import os
 import json
 import getpass
-
-Account.enable_unaudited_hdwallet_features()
-load_dotenv()
+import secrets
+import sys
+import time
 
 class WalletManager:
-    def __init__(self):
-        rpc_url = os.getenv('RPC_URL', 'https://eth-mainnet.g.alchemy.com/v2/YOUR_API_KEY')
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+    def __init__(self, rpc_url=None):
+        self.rpc_url = rpc_url
         self.current_account = None
+        self.session_keys = {}  # address -> decrypted key (bytearray), never written to disk
+        self._w3 = None
+        self._health = None
+        self._batch = None
+        self._signers = None
+        self._loaded_signers = set()  # addresses this manager loaded into self.signers
+    
+    @property
+    def w3(self):
+        if self._w3 is None:
+            from providers import get_rpc_url, make_web3
+            self.rpc_url = get_rpc_url(self.rpc_url)
+            self._w3 = make_web3(self.rpc_url)
+        return self._w3
+    
+    @property
+    def health(self):
+        if self._health is None:
+            from connection_health import ConnectionHealth
+            self._health = ConnectionHealth(self.w3)
+        return self._health
+    
+    @property
+    def batch(self):
+        if self._batch is None:
+            from providers import get_rpc_url, make_batch_client
+            self.rpc_url = get_rpc_url(self.rpc_url)
+            self._batch = make_batch_client(self.rpc_url)
+        return self._batch
+    
+    @property
+    def signers(self):
+        """SignerRegistry used for signing (the shared one unless replaced)."""
+        if self._signers is None:
+            from signer_registry import default_registry
+            self._signers = default_registry
+        return self._signers
+    
+    @signers.setter
+    def signers(self, registry):
+        self._signers = registry
     
     def generate_new_wallet(self):
         """Generate a new random wallet."""
-        account = Account.create()
+        from eth_keys import keys
+        from eth_keys.constants import SECPK1_N
+        
+        # Same secp256k1 key Account.create() would make, without importing eth_account
+        while True:
+            key = secrets.token_bytes(32)
+            if 0 < int.from_bytes(key, 'big') < SECPK1_N:
+                break
+        private_key = keys.PrivateKey(key)
         return {
-            'address': account.address,
-            'private_key': account.key.hex()
+            'address': private_key.public_key.to_checksum_address(),
+            'private_key': key.hex()
         }
     
+    def generate_vanity_wallet(self, prefix='', suffix='', workers=None, progress=None):
+        """
+        Generate a random wallet whose address matches a hex prefix/suffix.
+        See vanity_address.search; the result also carries attempts and rate.
+        """
+        from vanity_address import search
+        return search(prefix, suffix, workers=workers, progress=progress)
+    
     def generate_hd_wallet(self, num_accounts=1):
         """Generate HD wallet from new mnemonic."""
+        from eth_account import Account
+        from mnemonic import Mnemonic
+        from hd_derivation import default_deriver
+        
         mnemo = Mnemonic("english")
         mnemonic = mnemo.generate(strength=128)
         
         accounts = []
-        for i in range(num_accounts):
-            path = f"m/44'/60'/0'/0/{i}"
-            account = Account.from_mnemonic(mnemonic, account_path=path)
+        for i, path, key in default_deriver.derive_keys(mnemonic, range(num_accounts)):
+            account = Account.from_key(key)
             accounts.append({
                 'index': i,
                 'path': path,
@@ -51,8 +117,18 @@ class WalletManager:
             'accounts': accounts
         }
     
+    def derive_range(self, mnemonic, start, count, workers=1, include_private_keys=False):
+        """
+        Stream address records for a range of indices, in index order.
+        Addresses only by default; see hd_derivation.derive_range.
+        """
+        from hd_derivation import derive_range
+        return derive_range(mnemonic, start, count, workers=workers,
+                            include_private_keys=include_private_keys)
+    
     def import_from_private_key(self, private_key):
         """Import wallet from private key."""
+        from eth_account import Account
         try:
             account = Account.from_key(private_key)
             return {
@@ -64,9 +140,10 @@ class WalletManager:
     
     def import_from_mnemonic(self, mnemonic, index=0):
         """Import wallet from mnemonic phrase."""
+        from hd_derivation import default_deriver
         try:
             path = f"m/44'/60'/0'/0/{index}"
-            account = Account.from_mnemonic(mnemonic, account_path=path)
+            account = default_deriver.account(mnemonic, path)
             return {
                 'address': account.address,
                 'private_key': account.key.hex(),
@@ -75,36 +152,335 @@ class WalletManager:
         except Exception as e:
             return None
     
+    def export_keystore(self, private_key, password, directory, kdf='scrypt', preset='standard',
+                        iterations=None):
+        """Encrypt a private key to a keystore file; see keystore.encrypt_key."""
+        from keystore import encrypt_key, save_keystore
+        keystore = encrypt_key(private_key, password, kdf, preset, iterations)
+        return {
+            'address': checksum_address('0x' + keystore['address']),
+            'path': save_keystore(keystore, directory)
+        }
+    
+    def import_keystore(self, path, password):
+        """Decrypt a keystore file into the session. Only the address is returned."""
+        from eth_account import Account
+        from keystore import decrypt_keystore, load_keystore
+        key = decrypt_keystore(load_keystore(path), password)
+        address = Account.from_key(key).address
+        self.session_keys[address] = bytearray(key)
+        return {'address': address}
+    
+    def unlock_keystores(self, directory, password, workers=None):
+        """
+        Decrypt every keystore in directory into the session on a process pool.
+        Returns {'unlocked': [addresses], 'failed': [{'path', 'error'}]}.
+        """
+        from keystore import list_keystores, unlock_many
+        unlocked, failed = [], []
+        for record in unlock_many(list_keystores(directory), password, workers=workers):
+            if 'error' in record:
+                failed.append(record)
+            else:
+                self.session_keys[record['address']] = bytearray(record['private_key'])
+                unlocked.append(record['address'])
+        return {'unlocked': unlocked, 'failed': failed}
+    
+    def lock_session(self):
+        """Overwrite and forget every decrypted key (including their loaded signers)."""
+        for address, key in self.session_keys.items():
+            self.signers.remove(address)
+            key[:] = bytes(len(key))
+        self.session_keys.clear()
+    
+    def close(self):
+        """
+        Zero every key this manager decrypted or loaded for signing. Signers
+        other code loaded into a shared registry are left alone.
+        """
+        self.lock_session()
+        if self._signers is not None:
+            for address in self._loaded_signers:
+                self._signers.remove(address)
+        self._loaded_signers.clear()
+    
     def sign_message(self, private_key, message):
-        """Sign a message with private key."""
-        account = Account.from_key(private_key)
-        message_encoded = encode_defunct(text=message)
-        signed_message = account.sign_message(message_encoded)
-        
+        """Sign a message with private key (parsed once, then reused from the signer registry)."""
+        return self._sign_with(self.signers.signer_for_key(private_key), message)
+    
+    def sign_message_as(self, address, message):
+        """Sign a message as a session account (see import_keystore/unlock_keystores)."""
+        address = checksum_address(address)
+        if address not in self.signers:
+            if address not in self.session_keys:
+                raise KeyError(f"No key unlocked for {address}")
+            self.signers.add(self.session_keys[address])
+        return self._sign_with(self.signers.get(address), message)
+    
+    def _sign_with(self, signer, message):
+        from eth_account.messages import encode_defunct
+        self._loaded_signers.add(signer.address)
+        signed_message = signer.sign_message(encode_defunct(text=message))
         return {
             'message': message,
             'signature': signed_message.signature.hex(),
-            'signer': account.address
+            'signer': signer.address
         }
     
     def verify_signature(self, message, signature):
         """Verify a signature and recover signer."""
+        from eth_account import Account
+        from eth_account.messages import encode_defunct
         message_encoded = encode_defunct(text=message)
         recovered_address = Account.recover_message(message_encoded, signature=signature)
         return recovered_address
     
+    def verify_many(self, messages, signatures, expected_addresses, workers=1):
+        """Batch-verify signatures; returns (valid bytearray, failed indices)."""
+        from sign_message import verify_many
+        return verify_many(messages, signatures, expected_addresses, workers=workers)
+    
     def get_balance(self, address):
-        """Get ETH balance for address."""
-        if not self.w3.is_connected():
-            return None
-        balance_wei = self.w3.eth.get_balance(address)
-        return self.w3.from_wei(balance_wei, 'ether')
+        """
+        Get ETH balance for address as an exact decimal string.
+        Raises NotConnectedError if offline.
+        """
+        balance_wei = self.health.call(self.w3.eth.get_balance, checksum_address(address))
+        return format_ether(balance_wei)
     
     def get_nonce(self, address):
-        """Get transaction nonce for address."""
-        if not self.w3.is_connected():
-            return None
-        return self.w3.eth.get_transaction_count(address)
+        """Get transaction nonce for address. Raises NotConnectedError if offline."""
+        return self.health.call(self.w3.eth.get_transaction_count, checksum_address(address))
+    
+    def get_balances(self, addresses, block='latest'):
+        """Get ETH balances (decimal strings) for many addresses using batched JSON-RPC calls."""
+        balances_wei = self.health.call(self.batch.get_balances, addresses, block)
+        return format_units_batch(balances_wei, 18)
+    
+    def get_nonces(self, addresses, block='latest'):
+        """Get transaction nonces for many addresses using batched JSON-RPC calls."""
+        return self.health.call(self.batch.get_nonces, addresses, block)
+
+def iter_jsonl(stream):
+    """Yield (line_number, record) for each non-blank line; bad JSON yields an error string."""
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_number, f"invalid JSON: {e}"
+            continue
+        yield line_number, record if isinstance(record, dict) else "record must be a JSON object"
+
+def _batch_rpc(items, fetch, field, convert):
+    """
+    Shared body of the balance/nonce ops: one batched RPC per chunk, with
+    invalid addresses and individually failed calls reported per record.
+    """
+    from rpc_batch import RPCBatchError
+    
+    results = {}
+    valid = []
+    for line, record in items:
+        try:
+            valid.append((line, checksum_address(record.get('address'))))
+        except ValueError as e:
+            results[line] = {'error': str(e)}
+    
+    if valid:
+        addresses = [address for _, address in valid]
+        try:
+            values = fetch(addresses)
+            errors = {}
+        except RPCBatchError as e:
+            values = [None if raw is None else convert(int(raw, 16)) for raw in e.results]
+            errors = e.errors
+        except NotConnectedError as e:
+            values, errors = [None] * len(valid), dict.fromkeys(range(len(valid)), str(e))
+        for position, (line, address) in enumerate(valid):
+            if position in errors:
+                results[line] = {'address': address, 'error': str(errors[position])}
+            else:
+                results[line] = {'address': address, field: values[position]}
+    return [results[line] for line, _ in items]
+
+def _batch_balance(manager, items, options):
+    return _batch_rpc(items, lambda addresses: manager.get_balances(addresses, options['block']),
+                      'balance', format_ether)
+
+def _batch_nonce(manager, items, options):
+    return _batch_rpc(items, lambda addresses: manager.get_nonces(addresses, options['block']),
+                      'nonce', int)
+
+def _string_fields(record, *names):
+    """Values of required string fields; ValueError if one is missing or not a string."""
+    values = []
+    for name in names:
+        if name not in record:
+            raise ValueError(f"{name} is required")
+        if not isinstance(record[name], str):
+            raise ValueError(f"{name} must be a string, got {type(record[name]).__name__}")
+        values.append(record[name])
+    return values
+
+def _batch_sign(manager, items, options):
+    results = []
+    for line, record in items:
+        try:
+            if 'private_key' in record:
+                private_key, message = _string_fields(record, 'private_key', 'message')
+                signed = manager.sign_message(private_key, message)
+            else:
+                address, message = _string_fields(record, 'address', 'message')
+                signed = manager.sign_message_as(address, message)
+            results.append({'signer': signed['signer'], 'signature': signed['signature']})
+        except (KeyError, ValueError, TypeError) as e:
+            results.append({'error': f"{type(e).__name__}: {e}"})
+    return results
+
+def _batch_verify(manager, items, options):
+    """
+    Records with an address are checked in one verify_many call per chunk;
+    others get the recovered signer. Malformed fields are reported per record
+    before anything is verified.
+    """
+    from sign_message import signature_bytes
+    
+    results = [None] * len(items)
+    checked = []
+    for position, (line, record) in enumerate(items):
+        try:
+            message, signature = _string_fields(record, 'message', 'signature')
+            signature_bytes(signature)
+            if 'address' not in record:
+                results[position] = {'signer': manager.verify_signature(message, signature)}
+            else:
+                checksum_address(_string_fields(record, 'address')[0])
+                checked.append(position)
+        except Exception as e:
+            results[position] = {'error': str(e) or type(e).__name__}
+    
+    if checked:
+        records = [items[position][1] for position in checked]
+        try:
+            valid, failed = manager.verify_many([r['message'] for r in records],
+                                                [r['signature'] for r in records],
+                                                [r['address'] for r in records],
+                                                workers=options['workers'])
+        except Exception as e:
+            for position in checked:
+                results[position] = {'error': str(e) or type(e).__name__}
+        else:
+            # Inputs are well-formed, so a failed index is a wrong or unrecoverable signer
+            for position in checked:
+                results[position] = {'valid': True}
+            for index in failed:
+                results[checked[index]] = {'valid': False}
+    return results
+
+def _derive_records(manager, record, options):
+    """Lazily derive one record's range; a failure ends it with an error record."""
+    from eth_utils import ValidationError
+    try:
+        mnemonic, = _string_fields(record, 'mnemonic')
+        yield from manager.derive_range(
+            mnemonic, int(record.get('start', 0)), int(record.get('count', 1)),
+            workers=options['workers'],
+            include_private_keys=bool(record.get('include_private_keys')))
+    except (KeyError, ValueError, TypeError, ValidationError) as e:
+        yield {'error': f"{type(e).__name__}: {e}"}
+
+def _batch_derive(manager, items, options):
+    """
+    One input record ({mnemonic, start, count}) expands to one output record
+    per address, streamed as run_batch writes them (count is not held in memory).
+    """
+    return [_derive_records(manager, record, options) for line, record in items]
+
+BATCH_OPS = {
+    'balance': _batch_balance,
+    'nonce': _batch_nonce,
+    'sign': _batch_sign,
+    'verify': _batch_verify,
+    'derive': _batch_derive,
+}
+
+def run_batch(manager, op, records, chunk_size=100, block='latest', workers=1):
+    """
+    Process (line_number, record) pairs chunk by chunk and yield one result
+    dict per output record, each tagged with its input 'line' (and 'id' if
+    the input had one). Failures become {'line', 'error'} records instead of
+    stopping the run.
+    
+    Args:
+        manager: WalletManager
+        op: One of BATCH_OPS
+        records: Iterable of (line_number, record or error string)
+        chunk_size: Records per batched RPC / verification call
+        block: Block for balance and nonce lookups
+        workers: Processes for verify and derive
+    """
+    if op not in BATCH_OPS:
+        raise ValueError(f"Unknown op: {op}")
+    handler = BATCH_OPS[op]
+    options = {'block': block, 'workers': workers}
+    
+    for chunk in chunked(records, chunk_size):
+        items = [(line, record) for line, record in chunk if not isinstance(record, str)]
+        results = iter(handler(manager, items, options) if items else [])
+        for line, record in chunk:
+            if isinstance(record, str):
+                yield {'line': line, 'error': record}
+                continue
+            result = next(results)
+            tag = {'line': line}
+            if 'id' in record:
+                tag['id'] = record['id']
+            # A handler may expand one record into many outputs (a list or a generator)
+            for output in ([result] if isinstance(result, dict) else result):
+                yield {**tag, **output}
+
+def batch_main(argv):
+    parser = argparse.ArgumentParser(prog='wallet_manager.py batch',
+                                     description="Run a wallet operation over JSONL records")
+    parser.add_argument('--op', required=True, choices=sorted(BATCH_OPS))
+    parser.add_argument('--input', help="JSONL input file (default: stdin)")
+    parser.add_argument('--output', help="JSONL output file (default: stdout)")
+    parser.add_argument('--chunk-size', type=int, default=100, help="records per chunk")
+    parser.add_argument('--block', default='latest', help="block for balance/nonce")
+    parser.add_argument('--workers', type=int, default=1, help="processes for verify/derive")
+    args = parser.parse_args(argv)
+    block = int(args.block) if args.block.isdigit() else args.block
+    
+    manager = WalletManager()
+    source = open(args.input) if args.input else sys.stdin
+    sink = open(args.output, 'w') if args.output else sys.stdout
+    inputs = outputs = errors = 0
+    
+    def counted(records):
+        nonlocal inputs
+        for item in records:
+            inputs += 1
+            yield item
+    
+    started = time.perf_counter()
+    try:
+        for result in run_batch(manager, args.op, counted(iter_jsonl(source)),
+                                chunk_size=args.chunk_size, block=block, workers=args.workers):
+            outputs += 1
+            errors += 'error' in result
+            sink.write(json.dumps(result) + "\n")
+    finally:
+        if args.input:
+            source.close()
+        if args.output:
+            sink.close()
+    elapsed = time.perf_counter() - started
+    rate = inputs / elapsed if elapsed > 0 else 0.0
+    print(f"📊 {args.op}: {inputs} records in, {outputs} out, {errors} errors, "
+          f"{elapsed:.2f}s ({rate:,.0f} records/s)", file=sys.stderr)
+    return 1 if errors else 0
 
 def print_menu():
     print("\n" + "=" * 70)
@@ -125,7 +501,12 @@ def print_menu():
 
 def main():
     manager = WalletManager()
-    
+    try:
+        run_menu(manager)
+    finally:
+        manager.close()  # zero decrypted and loaded keys on quit or Ctrl-C
+
+def run_menu(manager):
     while True:
         print_menu()
         choice = input("\nSelect option (1-9): ").strip()
@@ -220,30 +601,28 @@ def main():
             print("\n💰 Check wallet balance")
             address = input("   Enter address: ").strip()
             
-            if not manager.w3.is_connected():
-                print("\n❌ Not connected to Ethereum network")
-                print("   Check your INFURA_URL in .env file")
-            else:
+            try:
                 balance = manager.get_balance(address)
-                if balance is not None:
-                    print(f"\n✅ Balance: {balance} ETH")
-                else:
-                    print("\n❌ Could not fetch balance")
+                print(f"\n✅ Balance: {balance} ETH")
+            except NotConnectedError:
+                print("\n❌ Not connected to Ethereum network")
+                print("   Check your RPC_URL in .env file")
+            except Exception as e:
+                print(f"\n❌ Could not fetch balance: {e}")
         
         elif choice == '8':
             print("\n🔢 Get transaction nonce")
             address = input("   Enter address: ").strip()
             
-            if not manager.w3.is_connected():
-                print("\n❌ Not connected to Ethereum network")
-                print("   Check your INFURA_URL in .env file")
-            else:
+            try:
                 nonce = manager.get_nonce(address)
-                if nonce is not None:
-                    print(f"\n✅ Nonce (transaction count): {nonce}")
-                    print(f"   Next transaction from this address should use nonce: {nonce}")
-                else:
-                    print("\n❌ Could not fetch nonce")
+                print(f"\n✅ Nonce (transaction count): {nonce}")
+                print(f"   Next transaction from this address should use nonce: {nonce}")
+            except NotConnectedError:
+                print("\n❌ Not connected to Ethereum network")
+                print("   Check your RPC_URL in .env file")
+            except Exception as e:
+                print(f"\n❌ Could not fetch nonce: {e}")
         
         elif choice == '9':
             print("\n👋 Exiting Wallet Manager...")
@@ -256,6 +635,9 @@ def main():
         input("\nPress Enter to continue...")
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == 'batch':
+        sys.exit(batch_main(sys.argv[2:]))
+    
     print("\n" + "=" * 70)
     print("INITIALIZING SECURE WALLET MANAGER")
     print("=" * 70)